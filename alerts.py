@@ -0,0 +1,191 @@
+import json
+import os
+import subprocess
+import threading
+import time
+
+try:
+    import numpy as np
+    ALERTS_AVAILABLE = True
+except ImportError:
+    np = None
+    ALERTS_AVAILABLE = False
+
+from dashboard_config import default_config_path
+
+# --- Alert Rules ---
+# Rules are read from alerts.json next to the dashboard config (GLANCED_ALERTS
+# overrides the path) and compiled into parallel NumPy arrays with one entry per
+# (rule, sensor) pair. Evaluating a snapshot gathers the referenced readings
+# into one vector and decides every rule with a handful of array operations;
+# Python only runs for the rules that fire or clear on that tick.
+#
+#   {"rules": [
+#     {"name": "GPU hot spot", "sensor": "/gpu-nvidia/0/temperature/2", "above": 95, "hysteresis": 5, "for_seconds": 10},
+#     {"name": "Fan stalled", "sensors": ["/lpc/nct6798d/fan/1"], "below": 300, "command": "notify-send 'Fan stalled'"},
+#     {"name": "CPU heating up", "sensor": "/amdcpu/0/temperature/2", "rise": 5, "per_seconds": 10, "log": true}
+#   ]}
+#
+# "above"/"below" compare the reading, "rise"/"fall" compare its change over
+# "per_seconds". An active alert clears once the value is back past the limit
+# by "hysteresis"; "for_seconds" delays firing until the condition has held
+# that long. Every transition is logged unless "log" is false, and "command"
+# runs through the shell with GLANCED_ALERT_* variables describing the event.
+
+ALERTS_FILE_NAME = "alerts.json"
+RULE_KINDS = ("above", "below", "rise", "fall")
+RATE_HISTORY_SAMPLES = 256  # snapshots kept for rise/fall rules
+
+
+def default_alerts_path():
+    if os.environ.get("GLANCED_ALERTS"): return os.environ["GLANCED_ALERTS"]
+    return os.path.join(os.path.dirname(default_config_path()), ALERTS_FILE_NAME)
+
+
+def load_rules(path=None):
+    path = path or default_alerts_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f: data = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        print(f"Info: Ignoring unreadable alert rules {path}: {e}")
+        return []
+    rules = data.get("rules") if isinstance(data, dict) else None
+    if not isinstance(rules, list):
+        print(f"Info: Ignoring alert rules {path}: expected an object with a \"rules\" list.")
+        return []
+    return rules
+
+
+class AlertEvent:
+    __slots__ = ("rule", "sensor_id", "state", "value", "timestamp")
+
+    def __init__(self, rule, sensor_id, state, value, timestamp):
+        self.rule = rule            # the rule dict as loaded
+        self.sensor_id = sensor_id
+        self.state = state          # "fired" or "cleared"
+        self.value = value          # reading (above/below) or change per `per_seconds` (rise/fall)
+        self.timestamp = timestamp
+
+    def __repr__(self):
+        return f"AlertEvent({self.rule.get('name')!r}, {self.sensor_id!r}, {self.state!r}, {self.value!r})"
+
+
+def _compile_rule(rule):
+    # -> (kind, limit, clear limit, sensor ids); raises ValueError for malformed rules.
+    kinds = [kind for kind in RULE_KINDS if kind in rule]
+    if len(kinds) != 1: raise ValueError(f"needs exactly one of {', '.join(RULE_KINDS)}")
+    kind = kinds[0]
+    limit, hysteresis = float(rule[kind]), abs(float(rule.get("hysteresis", 0.0)))
+    sensor_ids = [rule["sensor"]] if "sensor" in rule else list(rule.get("sensors", ()))
+    if not sensor_ids: raise ValueError("needs a \"sensor\" or \"sensors\"")
+    if kind in ("rise", "fall") and float(rule.get("per_seconds", 0)) <= 0: raise ValueError("rise/fall rules need \"per_seconds\" > 0")
+    return kind, limit, limit - hysteresis if kind in ("above", "rise") else limit + hysteresis, sensor_ids
+
+
+class AlertEngine:
+    def __init__(self, rules=(), run_hooks=True):
+        if not ALERTS_AVAILABLE:
+            raise RuntimeError("Alert rules need NumPy (pip install numpy).")
+        self.run_hooks = run_hooks
+        self.rules, self.sensor_ids = [], []
+        rows, entries = {}, []
+        for rule in rules:
+            try: kind, limit, clear, sensor_ids = _compile_rule(rule)
+            except (KeyError, TypeError, ValueError) as e:
+                print(f"Info: Skipping alert rule {rule.get('name', '?') if isinstance(rule, dict) else rule!r}: {e}")
+                continue
+            self.rules.append(rule)
+            for sensor_id in sensor_ids:
+                if sensor_id not in rows: rows[sensor_id] = len(self.sensor_ids); self.sensor_ids.append(sensor_id)
+                entries.append((len(self.rules) - 1, rows[sensor_id], kind, limit, clear, float(rule.get("for_seconds", 0.0)), float(rule.get("per_seconds", 0.0))))
+        count = len(entries)
+        self.rule_index = np.array([entry[0] for entry in entries], dtype=np.int64)
+        self.rows = np.array([entry[1] for entry in entries], dtype=np.int64)
+        # "below" and "fall" are "above" on the negated metric, so one comparison covers all four kinds.
+        self.sign = np.array([1.0 if entry[2] in ("above", "rise") else -1.0 for entry in entries])
+        self.is_rate = np.array([entry[2] in ("rise", "fall") for entry in entries], dtype=bool)
+        self.fire_at = self.sign * np.array([entry[3] for entry in entries], dtype=np.float64)
+        self.clear_at = self.sign * np.array([entry[4] for entry in entries], dtype=np.float64)
+        self.for_seconds = np.array([entry[5] for entry in entries], dtype=np.float64)
+        self.per_seconds = np.array([entry[6] for entry in entries], dtype=np.float64)
+        self.rate_entries = np.flatnonzero(self.is_rate)
+        self.active = np.zeros(count, dtype=bool)
+        self.pending_since = np.full(count, np.nan)
+        # Ring of past readings for rise/fall rules: column per snapshot, oldest first from head - count.
+        self._times = np.full(RATE_HISTORY_SAMPLES, np.nan)
+        self._history = np.full((RATE_HISTORY_SAMPLES, len(self.sensor_ids)), np.nan)
+        self._head = self._count = 0
+        self.active_sensor_ids = frozenset()  # sensors with at least one active alert; replaced, never mutated
+        self.last_evaluation_ms = 0.0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.rule_index)
+
+    def gather(self, values):
+        # values: sensor_id -> float | None; None and unknown ids become NaN (never alerting).
+        return np.array(list(map(values.get, self.sensor_ids)), dtype=np.float64)
+
+    def _rates(self, now, current):
+        # Change over per_seconds, from the oldest kept reading inside each rule's window.
+        rates = np.full(len(self.rate_entries), np.nan)
+        if not self._count or not len(self.rate_entries): return rates
+        order = (np.arange(self._head - self._count, self._head)) % RATE_HISTORY_SAMPLES
+        times = self._times[order]
+        windows = self.per_seconds[self.rate_entries]
+        picks = np.minimum(np.searchsorted(times, now - windows, side="left"), len(order) - 1)
+        columns = order[picks]
+        elapsed = now - self._times[columns]
+        rows = self.rows[self.rate_entries]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            rates = (current[rows] - self._history[columns, rows]) / elapsed * windows
+        rates[elapsed < windows / 2.0] = np.nan  # too little history to extrapolate a rate from
+        return rates
+
+    def evaluate(self, values, now=None):
+        # Returns the AlertEvents of this snapshot (usually none).
+        if not len(self.rule_index): return []
+        started = time.perf_counter()
+        now = time.time() if now is None else now
+        with self._lock:
+            current = self.gather(values)
+            metric = current[self.rows]
+            if len(self.rate_entries): metric[self.rate_entries] = self._rates(now, current)
+            signed = self.sign * metric
+            with np.errstate(invalid="ignore"):
+                holds = signed > np.where(self.active, self.clear_at, self.fire_at)  # NaN never holds
+            since = np.where(holds, np.where(np.isnan(self.pending_since), now, self.pending_since), np.nan)
+            active = holds & (self.active | (now - since >= self.for_seconds))
+            fired, cleared = np.flatnonzero(active & ~self.active), np.flatnonzero(self.active & ~active)
+            self.active, self.pending_since = active, since
+            column = self._head
+            self._times[column] = now; self._history[column] = current
+            self._head = (column + 1) % RATE_HISTORY_SAMPLES
+            self._count = min(self._count + 1, RATE_HISTORY_SAMPLES)
+            if len(fired) or len(cleared):
+                self.active_sensor_ids = frozenset(self.sensor_ids[row] for row in self.rows[active])
+        events = [AlertEvent(self.rules[self.rule_index[entry]], self.sensor_ids[self.rows[entry]], state, float(metric[entry]), now)
+                  for state, entries in (("fired", fired), ("cleared", cleared)) for entry in entries]
+        if self.run_hooks:
+            for event in events: self.run_event_hooks(event)
+        self.last_evaluation_ms = (time.perf_counter() - started) * 1000.0
+        return events
+
+    def active_alerts(self):
+        # [(rule, sensor_id)] currently active.
+        with self._lock: entries = np.flatnonzero(self.active)
+        return [(self.rules[self.rule_index[entry]], self.sensor_ids[self.rows[entry]]) for entry in entries]
+
+    @staticmethod
+    def run_event_hooks(event):
+        rule = event.rule
+        if rule.get("log", True):
+            print(f"Alert: {rule.get('name', 'rule')} {event.state} for {event.sensor_id} ({event.value:.2f})")
+        command = rule.get("command")
+        if command:
+            env = dict(os.environ, GLANCED_ALERT_NAME=str(rule.get("name", "")), GLANCED_ALERT_SENSOR=event.sensor_id,
+                       GLANCED_ALERT_STATE=event.state, GLANCED_ALERT_VALUE=f"{event.value:.6g}")
+            try: subprocess.Popen(command, shell=True, env=env, stdin=subprocess.DEVNULL)  # never waited on; the sampler keeps going
+            except OSError as e: print(f"Error running alert command for {rule.get('name', 'rule')}: {e}")
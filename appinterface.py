@@ -1,75 +1,45 @@
 import tkinter as tk
-from tkinter import Menu, scrolledtext, ttk, Toplevel, Checkbutton, BooleanVar, Frame, Label, Button
+from tkinter import Menu, ttk, filedialog, Toplevel, Checkbutton, BooleanVar, Frame, Label, Button
 import time
 import os 
+import threading
+import math
+from sensor_backends import DERIVED_HARDWARE_TYPE, GPU_HARDWARE_TYPES, create_backend
+from sensor_index import SensorIndex
+from sampler import RollingStats, Sampler
+from poll_scheduler import PollScheduler
+from sensor_history import HISTORY_AVAILABLE, SensorHistory
+from sensor_format import FORMATTED_SENSOR_TYPES, RenderedReadings, SensorFormatter
+from metrics_exporter import MetricsExporter
+from profiler import TickProfiler
+from sparkline import SPARKLINE_SAMPLES, sparkline_coords
+from alerts import ALERTS_AVAILABLE, AlertEngine, default_alerts_path, load_rules
+from derived_sensors import DERIVED_AVAILABLE, DerivedSensors, default_derived_path, load_definitions
+from recording import RECORDING_AVAILABLE, RECORDING_EXTENSION, RecordingWriter
+from remote_hosts import HOST_HARDWARE_TYPE
+from dashboard_config import dashboard_hardware_types, is_key_sensor, load_config, restore_hardware, save_config, serialize_hardware
 
-# --- LibreHardwareMonitor Initialization ---
-LHM_AVAILABLE = False
-LHM_COMPUTER_INSTANCE = None
-LHM_HARDWARE_ENUMS = None 
-LHM_HARDWARE_ITEMS_CACHE = [] 
-
-def initialize_lhm():
-    global LHM_AVAILABLE, LHM_COMPUTER_INSTANCE, LHM_HARDWARE_ENUMS, LHM_HARDWARE_ITEMS_CACHE
-    try:
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        dll_path = os.path.join(script_dir, "LibreHardwareMonitorLib.dll")
-        hidsharp_dll_path = os.path.join(script_dir, "HidSharp.dll")
-
-        if not os.path.exists(dll_path):
-            print(f"Info: LibreHardwareMonitorLib.dll not found at {dll_path}.")
-            if not os.path.exists(hidsharp_dll_path):
-                 print(f"Info: HidSharp.dll also not found at {hidsharp_dll_path} (LHM dependency).")
-            print("LHM support disabled.")
-            LHM_AVAILABLE = False
-            return
-        
-        if not os.path.exists(hidsharp_dll_path):
-            print(f"Info: HidSharp.dll not found at {hidsharp_dll_path} (LHM dependency). LHM might fail or be unstable.")
-
-        import clr 
-        clr.AddReference(dll_path) 
-        
-        from LibreHardwareMonitor.Hardware import Computer, HardwareType, SensorType
-        
-        LHM_HARDWARE_ENUMS = {'HardwareType': HardwareType, 'SensorType': SensorType}
-
-        computer = Computer()
-        computer.IsCpuEnabled = True
-        computer.IsGpuEnabled = True
-        computer.IsMemoryEnabled = True 
-        computer.IsMotherboardEnabled = True 
-        computer.IsControllerEnabled = True 
-        computer.IsStorageEnabled = True
-        computer.IsNetworkEnabled = True
-        computer.Open()
-        LHM_COMPUTER_INSTANCE = computer
-        
-        if LHM_COMPUTER_INSTANCE:
-            LHM_HARDWARE_ITEMS_CACHE.clear() 
-            for hw_item in LHM_COMPUTER_INSTANCE.Hardware:
-                LHM_HARDWARE_ITEMS_CACHE.append(hw_item)
-        
-        LHM_AVAILABLE = True
-        print("Info: LibreHardwareMonitor initialized successfully.")
-    except Exception as e:
-        print(f"Error initializing LibreHardwareMonitor: {e}. LHM support disabled.")
-        LHM_AVAILABLE = False
-
-
-def close_lhm():
-    global LHM_COMPUTER_INSTANCE
-    if LHM_COMPUTER_INSTANCE:
-        try:
-            LHM_COMPUTER_INSTANCE.Close()
-            print("Info: LibreHardwareMonitor closed.")
-        except Exception as e:
-            print(f"Error closing LibreHardwareMonitor: {e}")
-
-initialize_lhm()
+# --- Sensor Backend Initialization ---
+# Nothing is opened at import time: SystemStatsApp creates the backend (GLANCED_BACKEND=lhm|linux|synthetic
+# overrides the platform default; GLANCED_REPLAY=<file> plays a recording back instead, see recording.py, and
+# GLANCED_HOSTS=<host:port,...> shows remote agents, one "Host" entry each, see remote_hosts.py) and opens it on a background thread once the window is up. With a saved
+# dashboard only the hardware classes it shows are probed first; the rest is enumerated after the first data.
+COLD_START_HARDWARE_TYPES = ("Cpu",) + GPU_HARDWARE_TYPES # What the default dashboard shows; probed first without a saved config
 
 # --- Enhanced UI Configuration ---
-UPDATE_INTERVAL_MS = 2000 
+UPDATE_INTERVAL_MS = 2000 # Sampler thread cadence
+UI_FRAME_INTERVAL_MS = 250 # How often the Tk side checks for a new snapshot
+ADAPTIVE_POLLING = True # Back off hardware whose readings stay put (see poll_scheduler.POLL_INTERVALS_MS for per-type rates)
+SENSOR_POLL_INTERVALS_MS = {} # Per-sensor overrides, e.g. {"/amdcpu/0/temperature/2": 500}
+VIRTUALIZE_SELECTIVE_VIEW = True # Only build and refresh dashboard sections near the visible part of the canvas
+OFFSCREEN_POLL_INTERVAL_MS = 10000 # Sampling interval floor for sections scrolled out of view; 0 stops sampling them
+TEMPERATURE_UNIT = "C" # "C" or "F"
+DATA_UNIT_SYSTEM = "decimal" # "decimal" (GB, MB/s) or "binary" (GiB, MiB/s)
+THROUGHPUT_DISPLAY = "auto" # "auto" scales B/s -> KB/s -> MB/s; "B/s" shows raw bytes per second
+SPARKLINES_ENABLED = True # Inline history graph next to each dashboard value (also toggled from the View menu)
+PROFILING_ENABLED = os.environ.get("GLANCED_PROFILE") == "1" # Start with per-tick profiling on (also toggled from the View menu)
+PROFILE_OVERLAY_REFRESH_MS = 1000 # Profiler overlay redraw interval while it is open
+METRICS_EXPORTER_PORT = int(os.environ.get("GLANCED_METRICS_PORT", "0")) or None # Serve Prometheus metrics on 127.0.0.1:<port> when set
 WINDOW_WIDTH = 850 # Slightly wider for better spacing
 WINDOW_HEIGHT = 650 # Slightly taller
 WINDOW_BG_COLOR = "#2B2B2B" # Main background
@@ -84,6 +54,8 @@ TEXT_AREA_BG_COLOR = "#1E1E1E" # Darker for text areas
 LABEL_FRAME_TEXT_COLOR = "#FFFFFF" # For LabelFrame titles
 VALUE_COLOR = "#FFFFFF" # For sensor values
 SEPARATOR_COLOR = "#4A4A4A"
+SPARKLINE_COLOR = "#4FC1FF"
+ALERT_COLOR = "#FF5F56" # Value labels of sensors with an active alert rule
 
 FONT_FAMILY_UI = "Segoe UI" 
 FONT_FAMILY_MONO = "Consolas" 
@@ -95,11 +67,35 @@ FONT_SIZE_SMALL = 8
 FONT_SIZE_VALUE = 11 
 SELECTIVE_SECTION_BG = "#333333" # Background for individual hardware sections in selective view
 MIN_SELECTIVE_SECTION_WIDTH = 300 
+SPARKLINE_WIDTH = 90 
+SPARKLINE_HEIGHT = 18 
+SELECTIVE_SECTION_CHROME_PX = 50 # Estimated LabelFrame title and padding height, for sections not built yet
+SELECTIVE_SENSOR_ROW_PX = 26 # Estimated height of one sensor row
+SELECTIVE_VIEWPORT_MARGIN_PX = 200 # Sections this close to the viewport are built ahead of scrolling (kept up to twice as far)
+SPARKLINE_PARKED = (-2, -2, -2, -2) # Off-canvas coordinates for a sparkline without readings
+SPARKLINE_HISTORY_TIERS = (("raw", 0, SPARKLINE_SAMPLES),) # The window's history only backs the sparklines, so it keeps what they show
 RESIZE_DEBOUNCE_MS = 300 
+STARTUP_POLL_INTERVAL_MS = 50 # How often the Tk side checks whether the backend finished opening
+HOTPLUG_SCAN_INTERVAL_MS = 5000 # How often the sampler thread diffs the top level hardware for hot-plugged devices; 0 only follows backend notifications
+LIST_VIEW_COLUMNS = ("current", "min", "max")
 
 class SystemStatsApp(tk.Tk):
-    def __init__(self):
+    def __init__(self, backend=None):
+        self.startup_started = time.perf_counter()
+        self.startup_phases = {} # phase -> seconds since startup_started (window, first_paint, backend_open, first_data)
         super().__init__()
+        self.backend = backend or create_backend()
+        config = load_config()
+        if config and config.get("backend") != self.backend.name: config = None
+        self.saved_dashboard = config["dashboard"] if config else None # hw_id -> {"show": bool, "sensors": [ids]}
+        self.cached_hardware = config["hardware"] if config else [] # last fully enumerated tree, serialized
+        if backend is None: self.backend.hardware_types = dashboard_hardware_types(config) if config else set(COLD_START_HARDWARE_TYPES)
+        self.backend_state = "loading" # loading -> ready | failed
+        self.backend_opened = False # set on the init thread once open() returned
+        self.hardware_enumerated = False # set on the sampler thread each time enumerate_all() added hardware
+        self.hardware_plugged = False # set when a rescan or the backend's hardware_changed replaced top level hardware
+        self.next_hotplug_scan = 0.0 # time.monotonic() of the next periodic rescan
+        self.backend.hardware_changed = self.on_backend_hardware_changed
 
         self.title("System Monitor Pro") 
         self.geometry(f"{WINDOW_WIDTH}x{WINDOW_HEIGHT}+100+100") 
@@ -115,6 +111,11 @@ class SystemStatsApp(tk.Tk):
             background=[('active', NAV_BUTTON_ACTIVE_BG_COLOR)],
             arrowcolor=[('pressed', NAV_BUTTON_ACTIVE_FG_COLOR), ('active', NAV_BUTTON_ACTIVE_FG_COLOR)]
         )
+        style.configure("Sensors.Treeview", background=TEXT_AREA_BG_COLOR, fieldbackground=TEXT_AREA_BG_COLOR, foreground=TEXT_COLOR,
+                        font=(FONT_FAMILY_MONO, FONT_SIZE_NORMAL), rowheight=22, borderwidth=0)
+        style.configure("Sensors.Treeview.Heading", background=NAV_BUTTON_BG_COLOR, foreground=NAV_BUTTON_FG_COLOR, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL), relief=tk.FLAT)
+        style.map("Sensors.Treeview", background=[('selected', NAV_BUTTON_ACTIVE_BG_COLOR)], foreground=[('selected', NAV_BUTTON_ACTIVE_FG_COLOR)])
+        style.map("Sensors.Treeview.Heading", background=[('active', NAV_BUTTON_ACTIVE_BG_COLOR)])
 
 
         self.selected_hardware_id_list_view = None 
@@ -122,13 +123,51 @@ class SystemStatsApp(tk.Tk):
         self.current_view_mode = tk.StringVar(value="Selective View") 
         
         self.selective_view_config = {} 
+        self.sensor_index = SensorIndex() 
+        self.formatter = SensorFormatter(TEMPERATURE_UNIT, DATA_UNIT_SYSTEM, THROUGHPUT_DISPLAY)
+        self.rendered_readings = RenderedReadings(self.formatter) # Skips formatting readings that moved below display precision
+        self.format_skip_pct = RollingStats() # Per frame: share of readings served from rendered_readings
+        self.redraw_skip_pct = RollingStats() # Per frame: share of shown values whose widget was left alone
+        backend_interval_ms = getattr(self.backend, "poll_interval_ms", None) # Replay and remote backends set their own cadence; every node follows it
+        if backend_interval_ms is not None:
+            scheduler = PollScheduler(backend_interval_ms, type_intervals_ms={}, adaptive=False, background_interval_ms=OFFSCREEN_POLL_INTERVAL_MS)
+        else:
+            scheduler = PollScheduler(UPDATE_INTERVAL_MS, sensor_intervals_ms=SENSOR_POLL_INTERVALS_MS, adaptive=ADAPTIVE_POLLING,
+                                      background_interval_ms=OFFSCREEN_POLL_INTERVAL_MS)
+        self.sampler = Sampler(self.backend, scheduler=scheduler)
+        self.history = SensorHistory(tiers=SPARKLINE_HISTORY_TIERS) if HISTORY_AVAILABLE else None # Holds the sensors given a sparkline
+        if self.history: self.sampler.add_listener(self.record_history)
+        else: print("Info: NumPy not found, sparklines disabled.")
+        alert_rules = load_rules() # Rules from alerts.json next to the dashboard config (see alerts.py)
+        self.alerts = AlertEngine(alert_rules) if alert_rules and ALERTS_AVAILABLE else None
+        if self.alerts: self.sampler.add_listener(self.evaluate_alerts); print(f"Info: {len(self.alerts.rules)} alert rules loaded from {default_alerts_path()}.")
+        elif alert_rules: print("Info: NumPy not found, alert rules disabled.")
+        derived_definitions = load_definitions() # Derived sensors from derived.json next to the dashboard config (see derived_sensors.py)
+        self.derived = DerivedSensors(derived_definitions) if derived_definitions and DERIVED_AVAILABLE else None
+        if self.derived is not None and not len(self.derived): self.derived = None
+        if self.derived is not None: self.sampler.derived = self.derived; print(f"Info: {len(self.derived)} derived sensors loaded from {default_derived_path()}.")
+        elif derived_definitions and not DERIVED_AVAILABLE: print("Info: NumPy not found, derived sensors disabled.")
+        self.recorder = None # RecordingWriter while File > Start Recording is on
+        self.sampler.add_listener(self.record_snapshot)
+        self.metrics_exporter = MetricsExporter(self.sampler, self.sensor_index.get, port=METRICS_EXPORTER_PORT) if METRICS_EXPORTER_PORT else None
+        self.ui_frame_latency_ms = RollingStats()
+        self.profiler = None # TickProfiler while profiling is on; shared with the sampler
+        self.profiling_enabled = BooleanVar(value=False)
+        self.profile_overlay = None
+        self.profile_overlay_text = None
+        self.sparklines_enabled = BooleanVar(value=SPARKLINES_ENABLED and self.history is not None) # Drawn from the sensor history
+        self.rendered_snapshot_seq = None
+        self.next_frame_due = None
         self.resize_job_id = None 
         self.last_known_width = self.winfo_width() 
 
         # --- Menu Bar ---
         menubar = Menu(self, bg=WINDOW_BG_COLOR, fg=TEXT_COLOR, activebackground=NAV_BUTTON_ACTIVE_BG_COLOR, activeforeground=NAV_BUTTON_ACTIVE_FG_COLOR)
         filemenu = Menu(menubar, tearoff=0, bg=FRAME_BG_COLOR, fg=TEXT_COLOR, activebackground=NAV_BUTTON_ACTIVE_BG_COLOR, activeforeground=NAV_BUTTON_ACTIVE_FG_COLOR)
+        filemenu.add_command(label="Start Recording...", command=self.toggle_recording, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL))
+        filemenu.add_separator()
         filemenu.add_command(label="Exit", command=self.exit_app, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL))
+        self.filemenu = filemenu
         menubar.add_cascade(label="File", menu=filemenu, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL))
         
         viewmenu = Menu(menubar, tearoff=0, bg=FRAME_BG_COLOR, fg=TEXT_COLOR, activebackground=NAV_BUTTON_ACTIVE_BG_COLOR, activeforeground=NAV_BUTTON_ACTIVE_FG_COLOR)
@@ -136,6 +175,12 @@ class SystemStatsApp(tk.Tk):
         viewmenu.add_radiobutton(label="Detailed Sensor List", variable=self.current_view_mode, value="List View", command=self.switch_view, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL))
         viewmenu.add_separator()
         viewmenu.add_command(label="Configure Dashboard...", command=self.open_selective_view_config_dialog, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL))
+        viewmenu.add_checkbutton(label="Show Sparklines", variable=self.sparklines_enabled, command=self.toggle_sparklines, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL),
+                                 state=tk.NORMAL if self.history else tk.DISABLED)
+        viewmenu.add_separator()
+        viewmenu.add_checkbutton(label="Profile Ticks", variable=self.profiling_enabled, command=lambda: self.set_profiling(self.profiling_enabled.get()), font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL))
+        viewmenu.add_command(label="Profiler Overlay...", command=self.open_profile_overlay, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL))
+        viewmenu.add_command(label="Export Profile...", command=self.export_profile, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL))
         menubar.add_cascade(label="View", menu=viewmenu, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL))
         self.config(menu=menubar)
 
@@ -149,12 +194,31 @@ class SystemStatsApp(tk.Tk):
         self.list_view_paned_window.add(self.nav_frame_list_view, weight=1)
         self.content_frame_list_view = tk.Frame(self.list_view_paned_window, bg=FRAME_BG_COLOR, padx=5, pady=5) # Use FRAME_BG_COLOR
         self.list_view_paned_window.add(self.content_frame_list_view, weight=3)
-        self.sensor_text_area_list_view = scrolledtext.ScrolledText(
-            self.content_frame_list_view, wrap=tk.WORD, font=(FONT_FAMILY_MONO, FONT_SIZE_NORMAL), # Use MONO font
-            bg=TEXT_AREA_BG_COLOR, fg=TEXT_COLOR, relief=tk.FLAT, bd=0, state=tk.DISABLED,
-            padx=10, pady=10
-        )
-        self.sensor_text_area_list_view.pack(fill=tk.BOTH, expand=True)
+        filter_frame = tk.Frame(self.content_frame_list_view, bg=FRAME_BG_COLOR)
+        filter_frame.pack(fill=tk.X, pady=(0, 5))
+        tk.Label(filter_frame, text="Filter:", bg=FRAME_BG_COLOR, fg=TEXT_COLOR, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL)).pack(side=tk.LEFT, padx=(0, 5))
+        self.list_view_filter = tk.StringVar(value="")
+        self.list_view_filter.trace_add("write", lambda *args: self.layout_list_view_rows())
+        tk.Entry(filter_frame, textvariable=self.list_view_filter, bg=TEXT_AREA_BG_COLOR, fg=TEXT_COLOR, insertbackground=TEXT_COLOR,
+                 relief=tk.FLAT, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL)).pack(side=tk.LEFT, fill=tk.X, expand=True)
+        self.sensor_tree_list_view = ttk.Treeview(self.content_frame_list_view, columns=LIST_VIEW_COLUMNS, style="Sensors.Treeview", selectmode="browse")
+        self.sensor_tree_list_view.heading("#0", text="Sensor", anchor="w", command=lambda: self.sort_list_view("#0"))
+        self.sensor_tree_list_view.column("#0", width=260, minwidth=120, stretch=True)
+        for column in LIST_VIEW_COLUMNS:
+            self.sensor_tree_list_view.heading(column, text=column.capitalize(), anchor="e", command=lambda c=column: self.sort_list_view(c))
+            self.sensor_tree_list_view.column(column, width=100, minwidth=60, anchor="e", stretch=False)
+        tree_scrollbar = ttk.Scrollbar(self.content_frame_list_view, orient="vertical", command=self.sensor_tree_list_view.yview, style="Vertical.TScrollbar")
+        self.sensor_tree_list_view.configure(yscrollcommand=tree_scrollbar.set)
+        tree_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.sensor_tree_list_view.pack(fill=tk.BOTH, expand=True)
+        # Rows are built once per selected hardware and then updated in place.
+        self.list_view_children = {} # parent iid -> child iids in tree order ("" is the root)
+        self.list_view_sensors = {} # sensor_id -> Sensor shown in the tree
+        self.list_view_search_text = {} # sensor_id -> lowercased text the filter matches against
+        self.list_view_row_values = {} # iid -> values tuple currently shown
+        self.list_view_extremes = {} # sensor_id -> [min, max] seen while the row was shown
+        self.list_view_sort = None # (column, descending) or None for the backend's order
+        self.list_view_layout = {} # parent iid -> visible child iids as currently laid out
         
         # --- Selective View components ---
         self.selective_canvas = tk.Canvas(self.main_display_frame, bg=WINDOW_BG_COLOR, highlightthickness=0) # Use WINDOW_BG for canvas
@@ -162,94 +226,329 @@ class SystemStatsApp(tk.Tk):
         self.selective_scrollable_frame = tk.Frame(self.selective_canvas, bg=WINDOW_BG_COLOR) # Match canvas bg
         self.selective_scrollable_frame.bind("<Configure>", lambda e: self.selective_canvas.configure(scrollregion=self.selective_canvas.bbox("all")))
         self.selective_canvas.create_window((0, 0), window=self.selective_scrollable_frame, anchor="nw")
-        self.selective_canvas.configure(yscrollcommand=self.selective_scrollbar.set)
+        self.selective_canvas.configure(yscrollcommand=self._on_selective_scroll) # Also builds sections and redraws sparklines scrolled into view
         self.selective_canvas.bind("<MouseWheel>", self._on_selective_mousewheel) 
         self.selective_canvas.bind("<Button-4>", self._on_selective_mousewheel) 
         self.selective_canvas.bind("<Button-5>", self._on_selective_mousewheel)
 
+        # Retained dashboard widgets; build_selective_view_ui diffs against these instead of rebuilding.
         self.selective_view_hw_frames = {} 
         self.selective_view_hw_labels = {} 
+        self.selective_view_name_labels = {} # hw_id -> {sensor_id: name label}
+        self.selective_view_hw_positions = {} # hw_id -> (row, column) in the dashboard grid
+        self.selective_view_sensor_rows = {} # sensor_id -> row inside its hardware section
+        self.selective_view_label_text = {} # sensor_id -> text currently shown in its value label
+        self.selective_view_num_columns = 0
+        self.selective_view_layout = [] # [(hw_id, [sensor_id, ...])] of every configured section, in grid order
+        self.selective_view_placeholders = {} # hw_id -> (empty frame, height) holding the grid cell of a section out of view
+        self.selective_view_section_heights = {} # hw_id -> (sensor count, measured height) of sections that were built
+        self.selective_view_virtualize_job = None # pending after_idle viewport check
+        self.selective_view_alerting = set() # sensor ids whose value label is highlighted by an active alert
+        self.selective_view_sparklines = {} # sensor_id -> (canvas, line item) next to the value label
+        self.sparkline_dirty = set() # sensor ids with readings not drawn yet (new data, or scrolled out of view)
+        self.sparkline_seq = None # snapshot whose readings were last appended
+        self.sparkline_job = None # pending after_idle redraw; at most one per tick
         
         # --- Status Bar ---
         self.status_bar = tk.Label(self, text="Initializing...", font=(FONT_FAMILY_UI, FONT_SIZE_SMALL), 
                                    fg=TEXT_COLOR, bg=NAV_BG_COLOR, relief=tk.FLAT, anchor="w", bd=0, padx=10) # Styled status bar
         self.status_bar.pack(side=tk.BOTTOM, fill=tk.X)
+        self.profile_bar = tk.Label(self, text="", font=(FONT_FAMILY_MONO, FONT_SIZE_SMALL), fg=TEXT_COLOR, bg=NAV_BG_COLOR,
+                                    relief=tk.FLAT, anchor="w", bd=0, padx=10) # Packed above the status bar while profiling
+        if PROFILING_ENABLED: self.set_profiling(True)
         
-        self._populate_initial_selective_view_config() 
+        # The first frame is laid out from the cached tree (values show as pending) while the backend opens.
+        if self.saved_dashboard is not None and self.cached_hardware:
+            self._populate_initial_selective_view_config(restore_hardware(self.cached_hardware))
         self.populate_navigation_list_view() 
 
         self.bind("<Configure>", self.on_window_resize) 
         self.switch_view() 
+        self.mark_startup_phase("window")
+        self.after_idle(lambda: self.mark_startup_phase("first_paint"))
         self.update_stats_loop()
         self.update_status_bar() # Initial status bar update
+        threading.Thread(target=self._open_backend, name="glanced-init", daemon=True).start()
+
+    def mark_startup_phase(self, phase):
+        if phase not in self.startup_phases: self.startup_phases[phase] = time.perf_counter() - self.startup_started
+
+    def _open_backend(self):
+        # Runs on the glanced-init thread: loading pythonnet and probing drivers must not hold up the window.
+        if not self.backend.available: self.backend.open()
+        self.mark_startup_phase("backend_open")
+        self.backend_opened = True
+
+    def on_backend_ready(self):
+        self.backend_state = "ready" if self.backend.available else "failed"
+        if self.backend.available:
+            if self.selective_view_config: self.saved_dashboard = self.dashboard_selection()
+            self._populate_initial_selective_view_config()
+            self.sampler.start()
+            if self.metrics_exporter:
+                try: self.metrics_exporter.start()
+                except OSError as e: print(f"Error starting metrics exporter on port {METRICS_EXPORTER_PORT}: {e}"); self.metrics_exporter = None
+        else:
+            self.build_selective_view_ui()
+        self.populate_navigation_list_view()
+        self.switch_view()
+        self.update_status_bar()
 
     def update_status_bar(self):
-        lhm_status = "LHM Active" if LHM_AVAILABLE else "LHM N/A - Run as Admin?"
-        self.status_bar.config(text=f"Status: {lhm_status}  |  Last Update: {time.strftime('%H:%M:%S')}")
+        if self.backend_state == "loading":
+            self.status_bar.config(text=f"Status: Loading {self.backend.name} sensors..."); return
+        snapshot = self.sampler.latest
+        last_update = time.strftime('%H:%M:%S', time.localtime(snapshot.timestamp)) if snapshot else "--:--:--"
+        sampler_stats = self.sampler.stats()
+        self.status_bar.config(text=f"Status: {self.backend.status_text()}  |  Last Update: {last_update}  |  "
+                                    f"Sample: {sampler_stats['sample_duration_ms']['p50']:.0f} ms, jitter p99 {sampler_stats['sample_jitter_ms']['p99']:.0f} ms  |  "
+                                    f"UI lag p99: {self.ui_frame_latency_ms.percentile(99):.0f} ms  |  "
+                                    f"Skipped: {self.format_skip_pct.mean():.0f}% formats, {self.redraw_skip_pct.mean():.0f}% redraws  |  "
+                                    f"Updates saved: {sampler_stats['polling']['saved_per_minute']:.0f}/min")
+        if self.profiler is not None: self.profile_bar.config(text=self.profiler.status_text())
 
-    def _populate_initial_selective_view_config(self):
-        # ... (Logic remains the same, ensure it uses new FONT and COLOR constants if applicable within dialogs)
-        if not LHM_HARDWARE_ITEMS_CACHE or not LHM_HARDWARE_ENUMS:
+    # --- Profiling ---
+    def set_profiling(self, enabled):
+        # Off means no profiler object at all: the instrumented paths only test for None.
+        self.profiler = TickProfiler() if enabled else None
+        self.sampler.profiler = self.profiler
+        self.profiling_enabled.set(enabled)
+        if enabled:
+            self.profile_bar.config(text="Profile: waiting for data")
+            self.profile_bar.pack(side=tk.BOTTOM, fill=tk.X, before=self.status_bar)
+        else:
+            self.profile_bar.pack_forget()
+            if self.profile_overlay is not None: self.profile_overlay.destroy()
+
+    def open_profile_overlay(self):
+        if self.profiler is None: self.set_profiling(True)
+        if self.profile_overlay is not None: self.profile_overlay.lift(); return
+        self.profile_overlay = Toplevel(self)
+        self.profile_overlay.title("Tick Profile")
+        self.profile_overlay.geometry("640x420")
+        self.profile_overlay.configure(bg=FRAME_BG_COLOR)
+        self.profile_overlay.attributes("-topmost", True)
+        self.profile_overlay.protocol("WM_DELETE_WINDOW", self._close_profile_overlay)
+        self.profile_overlay_text = Label(self.profile_overlay, text="Waiting for data...", font=(FONT_FAMILY_MONO, FONT_SIZE_SMALL),
+                                          bg=TEXT_AREA_BG_COLOR, fg=TEXT_COLOR, justify=tk.LEFT, anchor="nw", padx=10, pady=10)
+        self.profile_overlay_text.pack(fill=tk.BOTH, expand=True, padx=10, pady=(10, 5))
+        Button(self.profile_overlay, text="Export JSON...", command=self.export_profile, bg=NAV_BUTTON_BG_COLOR, fg=NAV_BUTTON_FG_COLOR, relief=tk.FLAT,
+               activebackground=NAV_BUTTON_ACTIVE_BG_COLOR, activeforeground=NAV_BUTTON_ACTIVE_FG_COLOR, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL)).pack(pady=(0, 10))
+        self._refresh_profile_overlay()
+
+    def _close_profile_overlay(self):
+        self.profile_overlay.destroy()
+        self.profile_overlay = self.profile_overlay_text = None
+
+    def _refresh_profile_overlay(self):
+        if self.profile_overlay is None or self.profiler is None:
+            if self.profile_overlay is not None: self._close_profile_overlay()
+            return
+        summary = self.profiler.summary()
+        lines = [f"Last {summary['ticks']} ticks (ms)            p50      p99      max"]
+        for title, section in (("sample", summary["sample_phases_ms"]), ("frame", summary["frame_phases_ms"])):
+            for phase, stats in section.items():
+                lines.append(f"  {title + ' ' + phase:<28}{stats['p50']:8.2f} {stats['p99']:8.2f} {stats['max']:8.2f}")
+        lines.append("")
+        lines.append("Update() per hardware (ms)           p50      p99      max")
+        for hw_id, stats in sorted(summary["update_ms_by_hardware"].items(), key=lambda item: -item[1]["p99"]):
+            hw = self.sensor_index.hardware.get(hw_id)
+            lines.append(f"  {(hw.name if hw else hw_id)[:28]:<28}{stats['p50']:8.2f} {stats['p99']:8.2f} {stats['max']:8.2f}")
+        lines.append("")
+        lines.append("Per tick                             p50      p99      max")
+        for name, stats in summary["counts"].items():
+            lines.append(f"  {name:<28}{stats['p50']:8.0f} {stats['p99']:8.0f} {stats['max']:8.0f}")
+        self.profile_overlay_text.config(text="\n".join(lines))
+        self.after(PROFILE_OVERLAY_REFRESH_MS, self._refresh_profile_overlay)
+
+    def export_profile(self):
+        if self.profiler is None: print("Info: Profiling is off; nothing to export."); return
+        path = filedialog.asksaveasfilename(parent=self, title="Export Tick Profile", defaultextension=".json",
+                                            initialfile=time.strftime("glanced-profile-%Y%m%d-%H%M%S.json"), filetypes=[("JSON", "*.json")])
+        if not path: return
+        try: print(f"Info: Tick profile exported to {self.profiler.export_json(path)}")
+        except OSError as e: print(f"Error exporting tick profile to {path}: {e}")
+
+    def evaluate_alerts(self, snapshot):
+        # Runs on the sampler thread; the UI picks up alerts.active_sensor_ids on its next frame.
+        self.alerts.evaluate(snapshot.values, snapshot.timestamp)
+
+    def record_history(self, snapshot):
+        # Runs on the sampler thread; readings of sensors that never had a sparkline are not kept.
+        self.history.append(snapshot.timestamp, snapshot.values, register=False)
+
+    def record_snapshot(self, snapshot):
+        # Runs on the sampler thread; a no-op unless recording.
+        recorder = self.recorder
+        if recorder is not None: recorder.write(snapshot)
+
+    def toggle_recording(self):
+        if self.recorder is not None:
+            recorder, self.recorder = self.recorder, None
+            recorder.close()
+            self.filemenu.entryconfig(0, label="Start Recording...")
+            print(f"Info: Recorded {recorder.rows_written} samples to {recorder.path}.")
             return
+        if not RECORDING_AVAILABLE: print("Info: NumPy not found, recording disabled."); return
+        if self.backend_state != "ready": print("Info: Sensors are still loading; try recording again in a moment."); return
+        path = filedialog.asksaveasfilename(parent=self, title="Record Session", defaultextension=RECORDING_EXTENSION,
+                                            initialfile=time.strftime(f"glanced-%Y%m%d-%H%M%S{RECORDING_EXTENSION}"), filetypes=[("Glanced recording", f"*{RECORDING_EXTENSION}")])
+        if not path: return
+        # Every known sensor gets a column; the ones the sampler is not polling stay empty (NaN).
+        sensors = [sensor for hw in self.backend.hardware for sensor in hw.iter_sensors()]
+        try: self.recorder = RecordingWriter(path, sensors, serialize_hardware(self.backend.hardware), self.backend.name)
+        except OSError as e: print(f"Error starting recording {path}: {e}"); return
+        self.filemenu.entryconfig(0, label="Stop Recording")
+        print(f"Info: Recording {len(sensors)} sensors to {path}.")
+
+    def all_hardware(self, hardware_items=None):
+        # hardware_items (the live backend tree by default) followed by the derived sensors' node, if any.
+        hardware_items = self.backend.hardware if hardware_items is None else hardware_items
+        return hardware_items + [self.derived.node] if self.derived is not None else hardware_items
+
+    def _populate_initial_selective_view_config(self, hardware_items=None):
+        # hardware_items: the live backend tree, or the cached one for the first frame while loading.
+        hardware_items = self.backend.hardware if hardware_items is None else hardware_items
+        if not hardware_items:
+            return
+        hardware_items = self.all_hardware(hardware_items)
         
-        HardwareType = LHM_HARDWARE_ENUMS['HardwareType']
-        SensorType = LHM_HARDWARE_ENUMS['SensorType']
         self.selective_view_config.clear()
+        if self.sensor_index.ensure(hardware_items):
+            if self.derived is not None: self.derived.bind(self.sensor_index)
 
-        for hw_item in LHM_HARDWARE_ITEMS_CACHE:
-            hw_id = hw_item.Identifier.ToString()
-            if hw_id in self.selective_view_config: continue
-
-            self.selective_view_config[hw_id] = {
-                'show_hw': BooleanVar(value=False), 
-                'name': hw_item.Name,
-                'lhm_item': hw_item, 
-                'sensors': {}
-            }
-            
-            is_first_gpu_selected = any(self.selective_view_config[prev_id]['show_hw'].get() 
-                                        for prev_id in self.selective_view_config 
-                                        if prev_id != hw_id and 
-                                           self.selective_view_config[prev_id]['lhm_item'].HardwareType in [HardwareType.GpuNvidia, HardwareType.GpuAmd, HardwareType.GpuIntel])
-
-            if hw_item.HardwareType == HardwareType.Cpu:
-                self.selective_view_config[hw_id]['show_hw'].set(True)
-            elif hw_item.HardwareType in [HardwareType.GpuNvidia, HardwareType.GpuAmd, HardwareType.GpuIntel] and not is_first_gpu_selected:
-                self.selective_view_config[hw_id]['show_hw'].set(True)
-
-
-            key_cpu_sensors = {"Temperature": ["package", "core", "tctl", "tdie"], "CPU Fan": ["cpu fan", "cpu_fan1"], "System Fan": ["system fan", "sys_fan"], "Load": ["cpu total"]}
-            key_gpu_sensors = {"Temperature": ["core", "edge"], "Hot Spot Temp": ["hot spot", "hotspot", "junction"], "Fan Speed": ["gpu fan", "fan"], "Load": ["gpu core", "core"]}
-            
-            all_sensors_for_hw = []
-            def collect_sensors(item, path_prefix=""):
-                for sensor in item.Sensors:
-                    all_sensors_for_hw.append({'lhm_sensor': sensor, 'path': path_prefix + sensor.Name})
-                for sub_item in item.SubHardware:
-                    sub_item.Update() 
-                    collect_sensors(sub_item, path_prefix + sub_item.Name + " / ")
-            collect_sensors(hw_item)
-
-            for sensor_info in all_sensors_for_hw:
-                sensor = sensor_info['lhm_sensor']
-                sensor_id = sensor.Identifier.ToString()
-                sensor_display_name = sensor_info['path'] 
-                should_show_sensor_by_default = False
-                if self.selective_view_config[hw_id]['show_hw'].get(): 
-                    current_key_sensors = {}
-                    if hw_item.HardwareType == HardwareType.Cpu: current_key_sensors = key_cpu_sensors
-                    elif hw_item.HardwareType in [HardwareType.GpuNvidia, HardwareType.GpuAmd, HardwareType.GpuIntel]: current_key_sensors = key_gpu_sensors
-                    for display_key, keywords in current_key_sensors.items():
-                        target_sensor_type_name = display_key.split(" ")[-1] if display_key != "Hot Spot Temp" else "Temperature"
-                        if display_key in ["CPU Fan", "System Fan", "Fan Speed"]: target_sensor_type_name = "Fan"
-                        actual_sensor_type_enum = getattr(SensorType, target_sensor_type_name, None)
-                        if sensor.SensorType == actual_sensor_type_enum and any(kw.lower() in sensor.Name.lower() for kw in keywords):
-                            should_show_sensor_by_default = True; break
-                self.selective_view_config[hw_id]['sensors'][sensor_id] = {
-                    'show_sensor': BooleanVar(value=should_show_sensor_by_default),
-                    'name': sensor_display_name, 'type': sensor.SensorType, 'lhm_sensor': sensor }
+        for hw_item in hardware_items:
+            if hw_item.id not in self.selective_view_config: self._add_selective_view_config_entry(hw_item)
         self.apply_selective_view_config()
 
+    def _add_selective_view_config_entry(self, hw_item):
+        # Saved selection if there is one, else the defaults (CPU, host and the first GPU with their key sensors).
+        hw_id = hw_item.id
+        self.selective_view_config[hw_id] = {
+            'show_hw': BooleanVar(value=False), 
+            'name': hw_item.name,
+            'hw_item': hw_item, 
+            'sensors': {}
+        }
+        
+        is_first_gpu_selected = any(self.selective_view_config[prev_id]['show_hw'].get() 
+                                    for prev_id in self.selective_view_config 
+                                    if prev_id != hw_id and 
+                                       self.selective_view_config[prev_id]['hw_item'].hw_type in GPU_HARDWARE_TYPES)
+
+        saved = self.saved_dashboard.get(hw_id, {}) if self.saved_dashboard is not None else None
+        if saved is not None:
+            self.selective_view_config[hw_id]['show_hw'].set(bool(saved.get("show")))
+        elif hw_item.hw_type in ("Cpu", HOST_HARDWARE_TYPE, DERIVED_HARDWARE_TYPE):
+            self.selective_view_config[hw_id]['show_hw'].set(True)
+        elif hw_item.hw_type in GPU_HARDWARE_TYPES and not is_first_gpu_selected:
+            self.selective_view_config[hw_id]['show_hw'].set(True)
+        saved_sensor_ids = set(saved.get("sensors", ())) if saved is not None else None
+
+        for sensor_info in self.collect_sensors_with_paths(hw_item):
+            sensor = sensor_info['sensor']
+            sensor_id = sensor.id
+            sensor_display_name = sensor_info['path'] 
+            should_show_sensor_by_default = False
+            if saved_sensor_ids is not None:
+                should_show_sensor_by_default = sensor_id in saved_sensor_ids
+            elif self.selective_view_config[hw_id]['show_hw'].get(): 
+                should_show_sensor_by_default = is_key_sensor(hw_item, sensor)
+            self.selective_view_config[hw_id]['sensors'][sensor_id] = {
+                'show_sensor': BooleanVar(value=should_show_sensor_by_default),
+                'name': sensor_display_name, 'type': sensor.sensor_type, 'sensor': sensor }
+
+    def dashboard_selection(self):
+        # Saved entries for hardware not enumerated (yet) are carried over untouched.
+        selection = {hw_id: saved for hw_id, saved in (self.saved_dashboard or {}).items() if hw_id not in self.selective_view_config}
+        for hw_id, hw_conf in self.selective_view_config.items():
+            selection[hw_id] = {"show": hw_conf['show_hw'].get(),
+                                "sensors": [sensor_id for sensor_id, sensor_conf in hw_conf['sensors'].items() if sensor_conf['show_sensor'].get()]}
+        return selection
+
+    def save_dashboard_config(self):
+        if not self.backend.available: return
+        if self.backend.hardware_types is None: self.cached_hardware = serialize_hardware(self.backend.hardware)
+        self.saved_dashboard = self.dashboard_selection()
+        if self.backend.saves_config: save_config(self.backend.name, self.saved_dashboard, self.cached_hardware)
+
+    def start_full_enumeration(self):
+        # Called once the first data is on screen. If everything is already enumerated, just cache it for the next launch.
+        if self.backend.hardware_types is None: self.save_dashboard_config(); return
+        self.sampler.call_soon(self._enumerate_all_hardware)
+
+    def _enumerate_all_hardware(self):
+        # Runs on the sampler thread, between samples; update_stats_loop picks up each category as it comes online.
+        def progress(): self.hardware_enumerated = True
+        if self.backend.enumerate_all(progress): progress()
+
+    def on_backend_hardware_changed(self):
+        # Runs on the backend's or the sampler thread (a remote host connected, a device was plugged in or
+        # removed); update_stats_loop patches the affected hardware on its next frame.
+        self.hardware_plugged = True
+
+    def schedule_hotplug_scan(self):
+        # Between periodic scans, a backend notification (hardware_dirty) asks for one on the next frame.
+        now = time.monotonic()
+        if not self.backend.hardware_dirty and (not HOTPLUG_SCAN_INTERVAL_MS or now < self.next_hotplug_scan): return
+        self.next_hotplug_scan = now + HOTPLUG_SCAN_INTERVAL_MS / 1000.0
+        self.backend.hardware_dirty = False
+        self.sampler.request_rescan(self.on_backend_hardware_changed)
+
+    def on_hardware_plugged(self):
+        # Incremental counterpart of on_hardware_enumerated: only the top level nodes that were added,
+        # removed or replaced (a replaced node is both) are touched in the sensor index, the dashboard
+        # config, the navigation list and the dashboard; everything else keeps its widgets and state.
+        hardware_items = self.all_hardware()
+        known, current = self.sensor_index.hardware, {hw_item.id: hw_item for hw_item in hardware_items}
+        removed = [hw_item for hw_id, hw_item in known.items() if current.get(hw_id) is not hw_item]
+        added = [hw_item for hw_item in hardware_items if known.get(hw_item.id) is not hw_item]
+        if not added and not removed: return
+        self.saved_dashboard = self.dashboard_selection() # hardware that comes back later gets its selection again
+        self.sensor_index.patch(hardware_items, added, removed)
+        if self.derived is not None: self.derived.bind(self.sensor_index) # patterns pick up or drop the sensors of these devices
+
+        for hw_item in removed: self.selective_view_config.pop(hw_item.id, None)
+        for hw_item in added: self._add_selective_view_config_entry(hw_item)
+        ordered = [(hw_id, self.selective_view_config[hw_id]) for hw_id in current if hw_id in self.selective_view_config]
+        self.selective_view_config.clear(); self.selective_view_config.update(ordered)
+        self.patch_navigation_list_view(added, removed)
+
+        selected = self.selected_hardware_id_list_view
+        if any(hw_item.id == selected for hw_item in removed):
+            if selected in current: self.select_hardware_list_view(selected) # replaced: rebuild its rows from the new node
+            else:
+                self.selected_hardware_id_list_view = None
+                if self.current_view_mode.get() == "List View" and hardware_items: self.select_hardware_list_view(hardware_items[0].id)
+                else: self.build_list_view_rows()
+        for hw_item in removed:
+            # A replaced node's section is rebuilt from the new node (its sparklines carry on).
+            if hw_item.id in current and hw_item.id in self.selective_view_hw_frames: self._release_selective_section(hw_item.id)
+        self.apply_selective_view_config() # the cached tree is saved on exit; a device can come and go many times
+        added_ids, removed_ids = {hw_item.id for hw_item in added}, {hw_item.id for hw_item in removed}
+        changes = [f"added {hw_item.name}" for hw_item in added if hw_item.id not in removed_ids]
+        changes += [f"removed {hw_item.name}" for hw_item in removed if hw_item.id not in added_ids]
+        changes += [f"replaced {hw_item.name}" for hw_item in added if hw_item.id in removed_ids]
+        print(f"Info: Hardware changed: {', '.join(changes)}.")
+
+    def on_hardware_enumerated(self):
+        self.saved_dashboard = self.dashboard_selection()
+        self._populate_initial_selective_view_config()
+        self.populate_navigation_list_view()
+        if self.current_view_mode.get() == "List View" and self.selected_hardware_id_list_view: self.select_hardware_list_view(self.selected_hardware_id_list_view)
+        if self.backend.hardware_types is None: self.save_dashboard_config()
+
+    @staticmethod
+    def collect_sensors_with_paths(hw_item):
+        all_sensors_for_hw = []
+        def collect_sensors(item, path_prefix=""):
+            for sensor in item.sensors:
+                all_sensors_for_hw.append({'sensor': sensor, 'path': path_prefix + sensor.name})
+            for sub_item in item.sub_hardware:
+                collect_sensors(sub_item, path_prefix + sub_item.name + " / ")
+        collect_sensors(hw_item)
+        return all_sensors_for_hw
+
 
     def on_window_resize(self, event):
         if event.widget == self:
@@ -289,11 +588,11 @@ class SystemStatsApp(tk.Tk):
         hw_config_canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=(10,0), pady=5)
         hw_config_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, padx=(0,10), pady=5)
 
-        if LHM_HARDWARE_ITEMS_CACHE:
-            for hw_item_cache_obj in LHM_HARDWARE_ITEMS_CACHE: 
-                hw_id = hw_item_cache_obj.Identifier.ToString()
+        if self.backend.hardware:
+            for hw_item_cache_obj in self.all_hardware(): 
+                hw_id = hw_item_cache_obj.id
                 if hw_id not in self.selective_view_config: # Should be populated
-                    self.selective_view_config[hw_id] = {'show_hw': BooleanVar(value=False), 'name': hw_item_cache_obj.Name, 'lhm_item': hw_item_cache_obj, 'sensors': {}}
+                    self.selective_view_config[hw_id] = {'show_hw': BooleanVar(value=False), 'name': hw_item_cache_obj.name, 'hw_item': hw_item_cache_obj, 'sensors': {}}
 
                 entry_frame = Frame(hw_config_scrollable_frame, bg=FRAME_BG_COLOR)
                 entry_frame.pack(fill=tk.X, pady=3, padx=5)
@@ -312,12 +611,12 @@ class SystemStatsApp(tk.Tk):
                                      font=(FONT_FAMILY_UI, FONT_SIZE_SMALL), padx=5)
                 edit_button.pack(side=tk.RIGHT, padx=5)
         else:
-            Label(hw_config_scrollable_frame, text="No hardware found by LHM.", bg=FRAME_BG_COLOR, fg=TEXT_COLOR).pack()
+            Label(hw_config_scrollable_frame, text=f"No hardware found by {self.backend.name}.", bg=FRAME_BG_COLOR, fg=TEXT_COLOR).pack()
 
         button_frame = Frame(config_dialog, bg=FRAME_BG_COLOR) # Use FRAME_BG_COLOR
         button_frame.pack(pady=15, side=tk.BOTTOM, fill=tk.X)
         
-        ok_button = Button(button_frame, text="Apply & Close", width=15, command=lambda: [self.apply_selective_view_config(), config_dialog.destroy()],
+        ok_button = Button(button_frame, text="Apply & Close", width=15, command=lambda: [self.apply_selective_view_config(), self.save_dashboard_config(), config_dialog.destroy()],
                            bg=NAV_BUTTON_BG_COLOR, fg=NAV_BUTTON_FG_COLOR, relief=tk.FLAT, bd=2, activebackground=NAV_BUTTON_ACTIVE_BG_COLOR, activeforeground=NAV_BUTTON_ACTIVE_FG_COLOR, font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL))
         ok_button.pack(side=tk.RIGHT, padx=10)
 
@@ -344,26 +643,16 @@ class SystemStatsApp(tk.Tk):
         sensor_list_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, padx=(0,10), pady=5)
 
         hw_config_entry = self.selective_view_config[hw_id]
-        lhm_hardware_item = hw_config_entry['lhm_item'] 
-        
-        all_sensors_for_this_hw = []
-        def _collect_sensors_recursive(item, path_prefix=""):
-            for sensor in item.Sensors:
-                all_sensors_for_this_hw.append({'lhm_sensor': sensor, 'display_name': path_prefix + sensor.Name})
-            for sub_item in item.SubHardware:
-                sub_item.Update()
-                _collect_sensors_recursive(sub_item, path_prefix + sub_item.Name + " / ")
-        lhm_hardware_item.Update() 
-        _collect_sensors_recursive(lhm_hardware_item)
-
-        for sensor_info in all_sensors_for_this_hw:
-            sensor_obj = sensor_info['lhm_sensor']
-            sensor_id = sensor_obj.Identifier.ToString()
-            sensor_display_name = sensor_info['display_name'] 
+        hardware_item = hw_config_entry['hw_item'] 
+
+        for sensor_info in self.collect_sensors_with_paths(hardware_item):
+            sensor_obj = sensor_info['sensor']
+            sensor_id = sensor_obj.id
+            sensor_display_name = sensor_info['path'] 
             if sensor_id not in hw_config_entry['sensors']:
                 hw_config_entry['sensors'][sensor_id] = {
                     'show_sensor': BooleanVar(value=False), 'name': sensor_display_name, 
-                    'type': sensor_obj.SensorType, 'lhm_sensor': sensor_obj }
+                    'type': sensor_obj.sensor_type, 'sensor': sensor_obj }
             cb = Checkbutton(sensor_list_scrollable_frame, text=sensor_display_name, 
                              variable=hw_config_entry['sensors'][sensor_id]['show_sensor'],
                              bg=FRAME_BG_COLOR, fg=TEXT_COLOR, selectcolor=SELECTIVE_SECTION_BG, 
@@ -379,54 +668,157 @@ class SystemStatsApp(tk.Tk):
         self.build_selective_view_ui() 
 
     def build_selective_view_ui(self):
-        for widget in self.selective_scrollable_frame.winfo_children(): widget.destroy()
-        self.selective_view_hw_frames.clear(); self.selective_view_hw_labels.clear()
+        # Diffs the configured dashboard against the retained widgets: only added/removed sections and
+        # sensors create or destroy widgets, and sections are re-gridded only when their cell changes.
+        # Sections away from the viewport are virtualized: an empty frame of the section's height holds
+        # their grid cell, they have no labels to refresh and their hardware is sampled in the background.
         available_width = self.selective_canvas.winfo_width()
         if available_width <= 1: available_width = self.winfo_width() - (self.selective_scrollbar.winfo_width() if self.selective_scrollbar.winfo_ismapped() else 0) - 40 # Adjusted padding
         num_columns = max(1, available_width // MIN_SELECTIVE_SECTION_WIDTH)
-        prev_cols = self.selective_scrollable_frame.grid_size()[0]
-        for i in range(prev_cols): self.selective_scrollable_frame.columnconfigure(i, weight=0, uniform=None) 
-        for i in range(num_columns): self.selective_scrollable_frame.columnconfigure(i, weight=1, uniform="sel_hw_group_dyn")
 
-        current_row, current_col = 0, 0
-        if LHM_AVAILABLE and LHM_HARDWARE_ENUMS: 
+        desired_layout = []
+        if self.backend.available or self.backend_state == "loading": 
             for hw_id, hw_conf in self.selective_view_config.items():
                 if hw_conf['show_hw'].get(): 
-                    hw_name_display = hw_conf['name']
-                    frame = tk.LabelFrame(self.selective_scrollable_frame, text=hw_name_display,
-                                          font=(FONT_FAMILY_UI, FONT_SIZE_HEADER, "bold"),
-                                          fg=LABEL_FRAME_TEXT_COLOR, bg=SELECTIVE_SECTION_BG, padx=10, pady=10, relief=tk.GROOVE, bd=1) # Added relief
-                    frame.grid(row=current_row, column=current_col, sticky="nsew", padx=10, pady=10) # Increased padding
-                    self.selective_scrollable_frame.rowconfigure(current_row, weight=0) 
-                    self.selective_view_hw_frames[hw_id] = frame
-                    self.selective_view_hw_labels[hw_id] = {} 
-                    sensor_row_idx = 0
-                    for sensor_id, sensor_conf_detail in hw_conf['sensors'].items(): 
-                        if sensor_conf_detail['show_sensor'].get(): 
-                            sensor_display_name_short = sensor_conf_detail['lhm_sensor'].Name 
-                            tk.Label(frame, text=f"{sensor_display_name_short}:", font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL), 
-                                     fg=TEXT_COLOR, bg=SELECTIVE_SECTION_BG).grid(row=sensor_row_idx, column=0, sticky="w", pady=2, padx=5)
-                            value_label = tk.Label(frame, text="N/A", font=(FONT_FAMILY_UI, FONT_SIZE_VALUE, "bold"), 
+                    desired_layout.append((hw_id, [sensor_id for sensor_id, sensor_conf_detail in hw_conf['sensors'].items() if sensor_conf_detail['show_sensor'].get()]))
+        self.selective_view_layout = desired_layout
+        desired_hw_ids = {hw_id for hw_id, _ in desired_layout}
+        for hw_id in [hw_id for hw_id in self.selective_view_hw_frames if hw_id not in desired_hw_ids]: self._release_selective_section(hw_id)
+        for hw_id in [hw_id for hw_id in self.selective_view_placeholders if hw_id not in desired_hw_ids]:
+            self.selective_view_placeholders.pop(hw_id)[0].destroy(); self.selective_view_hw_positions.pop(hw_id, None)
+
+        if num_columns != self.selective_view_num_columns:
+            prev_cols = max(self.selective_view_num_columns, self.selective_scrollable_frame.grid_size()[0])
+            for i in range(prev_cols): self.selective_scrollable_frame.columnconfigure(i, weight=0, uniform=None) 
+            for i in range(num_columns): self.selective_scrollable_frame.columnconfigure(i, weight=1, uniform="sel_hw_group_dyn")
+            self.selective_view_num_columns = num_columns
+
+        visible = self._visible_selective_sections(desired_layout, num_columns)
+        widgets_created = False
+        for position, (hw_id, sensor_ids) in enumerate(desired_layout):
+            grid_cell = divmod(position, num_columns)
+            if hw_id not in visible:
+                if hw_id in self.selective_view_hw_frames: self._release_selective_section(hw_id)
+                height = self._selective_section_height(hw_id, len(sensor_ids))
+                placeholder = self.selective_view_placeholders.get(hw_id)
+                if placeholder is None:
+                    placeholder = (tk.Frame(self.selective_scrollable_frame, bg=WINDOW_BG_COLOR, height=height), height)
+                elif placeholder[1] != height:
+                    placeholder[0].config(height=height); placeholder = (placeholder[0], height)
+                self.selective_view_placeholders[hw_id] = placeholder
+                if self.selective_view_hw_positions.get(hw_id) != grid_cell:
+                    placeholder[0].grid(row=grid_cell[0], column=grid_cell[1], sticky="nsew", padx=10, pady=10)
+                    self.selective_view_hw_positions[hw_id] = grid_cell
+                continue
+            placeholder = self.selective_view_placeholders.pop(hw_id, None)
+            if placeholder: placeholder[0].destroy(); self.selective_view_hw_positions.pop(hw_id, None)
+            frame = self.selective_view_hw_frames.get(hw_id)
+            if frame is None:
+                frame = tk.LabelFrame(self.selective_scrollable_frame, text=self.selective_view_config[hw_id]['name'],
+                                      font=(FONT_FAMILY_UI, FONT_SIZE_HEADER, "bold"),
+                                      fg=LABEL_FRAME_TEXT_COLOR, bg=SELECTIVE_SECTION_BG, padx=10, pady=10, relief=tk.GROOVE, bd=1) # Added relief
+                frame.columnconfigure(1, weight=1)
+                self.selective_view_hw_frames[hw_id] = frame
+                self.selective_view_hw_labels[hw_id] = {} 
+                self.selective_view_name_labels[hw_id] = {}
+                widgets_created = True
+            if self.selective_view_hw_positions.get(hw_id) != grid_cell:
+                frame.grid(row=grid_cell[0], column=grid_cell[1], sticky="nsew", padx=10, pady=10) # Increased padding
+                self.selective_scrollable_frame.rowconfigure(grid_cell[0], weight=0) 
+                self.selective_view_hw_positions[hw_id] = grid_cell
+            widgets_created |= self._sync_selective_section(hw_id, frame, sensor_ids)
+
+        self.sensor_index.select(sensor_id for _, sensor_ids in desired_layout for sensor_id in sensor_ids)
+        self.update_sampling_targets()
+        if widgets_created: self.refresh_selective_view_sensors() 
+
+    def _release_selective_section(self, hw_id):
+        self.selective_view_hw_frames.pop(hw_id).destroy()
+        for sensor_id in self.selective_view_hw_labels.pop(hw_id):
+            self.selective_view_label_text.pop(sensor_id, None); self.selective_view_sensor_rows.pop(sensor_id, None)
+            self.selective_view_alerting.discard(sensor_id); self._forget_sparkline(sensor_id)
+        self.selective_view_name_labels.pop(hw_id, None); self.selective_view_hw_positions.pop(hw_id, None)
+
+    def _selective_section_height(self, hw_id, sensor_count):
+        measured = self.selective_view_section_heights.get(hw_id)
+        if measured and measured[0] == sensor_count: return measured[1]
+        return SELECTIVE_SECTION_CHROME_PX + sensor_count * SELECTIVE_SENSOR_ROW_PX
+
+    def _visible_selective_sections(self, layout, num_columns):
+        # Section rows are laid out from measured (or estimated) heights, so finding what is on screen
+        # needs no widgets for the sections that are not.
+        if not VIRTUALIZE_SELECTIVE_VIEW: return {hw_id for hw_id, _ in layout}
+        for hw_id, frame in self.selective_view_hw_frames.items():
+            height = frame.winfo_height()
+            if height > 1: self.selective_view_section_heights[hw_id] = (len(self.selective_view_hw_labels[hw_id]), height)
+        view_top = self.selective_canvas.canvasy(0)
+        view_height = self.selective_canvas.winfo_height()
+        if view_height <= 1: view_height = self.winfo_height()
+        visible, row_top = set(), 0
+        for row_start in range(0, len(layout), num_columns):
+            row = layout[row_start:row_start + num_columns]
+            row_height = max(self._selective_section_height(hw_id, len(sensor_ids)) for hw_id, sensor_ids in row) + 20 # grid pady
+            for hw_id, _ in row:
+                # Built sections are kept until twice the margin away, so scrolling back and forth does not thrash.
+                margin = SELECTIVE_VIEWPORT_MARGIN_PX * (2 if hw_id in self.selective_view_hw_frames else 1)
+                if row_top < view_top + view_height + margin and row_top + row_height > view_top - margin: visible.add(hw_id)
+            row_top += row_height
+        return visible
+
+    def schedule_selective_virtualize(self):
+        if self.selective_view_virtualize_job is None: self.selective_view_virtualize_job = self.after_idle(self._virtualize_selective_view)
+
+    def _virtualize_selective_view(self):
+        # Rebuilds only when scrolling or resizing changed which sections should exist.
+        self.selective_view_virtualize_job = None
+        if not VIRTUALIZE_SELECTIVE_VIEW or self.current_view_mode.get() != "Selective View": return
+        if self._visible_selective_sections(self.selective_view_layout, max(1, self.selective_view_num_columns)) != set(self.selective_view_hw_frames):
+            self.build_selective_view_ui()
+
+    def _sync_selective_section(self, hw_id, frame, sensor_ids):
+        value_labels, name_labels = self.selective_view_hw_labels[hw_id], self.selective_view_name_labels[hw_id]
+        wanted = set(sensor_ids)
+        for sensor_id in [sensor_id for sensor_id in value_labels if sensor_id not in wanted]:
+            value_labels.pop(sensor_id).destroy(); name_labels.pop(sensor_id).destroy()
+            self.selective_view_label_text.pop(sensor_id, None); self.selective_view_sensor_rows.pop(sensor_id, None)
+            self.selective_view_alerting.discard(sensor_id)
+            sparkline = self._forget_sparkline(sensor_id)
+            if sparkline: sparkline[0].destroy()
+        widgets_created, new_sparklines = False, []
+        show_sparklines = self.sparklines_enabled.get()
+        for sensor_row_idx, sensor_id in enumerate(sensor_ids):
+            if sensor_id not in value_labels:
+                sensor_display_name_short = self.selective_view_config[hw_id]['sensors'][sensor_id]['sensor'].name 
+                name_labels[sensor_id] = tk.Label(frame, text=f"{sensor_display_name_short}:", font=(FONT_FAMILY_UI, FONT_SIZE_NORMAL), 
+                                                  fg=TEXT_COLOR, bg=SELECTIVE_SECTION_BG)
+                value_labels[sensor_id] = tk.Label(frame, text="N/A", font=(FONT_FAMILY_UI, FONT_SIZE_VALUE, "bold"), 
                                                    fg=VALUE_COLOR, bg=SELECTIVE_SECTION_BG) # Use VALUE_COLOR
-                            value_label.grid(row=sensor_row_idx, column=1, sticky="e", padx=5, pady=2)
-                            self.selective_view_hw_labels[hw_id][sensor_id] = value_label 
-                            sensor_row_idx +=1
-                    frame.columnconfigure(1, weight=1)
-                    current_col += 1
-                    if current_col >= num_columns: current_col = 0; current_row += 1
-        self.selective_scrollable_frame.update_idletasks()
-        self.selective_canvas.config(scrollregion=self.selective_canvas.bbox("all"))
-        self.refresh_selective_view_sensors() 
+                self.selective_view_label_text[sensor_id] = "N/A"
+                widgets_created = True
+            sparkline = self.selective_view_sparklines.get(sensor_id)
+            if show_sparklines and sparkline is None:
+                canvas = tk.Canvas(frame, width=SPARKLINE_WIDTH, height=SPARKLINE_HEIGHT, bg=SELECTIVE_SECTION_BG, highlightthickness=0, bd=0)
+                # One line item per sparkline, parked off-canvas until it has data; redraws only move its coordinates.
+                sparkline = self.selective_view_sparklines[sensor_id] = (canvas, canvas.create_line(*SPARKLINE_PARKED, fill=SPARKLINE_COLOR, width=1))
+                self.sparkline_dirty.add(sensor_id); new_sparklines.append(sensor_id)
+                self.selective_view_sensor_rows.pop(sensor_id, None) # grid the new canvas below
+            if self.selective_view_sensor_rows.get(sensor_id) != sensor_row_idx:
+                name_labels[sensor_id].grid(row=sensor_row_idx, column=0, sticky="w", pady=2, padx=5)
+                value_labels[sensor_id].grid(row=sensor_row_idx, column=1, sticky="e", padx=5, pady=2)
+                if sparkline: sparkline[0].grid(row=sensor_row_idx, column=2, sticky="e", padx=(0, 5), pady=2)
+                self.selective_view_sensor_rows[sensor_id] = sensor_row_idx
+        if new_sparklines: self.history.register(new_sparklines) # a sensor keeps its row when its section is scrolled away and back
+        return widgets_created
 
     def switch_view(self):
         mode = self.current_view_mode.get()
         if mode == "List View":
             self.selective_canvas.pack_forget(); self.selective_scrollbar.pack_forget()
             self.list_view_paned_window.pack(fill=tk.BOTH, expand=True)
-            if LHM_HARDWARE_ITEMS_CACHE and not self.selected_hardware_id_list_view and self.nav_buttons_list_view: 
-                first_hw_id = LHM_HARDWARE_ITEMS_CACHE[0].Identifier.ToString()
+            if self.backend.hardware and not self.selected_hardware_id_list_view and self.nav_buttons_list_view: 
+                first_hw_id = self.all_hardware()[0].id
                 self.select_hardware_list_view(first_hw_id)
-            elif self.selected_hardware_id_list_view: self.refresh_selected_hardware_sensors_list_view()
+            elif self.selected_hardware_id_list_view: self.update_sampling_targets(); self.refresh_selected_hardware_sensors_list_view()
         elif mode == "Selective View":
             self.list_view_paned_window.pack_forget()
             self.selective_canvas.pack(side=tk.LEFT, fill="both", expand=True); self.selective_scrollbar.pack(side="right", fill="y")
@@ -435,19 +827,36 @@ class SystemStatsApp(tk.Tk):
     def populate_navigation_list_view(self):
         for widget in self.nav_frame_list_view.winfo_children(): widget.destroy()
         self.nav_buttons_list_view.clear()
-        if not LHM_AVAILABLE or not LHM_HARDWARE_ITEMS_CACHE:
-            tk.Label(self.nav_frame_list_view, text="No Hardware", bg=NAV_BG_COLOR, fg=TEXT_COLOR, font=(FONT_FAMILY_UI, FONT_SIZE_NAV)).pack(pady=10, padx=5)
+        if not self.backend.available or not self.backend.hardware:
+            tk.Label(self.nav_frame_list_view, text="Loading..." if self.backend_state == "loading" else "No Hardware", bg=NAV_BG_COLOR, fg=TEXT_COLOR, font=(FONT_FAMILY_UI, FONT_SIZE_NAV)).pack(pady=10, padx=5)
             return
-        for hw_item in LHM_HARDWARE_ITEMS_CACHE:
-            hw_id = hw_item.Identifier.ToString()
-            btn_text = f"{hw_item.Name}\n({hw_item.HardwareType.ToString()})"
-            btn = tk.Button(self.nav_frame_list_view, text=btn_text, font=(FONT_FAMILY_UI, FONT_SIZE_NAV),
-                            bg=NAV_BUTTON_BG_COLOR, fg=NAV_BUTTON_FG_COLOR, activebackground=NAV_BUTTON_ACTIVE_BG_COLOR, activeforeground=NAV_BUTTON_ACTIVE_FG_COLOR,
-                            relief=tk.FLAT, anchor="w", justify=tk.LEFT, padx=10, pady=3, bd=0,
-                            command=lambda hid=hw_id: self.select_hardware_list_view(hid))
-            btn.pack(fill=tk.X, pady=1)
-            self.nav_buttons_list_view[hw_id] = btn
-            
+        for hw_item in self.all_hardware(): self._nav_button(hw_item).pack(fill=tk.X, pady=1)
+
+    def _nav_button(self, hw_item):
+        hw_id = hw_item.id
+        btn = tk.Button(self.nav_frame_list_view, text=f"{hw_item.name}\n({hw_item.hw_type})", font=(FONT_FAMILY_UI, FONT_SIZE_NAV),
+                        bg=NAV_BUTTON_BG_COLOR, fg=NAV_BUTTON_FG_COLOR, activebackground=NAV_BUTTON_ACTIVE_BG_COLOR, activeforeground=NAV_BUTTON_ACTIVE_FG_COLOR,
+                        relief=tk.FLAT, anchor="w", justify=tk.LEFT, padx=10, pady=3, bd=0,
+                        command=lambda hid=hw_id: self.select_hardware_list_view(hid))
+        self.nav_buttons_list_view[hw_id] = btn
+        return btn
+
+    def patch_navigation_list_view(self, added, removed):
+        # Hot-plug: destroys the buttons of hardware that is gone and packs new ones in tree order.
+        hardware_items = self.all_hardware()
+        if not self.nav_buttons_list_view or not self.backend.hardware: self.populate_navigation_list_view(); return # placeholder label shown
+        order = [hw_item.id for hw_item in hardware_items]
+        for hw_item in removed:
+            if hw_item.id in order: continue # replaced, keeps its button
+            button = self.nav_buttons_list_view.pop(hw_item.id, None)
+            if button is not None: button.destroy()
+        for hw_item in added:
+            button = self.nav_buttons_list_view.get(hw_item.id)
+            if button is not None: button.config(text=f"{hw_item.name}\n({hw_item.hw_type})"); continue
+            following = next((self.nav_buttons_list_view[hw_id] for hw_id in order[order.index(hw_item.id) + 1:] if hw_id in self.nav_buttons_list_view), None)
+            if following is not None: self._nav_button(hw_item).pack(fill=tk.X, pady=1, before=following)
+            else: self._nav_button(hw_item).pack(fill=tk.X, pady=1)
+
     def select_hardware_list_view(self, hw_id):
         self.selected_hardware_id_list_view = hw_id
         for item_id, button in self.nav_buttons_list_view.items():
@@ -455,120 +864,297 @@ class SystemStatsApp(tk.Tk):
             button.config(relief=tk.SUNKEN if is_selected else tk.FLAT, 
                           bg=NAV_BUTTON_ACTIVE_BG_COLOR if is_selected else NAV_BUTTON_BG_COLOR,
                           fg=NAV_BUTTON_ACTIVE_FG_COLOR if is_selected else NAV_BUTTON_FG_COLOR)
+        self.update_sampling_targets()
+        self.build_list_view_rows()
         self.refresh_selected_hardware_sensors_list_view()
 
-    def refresh_selected_hardware_sensors_list_view(self):
-        if self.selected_hardware_id_list_view and LHM_AVAILABLE and LHM_COMPUTER_INSTANCE:
-            selected_hw_item = next((item for item in LHM_HARDWARE_ITEMS_CACHE if item.Identifier.ToString() == self.selected_hardware_id_list_view), None)
-            if selected_hw_item:
-                selected_hw_item.Update() 
-                sensor_data_lines = self.format_sensors_for_hardware_item_recursive(selected_hw_item)
-                self.update_text_area(self.sensor_text_area_list_view, sensor_data_lines)
+    def update_sampling_targets(self):
+        # Tell the sampler thread which hardware to update and which sensors to read for the current view.
+        if self.current_view_mode.get() == "List View":
+            hw_item = self.sensor_index.hardware.get(self.selected_hardware_id_list_view)
+            hardware_items, sensors, background = [], [], set()
+            def collect(item):
+                hardware_items.append(item); sensors.extend(item.sensors)
+                for sub_item in item.sub_hardware: collect(sub_item)
+            if hw_item: collect(hw_item)
+        else:
+            # Sections out of view are sampled at OFFSCREEN_POLL_INTERVAL_MS (or not at all when it is 0).
+            hardware_items, sensors, background = {}, [], set()
+            for hw_id, sensor_ids in self.selective_view_layout:
+                offscreen = hw_id not in self.selective_view_hw_labels
+                if offscreen and not OFFSCREEN_POLL_INTERVAL_MS: continue
+                for sensor_id in sensor_ids:
+                    sensor = self.sensor_index.get(sensor_id)
+                    if sensor is None: continue
+                    owner = self.sensor_index.owners[sensor_id]
+                    sensors.append(sensor); hardware_items.setdefault(owner.id, owner)
+                    if offscreen: background.add(owner.id)
+            hardware_items = list(hardware_items.values())
+        if self.metrics_exporter is not None:
+            # /metrics serves every sensor, so all of them are sampled at full rate whatever is on screen;
+            # a series must not vanish from a scrape because the user switched views.
+            sensors, background, hardware_items = list(self.sensor_index.sensors.values()), set(), {}
+            for owner in self.sensor_index.owners.values(): hardware_items.setdefault(owner.id, owner)
+            hardware_items = list(hardware_items.values())
+        elif self.alerts is not None:
+            # Alert rules see every snapshot, so their sensors are sampled at full rate whatever is on screen.
+            targeted, targeted_hw = {sensor.id for sensor in sensors}, {hw_item.id for hw_item in hardware_items}
+            for sensor_id in self.alerts.sensor_ids:
+                sensor = self.sensor_index.get(sensor_id)
+                if sensor is None: continue
+                owner = self.sensor_index.owners[sensor_id]
+                background.discard(owner.id)
+                if sensor_id in targeted: continue
+                sensors.append(sensor)
+                if owner.id not in targeted_hw: hardware_items.append(owner); targeted_hw.add(owner.id)
+        self.sampler.set_targets(hardware_items, sensors, background=background)
+
+    def build_list_view_rows(self):
+        # Creates the tree rows for the selected hardware once; ticks only touch changed cells.
+        tree = self.sensor_tree_list_view
+        tree.delete(*tree.get_children(""))
+        self.list_view_children = {"": []}
+        self.list_view_sensors.clear(); self.list_view_search_text.clear()
+        self.list_view_row_values.clear(); self.list_view_extremes.clear(); self.list_view_layout = {"": []}
+        hw_item = self.sensor_index.hardware.get(self.selected_hardware_id_list_view) if self.backend.available else None
+        if hw_item is None: return
+        def add_rows(item, parent):
+            for sensor in item.sensors:
+                if sensor.sensor_type not in FORMATTED_SENSOR_TYPES: continue
+                tree.insert(parent, tk.END, iid=sensor.id, text=sensor.name, values=("N/A", "", ""))
+                self.list_view_children[parent].append(sensor.id)
+                self.list_view_sensors[sensor.id] = sensor
+                self.list_view_search_text[sensor.id] = f"{sensor.name} {sensor.sensor_type}".lower()
+            for sub_item in item.sub_hardware:
+                tree.insert(parent, tk.END, iid=sub_item.id, text=f"{sub_item.name} ({sub_item.hw_type})", open=True)
+                self.list_view_children[parent].append(sub_item.id)
+                self.list_view_children[sub_item.id] = []
+                add_rows(sub_item, sub_item.id)
+        add_rows(hw_item, "")
+        if not self.list_view_sensors:
+            tree.insert("", tk.END, iid="__empty__", text="(No relevant sensors of interest found for this component)")
+            self.list_view_children[""].append("__empty__")
+        self.list_view_layout = {parent: list(children) for parent, children in self.list_view_children.items()}
+        self.layout_list_view_rows()
 
-    def refresh_selective_view_sensors(self):
-        if not LHM_AVAILABLE or not LHM_HARDWARE_ENUMS:
+    def refresh_selected_hardware_sensors_list_view(self, phases=None):
+        # Returns (rows, rows configured); phases, when profiling, receives per-phase milliseconds.
+        if not self.list_view_sensors: return 0, 0
+        if phases is not None: started = time.perf_counter()
+        snapshot = self.sampler.latest
+        values = snapshot.values if snapshot else {}
+        reading, current_reading = self.formatter.reading, self.rendered_readings.reading
+        extremes, shown, tree = self.list_view_extremes, self.list_view_row_values, self.sensor_tree_list_view
+        changed = []
+        for sensor_id, sensor in self.list_view_sensors.items():
+            s_val = values.get(sensor_id)
+            bounds = extremes.get(sensor_id)
+            moved = False
+            if s_val is not None:
+                if bounds is None: bounds = extremes[sensor_id] = [s_val, s_val]; moved = True
+                elif s_val < bounds[0]: bounds[0] = s_val; moved = True
+                elif s_val > bounds[1]: bounds[1] = s_val; moved = True
+            current, row = current_reading(sensor, s_val), shown.get(sensor_id)
+            if row is not None and not moved and row[0] == current: continue # Same reading text, same extremes: nothing to format
+            row = (current, reading(sensor, bounds[0]) if bounds else "", reading(sensor, bounds[1]) if bounds else "")
+            if shown.get(sensor_id) != row: changed.append((sensor_id, row))
+        if phases is not None: formatted = time.perf_counter()
+        for sensor_id, row in changed:
+            tree.item(sensor_id, values=row)
+            shown[sensor_id] = row
+        if phases is not None: configured = time.perf_counter()
+        if self.list_view_sort and self.list_view_sort[0] != "#0": self.layout_list_view_rows()
+        if phases is not None:
+            phases["format"] = (formatted - started) * 1000.0
+            phases["configure"] = (configured - formatted) * 1000.0
+            phases["layout"] = (time.perf_counter() - configured) * 1000.0
+        return len(self.list_view_sensors), len(changed)
+
+    def sort_list_view(self, column):
+        # Click cycles ascending -> descending -> backend order.
+        if not self.list_view_sort or self.list_view_sort[0] != column: self.list_view_sort = (column, False)
+        elif not self.list_view_sort[1]: self.list_view_sort = (column, True)
+        else: self.list_view_sort = None
+        for heading in ("#0",) + LIST_VIEW_COLUMNS:
+            title = "Sensor" if heading == "#0" else heading.capitalize()
+            if self.list_view_sort and self.list_view_sort[0] == heading: title += " ▼" if self.list_view_sort[1] else " ▲"
+            self.sensor_tree_list_view.heading(heading, text=title)
+        self.layout_list_view_rows()
+
+    def _list_view_sort_value(self, column):
+        # Sort key for sensor rows; None (no reading yet) sorts last either way.
+        if column == "#0": return lambda iid: self.list_view_sensors[iid].name.lower()
+        if column == "current":
+            snapshot = self.sampler.latest
+            values = snapshot.values if snapshot else {}
+            return values.get
+        position = LIST_VIEW_COLUMNS.index(column) - 1
+        return lambda iid: self.list_view_extremes[iid][position] if iid in self.list_view_extremes else None
+
+    def layout_list_view_rows(self):
+        # Applies filter and sort by moving/detaching existing rows; the sensor tree is never re-walked.
+        tree = self.sensor_tree_list_view
+        needle = self.list_view_filter.get().strip().lower()
+        sort_value = self._list_view_sort_value(self.list_view_sort[0]) if self.list_view_sort else None
+        def visible_children(parent):
+            visible = []
+            for iid in self.list_view_children.get(parent, ()):
+                if iid in self.list_view_children:
+                    if visible_children(iid) or not needle: visible.append(iid)
+                elif not needle or needle in self.list_view_search_text.get(iid, ""):
+                    visible.append(iid)
+            if sort_value:
+                # Sub-hardware rows stay below the sensors, in backend order.
+                keyed = [(sort_value(iid), iid) for iid in visible if iid in self.list_view_sensors]
+                known = sorted((item for item in keyed if item[0] is not None), key=lambda item: item[0], reverse=self.list_view_sort[1])
+                visible = ([iid for _, iid in known] + [iid for value, iid in keyed if value is None] +
+                           [iid for iid in visible if iid not in self.list_view_sensors])
+            if self.list_view_layout.get(parent) != visible:
+                for iid in self.list_view_layout.get(parent, ()):
+                    if iid not in visible: tree.detach(iid)
+                for position, iid in enumerate(visible): tree.move(iid, parent, position)
+                self.list_view_layout[parent] = visible
+            return visible
+        visible_children("")
+
+    def refresh_selective_view_sensors(self, phases=None):
+        # Returns (labels, labels configured); phases, when profiling, receives per-phase milliseconds.
+        if not self.backend.available:
+            text = "..." if self.backend_state == "loading" else f"{self.backend.name} N/A"
             for hw_id_labels in self.selective_view_hw_labels.values():
-                for label in hw_id_labels.values(): label.config(text="LHM N/A")
-            return
-        SensorType = LHM_HARDWARE_ENUMS['SensorType']
-        for hw_id, hw_conf in self.selective_view_config.items():
-            if hw_conf['show_hw'].get() and hw_id in self.selective_view_hw_labels:
-                lhm_hardware_item = hw_conf['lhm_item']
-                lhm_hardware_item.Update() 
-                for sensor_id, sensor_config_details in hw_conf['sensors'].items():
-                    if sensor_config_details['show_sensor'].get() and sensor_id in self.selective_view_hw_labels[hw_id]:
-                        current_sensor_value = "N/A"
-                        def find_sensor_recursively(item_to_search, target_sensor_id):
-                            for s_obj in item_to_search.Sensors: 
-                                if s_obj.Identifier.ToString() == target_sensor_id: return s_obj
-                            for sub_item in item_to_search.SubHardware:
-                                found_s = find_sensor_recursively(sub_item, target_sensor_id)
-                                if found_s: return found_s
-                            return None
-                        actual_sensor = find_sensor_recursively(lhm_hardware_item, sensor_id)
-                        if actual_sensor and actual_sensor.Value is not None:
-                            s_val, s_type = actual_sensor.Value, actual_sensor.SensorType 
-                            unit, formatted_val = "", f"{s_val}"
-                            if s_type == SensorType.Temperature: unit = "°C"; formatted_val = f"{s_val:.1f}"
-                            elif s_type == SensorType.Fan: unit = "RPM"; formatted_val = f"{s_val:.0f}"
-                            elif s_type == SensorType.Load: unit = "%"; formatted_val = f"{s_val:.1f}"
-                            elif s_type == SensorType.Power: unit = "W"; formatted_val = f"{s_val:.1f}"
-                            elif s_type == SensorType.Voltage: unit = "V"; formatted_val = f"{s_val:.3f}"
-                            elif s_type == SensorType.Clock: unit = "MHz"; formatted_val = f"{s_val:.0f}"
-                            elif s_type == SensorType.Control: unit = "%"; formatted_val = f"{s_val:.0f}" 
-                            elif s_type == SensorType.Factor: unit = ""; formatted_val = f"{s_val:.2f}" 
-                            elif s_type == SensorType.Data: unit = "GB"; formatted_val = f"{s_val:.2f}" 
-                            elif s_type == SensorType.SmallData: unit = "MB"; formatted_val = f"{s_val:.0f}" 
-                            elif s_type == SensorType.Throughput: unit = "B/s"; formatted_val = f"{s_val:.0f}" 
-                            elif s_type == SensorType.Level: unit = "%"; formatted_val = f"{s_val:.0f}"
-                            current_sensor_value = f"{formatted_val}{unit if unit else ''}"
-                        self.selective_view_hw_labels[hw_id][sensor_id].config(text=current_sensor_value)
-
-    def format_sensors_for_hardware_item_recursive(self, hardware_item, indentation_level=0):
-        data_lines = []
-        if not LHM_HARDWARE_ENUMS: return data_lines 
-        SensorType = LHM_HARDWARE_ENUMS['SensorType']
-        indent, sensor_indent = "  " * indentation_level, "  " * (indentation_level + 1)
-        direct_sensors_found, sub_hardware_had_sensors = False, False
-        for sensor in hardware_item.Sensors:
-            if sensor.Value is None: continue
-            s_type, s_name, s_val = sensor.SensorType, sensor.Name, sensor.Value
-            if s_type in [SensorType.Temperature, SensorType.Fan, SensorType.Load, SensorType.Power, SensorType.Voltage, SensorType.Clock, SensorType.Control, SensorType.Factor, SensorType.Data, SensorType.SmallData, SensorType.Throughput, SensorType.Level]:
-                unit, formatted_val = "", f"{s_val}"
-                if s_type == SensorType.Temperature: unit = "°C"; formatted_val = f"{s_val:.1f}"
-                elif s_type == SensorType.Fan: unit = "RPM"; formatted_val = f"{s_val:.0f}"
-                elif s_type == SensorType.Load: unit = "%"; formatted_val = f"{s_val:.1f}"
-                elif s_type == SensorType.Power: unit = "W"; formatted_val = f"{s_val:.1f}"
-                elif s_type == SensorType.Voltage: unit = "V"; formatted_val = f"{s_val:.3f}"
-                elif s_type == SensorType.Clock: unit = "MHz"; formatted_val = f"{s_val:.0f}"
-                elif s_type == SensorType.Control: unit = "%"; formatted_val = f"{s_val:.0f}" 
-                elif s_type == SensorType.Factor: unit = ""; formatted_val = f"{s_val:.2f}" 
-                elif s_type == SensorType.Data: unit = "GB"; formatted_val = f"{s_val:.2f}" 
-                elif s_type == SensorType.SmallData: unit = "MB"; formatted_val = f"{s_val:.0f}" 
-                elif s_type == SensorType.Throughput: unit = "B/s"; formatted_val = f"{s_val:.0f}" 
-                elif s_type == SensorType.Level: unit = "%"; formatted_val = f"{s_val:.0f}" 
-                data_lines.append(f"{sensor_indent}{s_name[:30].ljust(30)}: {formatted_val.rjust(8)} {unit}")
-                direct_sensors_found = True
-        for sub_hw_item in hardware_item.SubHardware:
-            sub_hw_item.Update() 
-            data_lines.append(f"{indent}  -- {sub_hw_item.Name} ({sub_hw_item.HardwareType.ToString()}) --")
-            sub_data_lines = self.format_sensors_for_hardware_item_recursive(sub_hw_item, indentation_level + 1)
-            if sub_data_lines:
-                meaningful_sub_data = [line for line in sub_data_lines if "(No relevant sensors" not in line.strip()]
-                if meaningful_sub_data:
-                    data_lines.extend(meaningful_sub_data); sub_hardware_had_sensors = True
-                elif not direct_sensors_found and not sub_hardware_had_sensors and indentation_level == 0:
-                    data_lines.append(f"{indent}    (No relevant sensors for this sub-component)")
-        if not direct_sensors_found and not sub_hardware_had_sensors and indentation_level == 0 and not any(hardware_item.SubHardware):
-            data_lines.append(f"{indent}  (No relevant sensors of interest found for this component)")
-        return data_lines
-
-    def update_text_area(self, text_area, new_data_lines):
-        try:
-            current_yview_top_fraction = text_area.yview()[0]
-            text_area.config(state=tk.NORMAL) 
-            text_area.delete(1.0, tk.END) 
-            if new_data_lines:
-                for line in new_data_lines: text_area.insert(tk.END, line + "\n")
-            else: text_area.insert(tk.END, "No sensor data to display.\n")
-            text_area.yview_moveto(current_yview_top_fraction)
-            text_area.config(state=tk.DISABLED) 
-        except tk.TclError: pass
-        except Exception as e: print(f"Error updating text area: {e}")
+                for sensor_id, label in hw_id_labels.items(): self._set_selective_label_text(sensor_id, label, text)
+            return 0, 0
+        if phases is not None: started = time.perf_counter()
+        snapshot = self.sampler.latest
+        values = snapshot.values if snapshot else {}
+        reading, get_sensor = self.rendered_readings.reading, self.sensor_index.get
+        texts = [(sensor_id, value_label, reading(get_sensor(sensor_id), values.get(sensor_id)))
+                 for hw_labels in self.selective_view_hw_labels.values() for sensor_id, value_label in hw_labels.items()]
+        if self.selective_view_sparklines and snapshot is not None and snapshot.seq != self.sparkline_seq:
+            self.sparkline_seq = snapshot.seq
+            self.sparkline_dirty.update(self.selective_view_sparklines)
+            self.schedule_sparkline_draw()
+        if phases is not None: formatted = time.perf_counter()
+        configured = 0
+        for sensor_id, value_label, text in texts: configured += self._set_selective_label_text(sensor_id, value_label, text)
+        if self.alerts is not None or self.selective_view_alerting: configured += self._sync_alert_highlights()
+        if phases is not None:
+            phases["format"] = (formatted - started) * 1000.0
+            phases["configure"] = (time.perf_counter() - formatted) * 1000.0
+        return len(texts), configured
+
+    def _sync_alert_highlights(self):
+        # Only labels whose alert state changed are reconfigured; returns how many.
+        alerting = self.alerts.active_sensor_ids if self.alerts is not None else frozenset()
+        changed = (alerting - self.selective_view_alerting) | (self.selective_view_alerting - alerting)
+        configured = 0
+        for hw_labels in self.selective_view_hw_labels.values() if changed else ():
+            for sensor_id in changed.intersection(hw_labels):
+                hw_labels[sensor_id].config(fg=ALERT_COLOR if sensor_id in alerting else VALUE_COLOR)
+                if sensor_id in alerting: self.selective_view_alerting.add(sensor_id)
+                else: self.selective_view_alerting.discard(sensor_id)
+                configured += 1
+        return configured
+
+    def _set_selective_label_text(self, sensor_id, value_label, text):
+        # Skips the Tcl round trip (and geometry pass) when the label already shows this text.
+        if self.selective_view_label_text.get(sensor_id) == text: return False
+        value_label.config(text=text)
+        self.selective_view_label_text[sensor_id] = text
+        return True
+
+    # --- Sparklines ---
+    def toggle_sparklines(self):
+        if not self.sparklines_enabled.get():
+            for sensor_id in list(self.selective_view_sparklines): self._forget_sparkline(sensor_id)[0].destroy()
+        self.build_selective_view_ui()
+
+    def _forget_sparkline(self, sensor_id):
+        self.sparkline_dirty.discard(sensor_id)
+        return self.selective_view_sparklines.pop(sensor_id, None)
+
+    def _on_selective_scroll(self, first, last):
+        self.selective_scrollbar.set(first, last)
+        self.schedule_selective_virtualize()
+        if self.sparkline_dirty: self.schedule_sparkline_draw()
+
+    def schedule_sparkline_draw(self):
+        # All sparklines are redrawn in one idle callback, after the labels of this tick.
+        if self.sparkline_job is None: self.sparkline_job = self.after_idle(self._draw_sparklines)
+
+    def _draw_sparklines(self):
+        # Each sparkline shows the last samples of its sensor in the history's raw tier. Sections
+        # outside the canvas viewport stay dirty and are drawn once scrolled into view.
+        self.sparkline_job = None
+        if not self.sparkline_dirty: return 0
+        top, bottom = self.selective_canvas.yview()
+        height = self.selective_scrollable_frame.winfo_height()
+        view_top, view_bottom = top * height, bottom * height
+        drawn, dirty, series = 0, self.sparkline_dirty, self.history.series
+        for hw_id, frame in self.selective_view_hw_frames.items():
+            frame_top = frame.winfo_y()
+            if frame_top > view_bottom or frame_top + frame.winfo_height() < view_top: continue
+            for sensor_id in self.selective_view_hw_labels[hw_id]:
+                if sensor_id not in dirty: continue
+                dirty.discard(sensor_id)
+                sparkline = self.selective_view_sparklines.get(sensor_id)
+                if sparkline is None: continue
+                canvas, line = sparkline
+                values = series(sensor_id, math.inf, tier="raw")[1][-SPARKLINE_SAMPLES:].tolist()
+                canvas.coords(line, *(sparkline_coords(values, SPARKLINE_WIDTH, SPARKLINE_HEIGHT) or SPARKLINE_PARKED))
+                drawn += 1
+        return drawn
 
     def update_stats_loop(self):
+        # Renders the sampler's latest snapshot; never touches the backend on the Tk thread.
+        if self.next_frame_due is not None:
+            self.ui_frame_latency_ms.add(max(0.0, time.perf_counter() - self.next_frame_due) * 1000.0)
         try:
-            if self.current_view_mode.get() == "List View":
-                self.refresh_selected_hardware_sensors_list_view()
-            elif self.current_view_mode.get() == "Selective View":
-                self.refresh_selective_view_sensors()
-            self.update_status_bar() # Update status bar in each loop
+            if self.backend_state == "loading":
+                if self.backend_opened: self.on_backend_ready()
+                else: self.after(STARTUP_POLL_INTERVAL_MS, self.update_stats_loop); return
+            if self.hardware_enumerated:
+                self.hardware_enumerated = False; self.on_hardware_enumerated()
+            if self.hardware_plugged:
+                self.hardware_plugged = False; self.on_hardware_plugged()
+            if self.backend_state == "ready": self.schedule_hotplug_scan()
+            snapshot = self.sampler.latest
+            if snapshot is not None and snapshot.seq != self.rendered_snapshot_seq:
+                self.rendered_snapshot_seq = snapshot.seq
+                profiler = self.profiler
+                phases = None if profiler is None else {}
+                if profiler is not None: frame_started = time.perf_counter()
+                labels = configured = 0
+                if self.current_view_mode.get() == "List View":
+                    labels, configured = self.refresh_selected_hardware_sensors_list_view(phases)
+                elif self.current_view_mode.get() == "Selective View":
+                    labels, configured = self.refresh_selective_view_sensors(phases)
+                checked, reused = self.rendered_readings.take_counts()
+                if checked: self.format_skip_pct.add(100.0 * reused / checked)
+                if labels: self.redraw_skip_pct.add(100.0 * max(0, labels - configured) / labels)
+                if profiler is not None: status_started = time.perf_counter()
+                self.update_status_bar() # Update status bar for each new snapshot
+                if profiler is not None:
+                    phases["status_bar"] = (time.perf_counter() - status_started) * 1000.0
+                    phases["total"] = (time.perf_counter() - frame_started) * 1000.0
+                    profiler.record_frame(snapshot.seq, phases, labels=labels, widget_configs=configured,
+                                          frame_lag_ms=self.ui_frame_latency_ms.samples[-1] if self.ui_frame_latency_ms.samples else 0.0)
+                if "first_data" not in self.startup_phases:
+                    self.mark_startup_phase("first_data")
+                    print("Info: Startup " + ", ".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in self.startup_phases.items()))
+                    self.start_full_enumeration()
         except Exception as e:
             print(f"Error during main stats update loop: {e}")
-        self.after(UPDATE_INTERVAL_MS, self.update_stats_loop)
+            if self.profiler is not None: self.profiler.record_error("frame", e)
+        self.next_frame_due = time.perf_counter() + UI_FRAME_INTERVAL_MS / 1000.0
+        self.after(UI_FRAME_INTERVAL_MS, self.update_stats_loop)
 
     def exit_app(self):
-        close_lhm() 
+        self.save_dashboard_config()
+        if self.metrics_exporter: self.metrics_exporter.stop()
+        self.sampler.stop()
+        if self.recorder is not None: self.recorder.close()
+        if self.backend_state != "loading": self.backend.close() 
         self.destroy()
 
 if __name__ == "__main__":
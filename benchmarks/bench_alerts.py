@@ -0,0 +1,91 @@
+# Per-tick cost of evaluating alert rules: a per-rule Python loop vs the compiled
+# AlertEngine, with a mix of threshold, hysteresis, sustained and rise rules.
+# Usage: python benchmarks/bench_alerts.py [rules] [sensors] [ticks]
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from alerts import AlertEngine
+from sensor_backends import SyntheticBackend
+
+
+def make_rules(count, sensor_ids, seed=0):
+    rng = random.Random(seed)
+    rules = []
+    for i in range(count):
+        sensor_id, kind = sensor_ids[i % len(sensor_ids)], i % 5
+        if kind == 0: rules.append({"name": f"r{i}", "sensor": sensor_id, "above": rng.uniform(40, 90)})
+        elif kind == 1: rules.append({"name": f"r{i}", "sensor": sensor_id, "above": rng.uniform(40, 90), "hysteresis": 3})
+        elif kind == 2: rules.append({"name": f"r{i}", "sensor": sensor_id, "below": rng.uniform(10, 40)})
+        elif kind == 3: rules.append({"name": f"r{i}", "sensor": sensor_id, "above": rng.uniform(40, 90), "for_seconds": 5})
+        else: rules.append({"name": f"r{i}", "sensor": sensor_id, "rise": 5, "per_seconds": 10})
+    return rules
+
+
+class LoopEvaluator:
+    # The straightforward version: one Python pass per rule per tick.
+    def __init__(self, rules):
+        self.rules = rules
+        self.active = [False] * len(rules)
+        self.since = [None] * len(rules)
+        self.history = []  # (timestamp, values) of recent ticks
+
+    def evaluate(self, values, now):
+        events = []
+        self.history.append((now, values))
+        while self.history and now - self.history[0][0] > 60: self.history.pop(0)
+        for i, rule in enumerate(self.rules):
+            value = values.get(rule["sensor"])
+            if value is None: holds = False
+            elif "rise" in rule:
+                past = next(((ts, old) for ts, old in self.history if ts >= now - rule["per_seconds"]), None)
+                old = past[1].get(rule["sensor"]) if past else None
+                holds = old is not None and now - past[0] >= rule["per_seconds"] / 2 and (value - old) / (now - past[0]) * rule["per_seconds"] > rule["rise"]
+            elif "above" in rule:
+                holds = value > (rule["above"] - rule.get("hysteresis", 0) if self.active[i] else rule["above"])
+            else:
+                holds = value < (rule["below"] + rule.get("hysteresis", 0) if self.active[i] else rule["below"])
+            if holds and self.since[i] is None: self.since[i] = now
+            if not holds: self.since[i] = None
+            active = holds and (self.active[i] or now - self.since[i] >= rule.get("for_seconds", 0))
+            if active != self.active[i]: events.append((rule["name"], active))
+            self.active[i] = active
+        return events
+
+
+def time_ticks(evaluate, snapshots):
+    timings, events = [], 0
+    for now, values in snapshots:
+        started = time.perf_counter()
+        events += len(evaluate(values, now))
+        timings.append((time.perf_counter() - started) * 1e6)
+    timings.sort()
+    return timings[len(timings) // 2], timings[int(len(timings) * 0.99)], events
+
+
+def main():
+    rule_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    sensor_count = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    ticks = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    backend = SyntheticBackend(total_sensors=sensor_count); backend.open()
+    sensors = [sensor for hw in backend.hardware for sensor in hw.iter_sensors()]
+    snapshots = []
+    for tick in range(ticks):
+        backend.update_many(backend.hardware)
+        snapshots.append((tick * 1.0, {sensor.id: backend.read(sensor) for sensor in sensors}))
+    rules = make_rules(rule_count, [sensor.id for sensor in sensors])
+
+    loop_p50, loop_p99, loop_events = time_ticks(LoopEvaluator(rules).evaluate, snapshots)
+    engine = AlertEngine(rules, run_hooks=False)
+    engine_p50, engine_p99, engine_events = time_ticks(engine.evaluate, snapshots)
+    print(f"{rule_count} rules over {sensor_count} sensors, {ticks} ticks")
+    print(f"  python loop : p50 {loop_p50:8.1f} us  p99 {loop_p99:8.1f} us  ({loop_events} events)")
+    print(f"  AlertEngine : p50 {engine_p50:8.1f} us  p99 {engine_p99:8.1f} us  ({engine_events} events)")
+    print(f"  speedup: {loop_p50 / engine_p50:.1f}x at p50")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+# Derived sensors: 500 expressions (sums, ratios, max/avg over patterns, ewma,
+# rate and derived sensors built on other derived sensors) evaluated once per
+# tick over 1,000 to 10,000 synthetic sensors. Times the compiled NumPy plan
+# (DerivedSensors.evaluate), a straightforward per-sensor Python interpreter of
+# the same parsed expressions, and a whole Sampler tick with and without the
+# derived sensors; the two evaluators' results are cross-checked every tick.
+# Usage: python benchmarks/bench_derived.py [--derived 500] [--scales 1000,10000] [--ticks 200]
+import argparse
+import fnmatch
+import math
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from derived_sensors import DERIVED_AVAILABLE, DerivedSensors
+from poll_scheduler import PollScheduler
+from sampler import Sampler
+from sensor_backends import SyntheticBackend
+from sensor_index import SensorIndex
+
+DERIVED_COUNT = 500
+SCALES = (1000, 10000)
+TICKS = 200
+TICK_SECONDS = 1.0       # simulated time between ticks (ewma and rate use it)
+
+
+def make_definitions(count, hardware, rng):
+    # A mix like the README examples; every 10th one also reads two earlier derived sensors.
+    sensors = [sensor for hw in hardware for sensor in hw.iter_sensors()]
+    pick = lambda: f"[{rng.choice(sensors).id}]"
+    definitions = []
+    for number in range(count):
+        kind = number % 10
+        if kind in (0, 1, 2): expr = " + ".join(pick() for _ in range(rng.randint(2, 4)))
+        elif kind == 3: expr = f"{pick()} / {pick()}"
+        elif kind == 4: expr = f"max([{rng.choice(hardware).id}/*temperature*])"
+        elif kind == 5: expr = f"avg([{rng.choice(hardware).id}/*load*], {pick()})"
+        elif kind in (6, 7): expr = f"ewma({pick()}, {rng.choice((5, 10, 30))})"
+        elif kind == 8: expr = f"rate({pick()})"
+        else: expr = f"[/derived/d{rng.randrange(number)}] * 0.5 - [/derived/d{rng.randrange(number)}]" if number > 1 else pick()
+        definitions.append({"id": f"d{number}", "name": f"Derived {number}", "expr": expr})
+    return definitions
+
+
+class ReferenceEvaluator:
+    # One derived sensor at a time, walking its expression tree in Python, with the engine's semantics.
+    def __init__(self, derived, raw_ids):
+        self.definitions, self.raw_ids, self.state = derived.definitions, raw_ids, {}
+        self.patterns = {}
+        for expr in self._walk_all():
+            if expr[0] == "ref" and any(char in expr[1] for char in "*?") and expr[1] not in self.patterns:
+                match = re.compile(fnmatch.translate(expr[1])).match
+                self.patterns[expr[1]] = [sensor_id for sensor_id in raw_ids if match(sensor_id)]
+        self.last_now = None
+
+    def _walk_all(self):
+        stack = list(self.definitions.values())
+        while stack:
+            expr = stack.pop(); yield expr
+            stack.extend(arg for arg in expr[1:] if isinstance(arg, tuple))
+
+    def evaluate(self, values, now):
+        self.values, self.now, self.cache = values, now, {}
+        self.elapsed = math.nan if self.last_now is None else now - self.last_now
+        self.last_now = now
+        results = {sensor_id: self._output(sensor_id) for sensor_id in self.definitions}
+        values.update((sensor_id, None if value is None or not math.isfinite(value) else value) for sensor_id, value in results.items())
+
+    def _output(self, sensor_id):
+        if sensor_id not in self.cache: self.cache[sensor_id] = self._eval(self.definitions[sensor_id])
+        return self.cache[sensor_id]
+
+    def _eval(self, expr):
+        op = expr[0]
+        if op == "ref":
+            if expr[1] in self.definitions: return self._output(expr[1])
+            value = self.values.get(expr[1])
+            return math.nan if value is None else value
+        if op == "const": return expr[1]
+        if op in ("sum", "min", "max", "avg"):
+            args = []
+            for arg in expr[1:]:
+                if arg[0] == "ref" and arg[1] in self.patterns: args.extend(self._eval(("ref", sensor_id)) for sensor_id in self.patterns[arg[1]])
+                else: args.append(self._eval(arg))
+            present = [value for value in args if value == value]
+            if not present: return math.nan
+            return {"sum": sum, "min": min, "max": max, "avg": lambda items: sum(items) / len(items)}[op](present)
+        if op == "ewma":
+            x, key = self._eval(expr[1]), id(expr)  # equal subexpressions of two sensors keep separate (identical) state
+            state = self.state.get(key, math.nan)
+            alpha = 1.0 - math.exp(-max(self.elapsed, 0.0) / expr[2]) if self.elapsed == self.elapsed else 0.0
+            state = x if state != state else state if x != x else state + alpha * (x - state)
+            self.state[key] = state
+            return state
+        if op == "rate":
+            x, key = self._eval(expr[1]), id(expr)
+            last, changed_at, interval, shown = self.state.get(key, (math.nan,) * 4)
+            since = self.now - changed_at
+            if x == x and x != last: shown, interval, changed_at, last = (x - last) / since, since, self.now, x
+            elif since > 2.0 * interval: shown = 0.0
+            self.state[key] = (last, changed_at, interval, shown)
+            return math.nan if x != x else shown
+        operands = [self._eval(arg) for arg in expr[1:]]
+        try:
+            if op == "add": return operands[0] + operands[1]
+            if op == "sub": return operands[0] - operands[1]
+            if op == "mul": return operands[0] * operands[1]
+            if op == "div": return operands[0] / operands[1]
+        except ZeroDivisionError: return math.nan
+        if op == "neg": return -operands[0]
+        return abs(operands[0])
+
+
+def stats(timings):
+    ordered = sorted(timings)
+    return ordered[len(ordered) // 2], ordered[min(len(ordered) - 1, int(round(0.99 * (len(ordered) - 1))))]
+
+
+def run_scale(scale, derived_count, ticks):
+    rng = random.Random(0)
+    backend = SyntheticBackend(total_sensors=scale, hardware_count=16); backend.open()
+    definitions = make_definitions(derived_count, backend.hardware, rng)
+    derived = DerivedSensors(definitions)
+    index = SensorIndex(); index.ensure(backend.hardware + [derived.node])
+    started = time.perf_counter(); derived.bind(index); bind_ms = (time.perf_counter() - started) * 1000.0
+    raw_ids = [sensor.id for hw in backend.hardware for sensor in hw.iter_sensors()]
+    reference = ReferenceEvaluator(derived, raw_ids)
+    plan = derived.plan
+    print(f"{scale} sensors, {len(derived)} derived ({len(plan.input_ids)} inputs, {len(plan.registers)} registers, "
+          f"{len(plan.steps)} NumPy steps), compiled in {bind_ms:.1f} ms")
+
+    plan_ms, reference_ms, worst = [], [], 0.0
+    values = {sensor_id: rng.uniform(1.0, 100.0) for sensor_id in raw_ids}
+    for tick in range(ticks):
+        now = 1000.0 + tick * TICK_SECONDS
+        for sensor_id in rng.sample(raw_ids, len(raw_ids) // 4): values[sensor_id] = rng.uniform(1.0, 100.0)  # a quarter of the readings move
+        engine_values, reference_values = dict(values), dict(values)
+        started = time.perf_counter(); derived.evaluate(engine_values, now); plan_ms.append((time.perf_counter() - started) * 1000.0)
+        started = time.perf_counter(); reference.evaluate(reference_values, now); reference_ms.append((time.perf_counter() - started) * 1000.0)
+        for sensor_id in derived.definitions:
+            a, b = engine_values[sensor_id], reference_values[sensor_id]
+            if (a is None) != (b is None): raise AssertionError(f"{sensor_id}: plan {a} vs reference {b} at tick {tick}")
+            if a is not None: worst = max(worst, abs(a - b) / max(1.0, abs(b)))
+    for name, timings in (("plan (NumPy)", plan_ms), ("per-sensor Python", reference_ms)):
+        p50, p99 = stats(timings)
+        print(f"  {name:<20} p50 {p50:8.3f} ms  p99 {p99:8.3f} ms  {p50 * 1000.0 / len(derived):6.2f} us per derived sensor")
+    print(f"  results match the reference (max relative difference {worst:.1e})")
+
+    # Whole sampler ticks, every node due each time, with the derived sensors on the dashboard and without.
+    for label, with_derived in (("sample tick", False), ("sample tick + derived", True)):
+        sampler = Sampler(backend, scheduler=PollScheduler(0, type_intervals_ms={}, adaptive=False))
+        sampler.derived = derived if with_derived else None
+        sensors = [sensor for hw in backend.hardware for sensor in hw.iter_sensors()] + (derived.node.sensors if with_derived else [])
+        sampler.set_targets(backend.hardware + ([derived.node] if with_derived else []), sensors)
+        timings = []
+        for tick in range(ticks):
+            started = time.perf_counter(); sampler.sample_once(2000.0 + tick * TICK_SECONDS); timings.append((time.perf_counter() - started) * 1000.0)
+        p50, p99 = stats(timings)
+        print(f"  {label:<20} p50 {p50:8.3f} ms  p99 {p99:8.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark derived sensor evaluation per tick.")
+    parser.add_argument("--derived", type=int, default=DERIVED_COUNT, help="number of derived sensors")
+    parser.add_argument("--scales", default=",".join(str(scale) for scale in SCALES), help="comma separated raw sensor counts")
+    parser.add_argument("--ticks", type=int, default=TICKS, help="timed ticks per scale")
+    args = parser.parse_args()
+    if not DERIVED_AVAILABLE: sys.exit("Derived sensors need NumPy (pip install numpy).")
+    for scale in (int(scale) for scale in args.scales.split(",")):
+        run_scale(scale, args.derived, args.ticks)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+# Per-sensor formatting cost: the legacy if/elif chain vs the table-driven
+# formatter (per-type lookup and per-sensor-id cache).
+# Usage: python benchmarks/bench_format.py [calls] [repeats]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sensor_backends import SyntheticBackend
+from sensor_format import SensorFormatter, format_reading
+
+
+def legacy_format_reading(s_val, s_type):
+    # The chain that used to be pasted into both views.
+    if s_val is None: return "N/A"
+    unit, formatted_val = "", f"{s_val}"
+    if s_type == "Temperature": unit = "°C"; formatted_val = f"{s_val:.1f}"
+    elif s_type == "Fan": unit = "RPM"; formatted_val = f"{s_val:.0f}"
+    elif s_type == "Load": unit = "%"; formatted_val = f"{s_val:.1f}"
+    elif s_type == "Power": unit = "W"; formatted_val = f"{s_val:.1f}"
+    elif s_type == "Voltage": unit = "V"; formatted_val = f"{s_val:.3f}"
+    elif s_type == "Clock": unit = "MHz"; formatted_val = f"{s_val:.0f}"
+    elif s_type == "Control": unit = "%"; formatted_val = f"{s_val:.0f}"
+    elif s_type == "Factor": unit = ""; formatted_val = f"{s_val:.2f}"
+    elif s_type == "Data": unit = "GB"; formatted_val = f"{s_val:.2f}"
+    elif s_type == "SmallData": unit = "MB"; formatted_val = f"{s_val:.0f}"
+    elif s_type == "Throughput": unit = "B/s"; formatted_val = f"{s_val:.0f}"
+    elif s_type == "Level": unit = "%"; formatted_val = f"{s_val:.0f}"
+    return f"{formatted_val}{unit}"
+
+
+def best_of(repeats, fn):
+    best = float("inf")
+    for _ in range(repeats):
+        started = time.perf_counter(); fn(); best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main():
+    calls = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    backend = SyntheticBackend(total_sensors=512); backend.open()
+    sensors = [s for hw in backend.hardware for s in hw.iter_sensors()]
+    batch = [(sensors[i % len(sensors)], backend.read(sensors[i % len(sensors)])) for i in range(calls)]
+    formatter = SensorFormatter()
+    fahrenheit_binary = SensorFormatter("F", "binary", "auto")
+
+    cases = [
+        ("legacy if/elif chain", lambda: [legacy_format_reading(v, s.sensor_type) for s, v in batch]),
+        ("format_reading (type table)", lambda: [format_reading(v, s.sensor_type) for s, v in batch]),
+        ("SensorFormatter.reading (id cache)", lambda: [formatter.reading(s, v) for s, v in batch]),
+        ("  ... with °F / GiB / auto B/s", lambda: [fahrenheit_binary.reading(s, v) for s, v in batch]),
+    ]
+    # The legacy chain labelled GiB readings "GB", so data types are left out of the comparison.
+    same = lambda s: s.sensor_type not in ("Throughput", "Data", "SmallData")
+    assert [legacy_format_reading(v, s.sensor_type) for s, v in batch if same(s)] == \
+           [SensorFormatter(throughput_units="B/s").reading(s, v) for s, v in batch if same(s)]
+    print(f"{calls} formatting calls over {len(sensors)} sensors, best of {repeats}")
+    baseline = None
+    for name, fn in cases:
+        elapsed = best_of(repeats, fn)
+        baseline = baseline or elapsed
+        print(f"  {name:<36} {elapsed * 1000:7.2f} ms  {elapsed / calls * 1e9:6.0f} ns/call  x{baseline / elapsed:.2f}")
+
+
+if __name__ == "__main__":
+    main()
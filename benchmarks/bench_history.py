@@ -0,0 +1,56 @@
+# SensorHistory append throughput and window-query latency.
+# Usage: python benchmarks/bench_history.py [sensors] [sample_interval_s]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+
+from sensor_history import SensorHistory
+
+WEEK_S = 7 * 24 * 3600
+QUERY_REPEATS = 200
+
+
+def bench_append(history, sensor_ids, interval, seconds):
+    rng = np.random.default_rng(0)
+    columns = rng.uniform(20.0, 90.0, size=(256, len(sensor_ids))).astype(np.float32)
+    dicts = [dict(zip(sensor_ids, map(float, columns[i]))) for i in range(32)]
+    start_ts = 1.7e9
+    steps = int(seconds / interval)
+
+    started = time.perf_counter()
+    for step in range(steps): history.append_column(start_ts + step * interval, columns[step % 256])
+    column_s = time.perf_counter() - started
+
+    started = time.perf_counter()
+    dict_steps = min(steps, 5000)
+    for step in range(dict_steps): history.append(start_ts + (steps + step) * interval, dicts[step % 32])
+    dict_s = time.perf_counter() - started
+    return steps, column_s, dict_steps, dict_s, start_ts + (steps + dict_steps) * interval
+
+
+def bench_queries(history, sensor_ids, now):
+    for label, window in (("1 min", 60), ("1 hour", 3600), ("1 day", 86400), ("1 week", WEEK_S)):
+        for stat in ("avg", "max", "percentile"):
+            started = time.perf_counter()
+            for i in range(QUERY_REPEATS): history.query(sensor_ids[i % len(sensor_ids)], window, stat, now=now)
+            one = (time.perf_counter() - started) / QUERY_REPEATS
+            started = time.perf_counter()
+            for _ in range(20): history.query_all(window, stat, now=now)
+            every = (time.perf_counter() - started) / 20
+            print(f"  {label:>7} {stat:<10}: one sensor {one * 1e6:8.1f} us | all {len(sensor_ids)} sensors {every * 1e3:7.2f} ms")
+
+
+if __name__ == "__main__":
+    sensors = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    interval = float(sys.argv[2]) if len(sys.argv) > 2 else 2.0
+    sensor_ids = [f"/bench/{i}" for i in range(sensors)]
+    history = SensorHistory(sensor_ids)
+    steps, column_s, dict_steps, dict_s, now = bench_append(history, sensor_ids, interval, WEEK_S)
+    print(f"{sensors} sensors, one week at {interval:g} s sampling, memory {history.nbytes() / 1e6:.1f} MB")
+    print(f"  append_column: {steps / column_s:10.0f} snapshots/s ({steps * sensors / column_s / 1e6:.1f} M values/s)")
+    print(f"  append(dict) : {dict_steps / dict_s:10.0f} snapshots/s")
+    bench_queries(history, sensor_ids, now)
@@ -0,0 +1,89 @@
+# Hardware hot-plug: what a periodic rescan costs when nothing changed, and what the
+# window does when one top level device is unplugged and plugged back in. The
+# incremental path (SystemStatsApp.on_hardware_plugged: sensor index, dashboard config,
+# navigation list and dashboard patched for that device only) is compared with the full
+# path (on_hardware_enumerated: config, index and navigation list rebuilt for everything).
+# Runs the real SystemStatsApp on stub Tk over the fake LHM object model through
+# LhmBackend, so it times the Python side and counts widget calls.
+# Usage: python benchmarks/bench_hotplug.py [--scales 100,1000,10000] [--runs 20]
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import stub_tk
+from benchmarks.fake_lhm import FakeComputer, FakeIdentifier, build_fake_tree
+from dashboard_config import save_config, serialize_hardware
+from sensor_backends import LhmBackend
+
+SCALES = (100, 1000, 10000)
+RUNS = 20                # unplug/replug cycles per path and scale
+HARDWARE_COUNT = 16      # top level devices; the last one is the one unplugged
+
+
+def open_app(app_module, scale):
+    computer = FakeComputer(build_fake_tree(scale, hardware_count=HARDWARE_COUNT))
+    layout = LhmBackend(computer=computer); layout.open()
+    dashboard = {hw.id: {"show": True, "sensors": [sensor.id for sensor in hw.iter_sensors()]} for hw in layout.hardware}
+    save_config(layout.name, dashboard, serialize_hardware(layout.hardware))
+    app = app_module.SystemStatsApp(backend=LhmBackend(computer=computer))
+    while not app.backend_opened: time.sleep(0.01)
+    app.update_stats_loop(); app.sampler.stop()
+    return app, computer
+
+
+def time_ms(func):
+    stub_tk.reset()
+    started = time.perf_counter()
+    result = func()
+    return (time.perf_counter() - started) * 1000.0, sum(stub_tk.CALLS.values()), result
+
+
+def run_scale(app_module, scale, runs):
+    app, computer = open_app(app_module, scale)
+    backend, device = app.backend, computer.Hardware[-1]
+    results = {}
+
+    FakeIdentifier.calls = 0
+    idle = [time_ms(backend.rescan)[0] for _ in range(runs)]
+    results["rescan_idle"] = (sum(idle) / runs, 0, FakeIdentifier.calls / runs)
+
+    for case, apply in (("apply_incremental", app.on_hardware_plugged), ("apply_full", app.on_hardware_enumerated)):
+        rescan_ms = apply_ms = calls = 0.0
+        for _ in range(runs):
+            for plug in (lambda: computer.Hardware.remove(device), lambda: computer.Hardware.append(device)):
+                plug()
+                elapsed, _, changed = time_ms(backend.rescan)
+                assert changed
+                rescan_ms += elapsed
+                elapsed, widget_calls, _ = time_ms(apply)
+                apply_ms += elapsed; calls += widget_calls
+        results["rescan_changed" if case == "apply_incremental" else "rescan_changed_again"] = (rescan_ms / (2 * runs), 0, None)
+        results[case] = (apply_ms / (2 * runs), calls / (2 * runs), None)
+    del results["rescan_changed_again"]
+    app.exit_app()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark hot-plug rescans and incremental vs full UI updates.")
+    parser.add_argument("--scales", default=",".join(str(scale) for scale in SCALES), help="comma separated sensor counts")
+    parser.add_argument("--runs", type=int, default=RUNS, help="unplug/replug cycles per path")
+    args = parser.parse_args()
+    stub_tk.install()
+    os.environ["GLANCED_CONFIG"] = os.path.join(tempfile.mkdtemp(), "dashboard.json")
+    import appinterface as app_module
+
+    for scale in (int(scale) for scale in args.scales.split(",")):
+        print(f"{scale} sensors on {HARDWARE_COUNT} devices (stub Tk, one device unplugged and replugged)")
+        for case, (mean_ms, calls, identifiers) in run_scale(app_module, scale, args.runs).items():
+            extra = f"  {identifiers:6.1f} Identifier calls" if identifiers is not None else f"  {calls:8.0f} widget calls" if calls else ""
+            print(f"  {case:<20} {mean_ms:9.3f} ms{extra}")
+
+
+if __name__ == "__main__":
+    main()
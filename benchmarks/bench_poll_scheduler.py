@@ -0,0 +1,45 @@
+# Update() calls made by the adaptive PollScheduler vs. a single global interval,
+# over a simulated ten minutes of sampling (no sleeping; time is injected).
+# Usage: python benchmarks/bench_poll_scheduler.py [total_sensors] [minutes]
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poll_scheduler import PollScheduler
+from sampler import Sampler
+from sensor_backends import SyntheticBackend
+
+GLOBAL_INTERVAL_MS = 2000
+STEP_S = 0.05
+
+
+def all_nodes(hardware):
+    for hw in hardware:
+        yield hw
+        yield from all_nodes(hw.sub_hardware)
+
+
+def simulate(scheduler, total_sensors, minutes):
+    backend = SyntheticBackend(total_sensors=total_sensors, hardware_count=12)
+    backend.open()
+    sampler = Sampler(backend, scheduler=scheduler)
+    start = 1000.0
+    sampler.set_targets(list(all_nodes(backend.hardware)), [s for hw in backend.hardware for s in hw.iter_sensors()], sample_now=False)
+    for schedule in scheduler.schedules.values(): schedule.since = start
+    steps = int(minutes * 60 / STEP_S)
+    for step in range(steps + 1): sampler.sample_once(start + step * STEP_S)
+    return scheduler.stats(now=start + steps * STEP_S), backend.update_calls
+
+
+if __name__ == "__main__":
+    total_sensors = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    minutes = float(sys.argv[2]) if len(sys.argv) > 2 else 10.0
+    fixed, fixed_calls = simulate(PollScheduler(GLOBAL_INTERVAL_MS, type_intervals_ms={}, adaptive=False), total_sensors, minutes)
+    adaptive, adaptive_calls = simulate(PollScheduler(GLOBAL_INTERVAL_MS), total_sensors, minutes)
+    print(f"{total_sensors} synthetic sensors, {minutes:.0f} simulated minutes, global interval {GLOBAL_INTERVAL_MS} ms")
+    print(f"  fixed    : {fixed_calls:6d} Update() calls  ({fixed_calls / minutes:7.1f}/min)")
+    print(f"  adaptive : {adaptive_calls:6d} Update() calls  ({adaptive_calls / minutes:7.1f}/min)"
+          f"  saved {adaptive['saved_per_minute']:.1f}/min")
+    slowest = sorted(adaptive["intervals_ms"].items(), key=lambda kv: -kv[1])[:4]
+    print("  slowest intervals: " + ", ".join(f"{hw_id}={ms:.0f} ms" for hw_id, ms in slowest))
@@ -0,0 +1,97 @@
+# Throughput of the .glrec recording format on a multi-GB file: appending samples,
+# scanning the whole memory-mapped file, range queries for one sensor and replay
+# steps. Reads run against a freshly written file, so they mostly hit the page cache.
+# Usage: python benchmarks/bench_recording.py [gigabytes] [sensors] [path]
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard_config import serialize_hardware
+from recording import Recording, RecordingWriter, ReplayBackend
+from sensor_backends import SyntheticBackend
+
+SAMPLE_INTERVAL_S = 2.0   # recorded cadence, as in the GUI
+QUERY_SPAN_S = 3600.0     # one hour per range query
+
+
+def percentiles(timings_us):
+    timings_us = sorted(timings_us)
+    return timings_us[len(timings_us) // 2], timings_us[int(len(timings_us) * 0.99)]
+
+
+def main():
+    gigabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 2.0
+    sensor_count = int(sys.argv[2]) if len(sys.argv) > 2 else 512
+    path = sys.argv[3] if len(sys.argv) > 3 else os.path.join(tempfile.gettempdir(), "bench_recording.glrec")
+    backend = SyntheticBackend(total_sensors=sensor_count); backend.open()
+    sensors = [sensor for hw in backend.hardware for sensor in hw.iter_sensors()]
+    rows = int(gigabytes * 1e9 / (len(sensors) * 4 + 8))
+
+    # Snapshot-dict path (what the GUI and headless writers use), on a short separate file.
+    snapshots = []
+    for _ in range(256):
+        backend.update_many(backend.hardware)
+        snapshots.append({sensor.id: backend.read(sensor) for sensor in sensors})
+    writer = RecordingWriter(path, sensors, serialize_hardware(backend.hardware), backend.name)
+    started = time.perf_counter()
+    for i in range(20000): writer.append(i * SAMPLE_INTERVAL_S, snapshots[i % len(snapshots)])
+    writer.close()
+    append_us = (time.perf_counter() - started) / 20000 * 1e6
+
+    # Bulk write of the large file from pre-gathered columns.
+    columns = [np.array(list(map(values.get, [sensor.id for sensor in sensors])), dtype=np.float32) for values in snapshots]
+    writer = RecordingWriter(path, sensors, serialize_hardware(backend.hardware), backend.name)
+    started = time.perf_counter()
+    for i in range(rows): writer.append_column(i * SAMPLE_INTERVAL_S, columns[i % len(columns)])
+    writer.close()
+    write_s = time.perf_counter() - started
+    size = os.path.getsize(path)
+
+    started = time.perf_counter()
+    recording = Recording(path)
+    open_ms = (time.perf_counter() - started) * 1000.0
+    started = time.perf_counter()
+    total = 0.0
+    for _, values in recording.window(recording.start, recording.end): total += float(values.sum(dtype=np.float64))
+    scan_s = time.perf_counter() - started
+
+    rng = random.Random(0)
+    query_us, query_rows = [], 0
+    for _ in range(2000):
+        sensor_id = rng.choice(recording.sensor_ids)
+        start = rng.uniform(recording.start, max(recording.start, recording.end - QUERY_SPAN_S))
+        began = time.perf_counter()
+        times, values = recording.series(sensor_id, start, start + QUERY_SPAN_S)
+        values.max()
+        query_us.append((time.perf_counter() - began) * 1e6)
+        query_rows += len(values)
+    recording.close()
+
+    replay = ReplayBackend(path, "max"); replay.open()
+    dashboard = sensors[:64]
+    started = time.perf_counter()
+    for _ in range(20000):
+        replay.update_many(replay.hardware)
+        for sensor in dashboard: replay.read(sensor)
+    replay_us = (time.perf_counter() - started) / 20000 * 1e6
+    replay.close()
+
+    query_p50, query_p99 = percentiles(query_us)
+    print(f"{size / 1e9:.2f} GB: {rows} samples x {len(sensors)} sensors ({recording.chunk_rows}-row chunks)")
+    print(f"  append (snapshot dict) : {append_us:8.1f} us/sample")
+    print(f"  write (columns)        : {size / write_s / 1e6:8.0f} MB/s  ({rows / write_s:.0f} samples/s)")
+    print(f"  open                   : {open_ms:8.1f} ms")
+    print(f"  full scan (mmap)       : {size / scan_s / 1e9:8.2f} GB/s  (checksum {total:.4g})")
+    print(f"  1 h range query        : p50 {query_p50:8.1f} us  p99 {query_p99:8.1f} us  ({query_rows // len(query_us)} rows each)")
+    print(f"  replay step + 64 reads : {replay_us:8.1f} us")
+    if len(sys.argv) <= 3: os.remove(path)
+
+
+if __name__ == "__main__":
+    main()
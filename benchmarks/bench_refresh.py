@@ -0,0 +1,232 @@
+# Dashboard and list view refresh paths at 10 to 10,000 sensors: a real SystemStatsApp
+# with every sensor on its dashboard (build_selective_view_ui, refresh_selective_view_sensors,
+# build_list_view_rows, refresh_selected_hardware_sensors_list_view, formatting,
+# the sparkline redraw), with fresh readings on every tick and, for the *_steady
+# cases, readings that only jitter below display precision, over the fake LHM object
+# model through LhmBackend. Its sampler thread is stopped; each case samples itself.
+# Runs against real Tk when a display is available (e.g. under xvfb-run) and
+# against benchmarks/stub_tk otherwise, which times the Python side only and
+# counts widget calls. Every round runs all scales in a fresh interpreter and each case
+# reports its median round, which neither a slow round (a GC pass, a busy core) nor a rare
+# fast one moves much; a best-of-N baseline records the luckiest round and later runs then
+# read as regressions. Results can be saved as a baseline and compared later on the same
+# machine; baselines are not portable and are not kept in the repo. The first pass decides
+# the comparison; scales with a case over the tolerance then get --retries more rounds,
+# shown for information only.
+# Usage: python benchmarks/bench_refresh.py [--tk auto|real|stub] [--scales 10,100,1000,10000] [--rounds 5]
+#                                           [--save-baseline] [--tolerance 0.25] [--min-delta-ms 0.02] [--retries 3]
+import argparse
+import gc
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks import stub_tk
+from benchmarks.fake_lhm import FakeComputer, build_fake_tree
+from dashboard_config import save_config, serialize_hardware
+from sensor_backends import LhmBackend
+
+SCALES = (10, 100, 1000, 10000)
+TICKS = 200              # timed refreshes per scale (fewer at large scales, see ticks_for)
+BUILDS = 5               # timed cold dashboard builds per scale
+ROUNDS = 5               # rounds over all scales, one process each; each case reports its median round
+MIN_DELTA_MS = 0.02      # a slowdown smaller than this is never a regression (timer and scheduler noise on tiny cases)
+RETRIES = 3              # extra rounds shown for the scales that regress; they do not change the result
+BASELINE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baselines")
+
+
+def resolve_tk(mode):
+    if mode == "auto": mode = "real" if os.name == "nt" or os.environ.get("DISPLAY") else "stub"
+    return mode
+
+
+def pick_tk(mode):
+    mode = resolve_tk(mode)
+    if mode == "stub": stub_tk.install()
+    return mode
+
+
+def open_app(app_module, scale):
+    # The real window over the fake LHM tree with every sensor on its dashboard. Its sampler is
+    # stopped once the backend is up, so the cases drive sampling themselves.
+    computer = FakeComputer(build_fake_tree(scale))
+    layout = LhmBackend(computer=computer); layout.open()
+    dashboard = {hw.id: {"show": True, "sensors": [sensor.id for sensor in hw.iter_sensors()]} for hw in layout.hardware}
+    save_config(layout.name, dashboard, serialize_hardware(layout.hardware))
+    app = app_module.SystemStatsApp(backend=LhmBackend(computer=computer))
+    while not app.backend_opened: time.sleep(0.01)
+    app.update_stats_loop(); app.sampler.stop()
+    # Every node due on every sample, so each tick sees fresh values.
+    app.sampler.scheduler = app_module.PollScheduler(0, type_intervals_ms={}, adaptive=False)
+    app.update_sampling_targets()
+    return app
+
+
+def percentile(ordered, pct):
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def measure(runs, setup, op, flush):
+    # runs x (setup untimed, op + flush timed); returns stats in ms plus widget calls per op (stub only).
+    # The collector is off while an op is timed, as in timeit, and runs in the untimed setup instead.
+    timings, calls = [], 0
+    for _ in range(runs):
+        setup()
+        stub_tk.reset()
+        gc.disable()
+        try:
+            started = time.perf_counter()
+            op(); flush()
+            timings.append((time.perf_counter() - started) * 1000.0)
+        finally:
+            gc.enable()
+        calls += sum(stub_tk.CALLS.values())
+    ordered = sorted(timings)
+    mean = sum(ordered) / len(ordered)
+    return {"runs": runs, "ops_per_s": 1000.0 / mean if mean else float("inf"), "mean_ms": mean,
+            "p50_ms": percentile(ordered, 50), "p99_ms": percentile(ordered, 99), "widget_calls": calls / runs}
+
+
+def ticks_for(scale):
+    return max(20, min(TICKS, TICKS * 100 // scale))
+
+
+def run_scale(app_module, scale):
+    app = open_app(app_module, scale)
+    flush = app.update_idletasks
+    sensors = [sensor for hw in app.backend.hardware for sensor in hw.iter_sensors()]
+    ticks, results = ticks_for(scale), {}
+    rng = random.Random(0)
+
+    def steady_sample():
+        # Publishes the previous readings with jitter far below display precision, like idle hardware.
+        latest = app.sampler.latest
+        values = {sensor_id: None if value is None else value + rng.uniform(-1e-4, 1e-4) for sensor_id, value in latest.values.items()}
+        app.sampler.latest = latest._replace(seq=latest.seq + 1, values=values)
+
+    def empty_dashboard():
+        # Untimed: every section is released, so the timed build creates them all again.
+        shown = [hw_conf['show_hw'] for hw_conf in app.selective_view_config.values()]
+        for show in shown: show.set(False)
+        app.build_selective_view_ui(); flush()
+        for show in shown: show.set(True)
+    results["selective_build_cold"] = measure(BUILDS, empty_dashboard, app.build_selective_view_ui, flush)
+    results["selective_build_noop"] = measure(ticks, lambda: None, app.build_selective_view_ui, flush)
+    results["selective_refresh"] = measure(ticks, app.sampler.sample_once, app.refresh_selective_view_sensors, flush)
+    def new_sparkline_data():
+        app.sampler.sample_once(); app.refresh_selective_view_sensors(); flush()
+    results["sparkline_draw"] = measure(ticks, new_sparkline_data, app._draw_sparklines, flush)
+    results["selective_refresh_steady"] = measure(ticks, steady_sample, app.refresh_selective_view_sensors, flush)
+
+    reading = app.formatter.reading
+    def format_all():
+        values = app.sampler.latest.values
+        for sensor in sensors: reading(sensor, values.get(sensor.id))
+    results["format_all"] = measure(ticks, app.sampler.sample_once, format_all, lambda: None)
+
+    app.current_view_mode.set("List View")
+    app.switch_view()
+    results["list_build"] = measure(BUILDS, lambda: None, app.build_list_view_rows, flush)
+    results["list_refresh"] = measure(ticks, app.sampler.sample_once, app.refresh_selected_hardware_sensors_list_view, flush)
+    results["list_refresh_steady"] = measure(ticks, steady_sample, app.refresh_selected_hardware_sensors_list_view, flush)
+    app.exit_app()
+    return results
+
+
+def run_round(mode, scales, rounds):
+    # One round over the given scales in a fresh interpreter; appends each case's stats to rounds ("case/scale" -> [stats]).
+    handle, path = tempfile.mkstemp(suffix=".json"); os.close(handle)
+    try:
+        subprocess.run([sys.executable, os.path.abspath(__file__), "--tk", mode, "--scales", ",".join(map(str, scales)), "--round-output", path],
+                       check=True, stdout=subprocess.DEVNULL)
+        with open(path, encoding="utf-8") as f: round_results = json.load(f)
+    finally:
+        os.remove(path)
+    for key, stats in round_results.items(): rounds.setdefault(key, []).append(stats)
+
+
+def median_rounds(rounds):
+    # "case/scale" -> stats of the round with the median p50 (the lower one for an even count).
+    return {key: sorted(runs, key=lambda stats: stats["p50_ms"])[(len(runs) - 1) // 2] for key, runs in rounds.items()}
+
+
+def compare(results, baseline, tolerance, min_delta_ms=MIN_DELTA_MS, report=True):
+    # A case regresses when its p50 is more than `tolerance` and more than min_delta_ms slower than the baseline's.
+    regressions = []
+    for key, stats in results.items():
+        base = baseline.get(key)
+        if base is None or base["p50_ms"] <= 0: continue
+        ratio = stats["p50_ms"] / base["p50_ms"]
+        marker = "  REGRESSION" if ratio > 1.0 + tolerance and stats["p50_ms"] - base["p50_ms"] > min_delta_ms else ""
+        if report: print(f"  {key:<32} p50 {base['p50_ms']:9.3f} -> {stats['p50_ms']:9.3f} ms  x{ratio:5.2f}{marker}")
+        if marker: regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the dashboard and list view refresh paths.")
+    parser.add_argument("--tk", choices=("auto", "real", "stub"), default="auto", help="real Tk needs a display (xvfb-run works); auto picks stub without one")
+    parser.add_argument("--scales", default=",".join(str(scale) for scale in SCALES), help="comma separated sensor counts")
+    parser.add_argument("--save-baseline", action="store_true", help="write the results as the baseline for this Tk mode")
+    parser.add_argument("--baseline", help=f"baseline file (default {BASELINE_DIR}/bench_refresh-<tk>.json)")
+    parser.add_argument("--rounds", type=int, default=ROUNDS, help="rounds over all scales, each in its own process; each case reports its median round")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed p50 slowdown before a case counts as a regression")
+    parser.add_argument("--min-delta-ms", type=float, default=MIN_DELTA_MS, help="smallest p50 slowdown in ms that can count as a regression")
+    parser.add_argument("--retries", type=int, default=RETRIES, help="extra rounds shown for scales that regress (information only)")
+    parser.add_argument("--round-output", help=argparse.SUPPRESS)  # internal: run one round and write its results here
+    args = parser.parse_args()
+
+    if args.round_output:
+        pick_tk(args.tk)
+        os.environ["GLANCED_CONFIG"] = os.path.join(tempfile.mkdtemp(), "dashboard.json")
+        import appinterface as app_module
+        results = {f"{case}/{scale}": stats for scale in (int(scale) for scale in args.scales.split(","))
+                   for case, stats in run_scale(app_module, scale).items()}
+        with open(args.round_output, "w", encoding="utf-8") as f: json.dump(results, f)
+        return
+
+    mode = resolve_tk(args.tk)
+    scales = [int(scale) for scale in args.scales.split(",")]
+    path = args.baseline or os.path.join(BASELINE_DIR, f"bench_refresh-{mode}.json")
+    baseline = None
+    if not args.save_baseline and os.path.exists(path):
+        with open(path, encoding="utf-8") as f: baseline = json.load(f)
+    rounds = {}
+    for _ in range(args.rounds): run_round(mode, scales, rounds)
+    results = median_rounds(rounds)
+    for scale in scales:
+        print(f"{scale} sensors ({mode} Tk, median of {args.rounds} rounds)")
+        for key, stats in results.items():
+            case, _, key_scale = key.rpartition("/")
+            if int(key_scale) != scale: continue
+            calls = f"  {stats['widget_calls']:8.0f} widget calls/op" if mode == "stub" else ""
+            print(f"  {case:<26} {stats['ops_per_s']:10.1f} ops/s  p50 {stats['p50_ms']:9.3f} ms  p99 {stats['p99_ms']:9.3f} ms{calls}")
+
+    if args.save_baseline:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"tk": mode, "python": sys.version.split()[0], "saved_at": time.strftime("%Y-%m-%d"), "rounds": args.rounds, "results": results},
+                      f, indent=1, sort_keys=True)
+        print(f"Baseline saved to {path}")
+    elif baseline:
+        print(f"Compared with {path} (saved {baseline['saved_at']}, tolerance {args.tolerance:.0%} and {args.min_delta_ms} ms)")
+        regressions = compare(results, baseline["results"], args.tolerance, args.min_delta_ms)
+        if regressions and args.retries:
+            # Information only: the first pass above is the result. More rounds show whether a
+            # regression holds or came from a slow stretch of the machine.
+            regressed = sorted({int(key.rpartition("/")[2]) for key in regressions})
+            for _ in range(args.retries): run_round(mode, regressed, rounds)
+            print(f"Regressed cases over {args.rounds + args.retries} rounds (information only, the result above stands)")
+            retried = median_rounds(rounds)
+            compare({key: retried[key] for key in regressions}, baseline["results"], args.tolerance, args.min_delta_ms)
+        if regressions: sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+# Aggregating many agents: starts N headless agents on loopback with the synthetic
+# backend, follows them all with RemoteBackend and reports connect time, traffic,
+# how fresh the merged readings are and what a sampler tick over every host costs.
+# Usage: python benchmarks/bench_remote_hosts.py [hosts] [sensors per host] [seconds]
+import os
+import socket
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from remote_hosts import RemoteBackend
+from sampler import Sampler
+from poll_scheduler import PollScheduler
+
+BASE_PORT = 9400
+AGENT_INTERVAL_MS = 1000
+
+
+def wait_for_agents(count, timeout=120.0):
+    deadline = time.monotonic() + timeout
+    for port in range(BASE_PORT, BASE_PORT + count):
+        while True:
+            try:
+                socket.create_connection(("127.0.0.1", port), timeout=1.0).close()
+                break
+            except OSError:
+                if time.monotonic() > deadline: raise
+                time.sleep(0.2)
+
+
+def main():
+    host_count = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    sensor_count = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    seconds = float(sys.argv[3]) if len(sys.argv) > 3 else 10.0
+    agents = [subprocess.Popen([sys.executable, os.path.join(ROOT, "headless.py"), "--backend", "synthetic", "--synthetic-sensors", str(sensor_count),
+                                "--interval-ms", str(AGENT_INTERVAL_MS), "--agent", f"127.0.0.1:{BASE_PORT + i}", "--output", "none"],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for i in range(host_count)]
+    try:
+        wait_for_agents(host_count)
+        backend = RemoteBackend([f"127.0.0.1:{BASE_PORT + i}" for i in range(host_count)])
+        started = time.perf_counter()
+        backend.open()
+        connect_s = time.perf_counter() - started
+        sensors = [sensor for hw in backend.hardware for sensor in hw.iter_sensors()]
+        sampler = Sampler(backend, scheduler=PollScheduler(backend.poll_interval_ms, type_intervals_ms={}, adaptive=False))
+        sampler.set_targets(list({id(sensor.hardware): sensor.hardware for sensor in sensors}.values()), sensors, sample_now=False)
+
+        received = sum(host.bytes_received for host in backend.hosts)
+        cpu_started, wall_started = time.process_time(), time.perf_counter()
+        tick_ms, ages = [], []
+        while time.perf_counter() - wall_started < seconds:
+            began = time.perf_counter()
+            snapshot = sampler.sample_once()
+            tick_ms.append((time.perf_counter() - began) * 1000.0)
+            now = time.time()
+            ages.extend(now - host.last_seen for host in backend.hosts if host.last_seen is not None)
+            time.sleep(backend.poll_interval_ms / 1000.0)
+        elapsed = time.perf_counter() - wall_started
+        cpu = (time.process_time() - cpu_started) / elapsed * 100.0
+        traffic = (sum(host.bytes_received for host in backend.hosts) - received) / elapsed
+        connected = sum(host.connected for host in backend.hosts)
+        missing = sum(1 for value in snapshot.values.values() if value is None)
+        backend.close()
+    finally:
+        for agent in agents: agent.terminate()
+        for agent in agents: agent.wait()
+
+    tick_ms.sort(); ages.sort()
+    print(f"{connected}/{host_count} hosts, {len(sensors)} sensors, {elapsed:.1f} s")
+    print(f"  connect all       : {connect_s * 1000:8.0f} ms")
+    print(f"  traffic           : {traffic / 1e3:8.1f} KB/s ({traffic / max(1, connected) / 1e3:.1f} KB/s per host)")
+    print(f"  reading age       : p50 {ages[len(ages) // 2] * 1000:6.0f} ms  p99 {ages[int(len(ages) * 0.99)] * 1000:6.0f} ms")
+    print(f"  sampler tick      : p50 {tick_ms[len(tick_ms) // 2]:6.2f} ms  p99 {tick_ms[int(len(tick_ms) * 0.99)]:6.2f} ms  (every sensor, {missing} without a reading)")
+    print(f"  aggregator CPU    : {cpu:8.1f} %")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# UI-frame latency and sample jitter with a slow hardware Update(), comparing the
+# legacy synchronous refresh (Update() inside the UI tick) with the background Sampler.
+# Usage: python benchmarks/bench_sampler.py [seconds] [update_delay_s]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from poll_scheduler import PollScheduler
+from sampler import RollingStats, Sampler
+from sensor_backends import SyntheticBackend
+
+SAMPLE_INTERVAL_MS = 1000
+FRAME_INTERVAL_MS = 50
+
+
+def make_backend(update_delay):
+    backend = SyntheticBackend(total_sensors=500, update_delay={"Storage": update_delay})
+    backend.open()
+    nodes = []
+    def collect(hw):
+        nodes.append(hw)
+        for sub in hw.sub_hardware: collect(sub)
+    for hw in backend.hardware: collect(hw)
+    return backend, nodes, [s for hw in backend.hardware for s in hw.iter_sensors()]
+
+
+def ui_loop(seconds, on_frame):
+    # Stand-in for Tk's event loop: a frame is due every FRAME_INTERVAL_MS and its
+    # latency is how long after that moment the frame finished, i.e. how long
+    # an input event arriving on time would have waited.
+    latency = RollingStats(size=100000)
+    end = time.perf_counter() + seconds
+    next_due = time.perf_counter()
+    while time.perf_counter() < end:
+        time.sleep(max(0.0, next_due - time.perf_counter()))
+        on_frame()
+        finished = time.perf_counter()
+        latency.add(max(0.0, finished - next_due) * 1000.0)
+        next_due = max(next_due + FRAME_INTERVAL_MS / 1000.0, finished)
+    return latency
+
+
+def run_synchronous(seconds, update_delay):
+    backend, hardware, sensors = make_backend(update_delay)
+    state = {"next_sample": time.perf_counter()}
+    jitter = RollingStats(size=100000)
+
+    def frame():
+        now = time.perf_counter()
+        if now >= state["next_sample"]:
+            jitter.add((now - state["next_sample"]) * 1000.0)
+            backend.update_many(hardware)
+            {s.id: backend.read(s) for s in sensors}
+            state["next_sample"] += SAMPLE_INTERVAL_MS / 1000.0
+    return ui_loop(seconds, frame), jitter
+
+
+def run_sampler(seconds, update_delay):
+    backend, hardware, sensors = make_backend(update_delay)
+    # Fixed-rate scheduler so both modes update every node on the same cadence.
+    sampler = Sampler(backend, scheduler=PollScheduler(SAMPLE_INTERVAL_MS, type_intervals_ms={}, adaptive=False))
+    sampler.set_targets(hardware, sensors)
+    sampler.start()
+    state = {"seq": None}
+
+    def frame():
+        snapshot = sampler.latest
+        if snapshot is not None and snapshot.seq != state["seq"]:
+            state["seq"] = snapshot.seq
+            sum(1 for v in snapshot.values.values() if v is not None)
+    latency = ui_loop(seconds, frame)
+    sampler.stop()
+    return latency, sampler.jitter_ms
+
+
+def report(label, latency, jitter):
+    lat, jit = latency.summary(), jitter.summary()
+    print(f"  {label:<12} UI frame latency p50 {lat['p50']:7.1f} ms  p99 {lat['p99']:7.1f} ms  max {lat['max']:7.1f} ms"
+          f"  | sample jitter p50 {jit['p50']:6.1f} ms  p99 {jit['p99']:6.1f} ms")
+
+
+if __name__ == "__main__":
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 6.0
+    update_delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.5
+    print(f"500 sensors, Storage Update() = {update_delay * 1000:.0f} ms, sample every {SAMPLE_INTERVAL_MS} ms, frame every {FRAME_INTERVAL_MS} ms, {seconds:.0f} s")
+    report("synchronous", *run_synchronous(seconds, update_delay))
+    report("sampler", *run_sampler(seconds, update_delay))
@@ -0,0 +1,73 @@
+# Per-tick sensor lookup: legacy recursive search vs. the precomputed SensorIndex.
+# Usage: python benchmarks/bench_sensor_index.py [total_sensors] [selected_sensors]
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sensor_backends import LhmBackend
+from sensor_index import SensorIndex
+from benchmarks.fake_lhm import FakeComputer, FakeIdentifier, build_fake_tree, iter_sensors
+
+TICKS = 200
+
+
+def legacy_tick(hardware, selected_by_hw):
+    # Same shape as the pre-index refresh_selective_view_sensors loop.
+    values = []
+    for hw_item in hardware:
+        wanted = selected_by_hw.get(hw_item.Identifier.ToString())
+        if not wanted: continue
+        hw_item.Update()
+        for sensor_id in wanted:
+            def find_sensor_recursively(item_to_search, target_sensor_id):
+                for s_obj in item_to_search.Sensors:
+                    if s_obj.Identifier.ToString() == target_sensor_id: return s_obj
+                for sub_item in item_to_search.SubHardware:
+                    found_s = find_sensor_recursively(sub_item, target_sensor_id)
+                    if found_s: return found_s
+                return None
+            sensor = find_sensor_recursively(hw_item, sensor_id)
+            values.append(sensor.Value if sensor else None)
+    return values
+
+
+def indexed_tick(backend, index, selected_ids):
+    backend.update_many(index.update_list)
+    return [backend.read(index.get(sensor_id)) for sensor_id in selected_ids]
+
+
+def run(total_sensors=500, selected=100):
+    hardware = build_fake_tree(total_sensors)
+    all_pairs = [(hw, sensor) for hw in hardware for _, sensor in iter_sensors(hw)]
+    step = max(1, len(all_pairs) // selected)
+    chosen = all_pairs[::step][:selected]
+    selected_by_hw = {}
+    for hw, sensor in chosen: selected_by_hw.setdefault(hw.Identifier.text, []).append(sensor.Identifier.text)
+    selected_ids = [sensor.Identifier.text for _, sensor in chosen]
+
+    FakeIdentifier.calls = 0
+    start = time.perf_counter()
+    for _ in range(TICKS): legacy_tick(hardware, selected_by_hw)
+    legacy_s, legacy_calls = time.perf_counter() - start, FakeIdentifier.calls
+
+    FakeIdentifier.calls = 0
+    start = time.perf_counter()
+    backend = LhmBackend(computer=FakeComputer(hardware)); backend.open()
+    index = SensorIndex(); index.ensure(backend.hardware); index.select(selected_ids)
+    build_s, build_calls = time.perf_counter() - start, FakeIdentifier.calls
+    FakeIdentifier.calls = 0
+    start = time.perf_counter()
+    for _ in range(TICKS): indexed_tick(backend, index, selected_ids)
+    indexed_s, indexed_calls = time.perf_counter() - start, FakeIdentifier.calls
+
+    print(f"{total_sensors} sensors, {len(selected_ids)} selected, {TICKS} ticks")
+    print(f"  legacy : {legacy_s / TICKS * 1e6:10.1f} us/tick  {legacy_calls / TICKS:8.0f} ToString()/tick")
+    print(f"  indexed: {indexed_s / TICKS * 1e6:10.1f} us/tick  {indexed_calls / TICKS:8.0f} ToString()/tick"
+          f"  (one-off build {build_s * 1e3:.2f} ms, {build_calls} ToString())")
+    print(f"  speedup: {legacy_s / indexed_s:.1f}x")
+
+
+if __name__ == "__main__":
+    run(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,70 @@
+# Cold vs warm startup: time until the dashboard's first frame has data, with and
+# without a saved dashboard config. Hardware probing is simulated by the synthetic
+# backend's per-type probe delay (LHM spends most of its startup probing drivers).
+# Usage: python benchmarks/bench_startup.py [sensors] [probe_delay_s]
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dashboard_config import dashboard_hardware_types, load_config, save_config, serialize_hardware
+from poll_scheduler import PollScheduler
+from sampler import Sampler
+from sensor_backends import GPU_HARDWARE_TYPES, SyntheticBackend
+from sensor_index import SensorIndex
+
+# Storage and network probing is the slowest part of an LHM Open().
+PROBE_WEIGHTS = {"Storage": 4.0, "Network": 2.0, "Motherboard": 2.0}
+
+
+def default_dashboard(hardware):
+    # Stand-in for the keyword defaults: CPU and first GPU sections, temperature and load sensors.
+    dashboard, gpu_shown = {}, False
+    for hw in hardware:
+        show = hw.hw_type == "Cpu" or (hw.hw_type in GPU_HARDWARE_TYPES and not gpu_shown)
+        gpu_shown |= show and hw.hw_type in GPU_HARDWARE_TYPES
+        dashboard[hw.id] = {"show": show, "sensors": [s.id for s in hw.iter_sensors() if show and s.sensor_type in ("Temperature", "Load")]}
+    return dashboard
+
+
+def launch(path, sensors, probe_delay):
+    # Returns (first frame seconds, deferred enumeration seconds).
+    started = time.perf_counter()
+    backend = SyntheticBackend(total_sensors=sensors, probe_delay={t: probe_delay * PROBE_WEIGHTS.get(t, 1.0) for t in
+                                                                   ("Cpu", "GpuNvidia", "Memory", "Motherboard", "Storage", "Network")})
+    config = load_config(path)
+    if config: backend.hardware_types = dashboard_hardware_types(config)
+    backend.open()
+    dashboard = config["dashboard"] if config else default_dashboard(backend.hardware)
+    index = SensorIndex(); index.ensure(backend.hardware)
+    shown = [sensor_id for hw_id, selection in dashboard.items() if selection["show"] for sensor_id in selection["sensors"] if sensor_id in index]
+    sampler = Sampler(backend, scheduler=PollScheduler(2000))
+    sampler.set_targets(index.select(shown), [index.get(sensor_id) for sensor_id in shown], sample_now=False)
+    sampler.sample_once()
+    first_frame = time.perf_counter() - started
+
+    started = time.perf_counter()
+    backend.enumerate_all()
+    deferred = time.perf_counter() - started
+    save_config(backend.name, dashboard, serialize_hardware(backend.hardware), path)
+    return first_frame, deferred
+
+
+def main():
+    sensors = int(sys.argv[1]) if len(sys.argv) > 1 else 512
+    probe_delay = float(sys.argv[2]) if len(sys.argv) > 2 else 0.1
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "dashboard.json")
+        cold, cold_deferred = launch(path, sensors, probe_delay)
+        warm, warm_deferred = launch(path, sensors, probe_delay)
+        size = os.path.getsize(path)
+    print(f"{sensors} sensors, {probe_delay * 1000:.0f} ms base probe delay per hardware type, config {size / 1024:.0f} KiB")
+    print(f"  cold start (no config): first frame {cold * 1000:7.1f} ms")
+    print(f"  warm start (config):    first frame {warm * 1000:7.1f} ms  (+{warm_deferred * 1000:.1f} ms deferred enumeration off the UI path)")
+    print(f"  speedup to first frame: x{cold / warm:.1f}")
+
+
+if __name__ == "__main__":
+    main()
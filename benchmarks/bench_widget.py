@@ -0,0 +1,119 @@
+# Desktop widget vs full window with the same dashboard: CPU share at a 1 s refresh
+# and memory, at equal sensor counts on the synthetic backend (every sensor shown).
+# Each mode runs in its own process. With a display (real Tk) it runs the mode's event
+# loop for [seconds] and reports process CPU % and resident memory; without one (stub
+# Tk) it drives the same frame loops once per simulated second, which times the Python
+# side of sampling and drawing and counts the widget calls per frame.
+# Usage: python benchmarks/bench_widget.py [--tk auto|real|stub] [--sensors 8,32,128] [--seconds 30]
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import stub_tk
+from dashboard_config import save_config, serialize_hardware
+from sensor_backends import SyntheticBackend
+
+SENSOR_COUNTS = (8, 32, 128)
+REFRESH_MS = 1000        # sampler cadence of both modes
+WARMUP_S = 5.0           # real Tk: startup and deferred enumeration are not measured
+MODES = ("window", "widget")
+
+
+def resident_mb():
+    try:
+        with open("/proc/self/statm") as f: return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / 1e6
+    except (OSError, ValueError, AttributeError): pass
+    try: import resource
+    except ImportError: return None  # Windows without /proc
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1e6 if sys.platform == "darwin" else 1e3)  # peak, not current
+
+
+def show_everything(backend, path):
+    hardware = serialize_hardware(backend.hardware)
+    dashboard = {hw.id: {"show": True, "sensors": [sensor.id for sensor in hw.iter_sensors()]} for hw in backend.hardware}
+    save_config(backend.name, dashboard, hardware, path)
+
+
+def run_child(mode, tk_mode, sensors, seconds):
+    if tk_mode == "stub": stub_tk.install()
+    config = os.path.join(tempfile.mkdtemp(), "dashboard.json")
+    os.environ["GLANCED_CONFIG"] = config
+    layout = SyntheticBackend(total_sensors=sensors); layout.open()
+    show_everything(layout, config)
+    backend = SyntheticBackend(total_sensors=sensors)
+    if mode == "window":
+        import appinterface
+        appinterface.UPDATE_INTERVAL_MS = REFRESH_MS
+        appinterface.VIRTUALIZE_SELECTIVE_VIEW = False  # the widget draws every sensor too
+        ui = appinterface.SystemStatsApp(backend=backend)
+        frame, close, frame_interval_ms = ui.update_stats_loop, ui.exit_app, appinterface.UI_FRAME_INTERVAL_MS
+    else:
+        import desktop_widget
+        ui = desktop_widget.DesktopWidget(backend=backend)
+        frame, close, frame_interval_ms = ui.update_loop, ui.exit_widget, desktop_widget.WIDGET_FRAME_INTERVAL_MS
+    result = {"mode": mode, "sensors": sensors}
+
+    if tk_mode == "real":
+        def start():
+            result["cpu_started"], result["wall_started"] = time.process_time(), time.perf_counter()
+        def finish():
+            result["cpu_pct"] = (time.process_time() - result.pop("cpu_started")) / (time.perf_counter() - result.pop("wall_started")) * 100.0
+            result["rss_mb"] = resident_mb()
+            close()
+        ui.after(int(WARMUP_S * 1000), start)
+        ui.after(int((WARMUP_S + seconds) * 1000), finish)
+        ui.mainloop()
+    else:
+        # stub after() schedules nothing: frames run here, one sample per simulated second and the
+        # frame loop as often as it would wake up in between.
+        while not ui.backend_opened: time.sleep(0.01)
+        frame(); ui.sampler.stop()
+        checks = max(1, REFRESH_MS // frame_interval_ms)
+        now, cpu, calls = time.monotonic(), 0.0, 0
+        for _ in range(int(seconds)):
+            now += REFRESH_MS / 1000.0
+            stub_tk.reset()
+            started = time.process_time()
+            ui.sampler.sample_once(now)
+            for _ in range(checks): frame()
+            cpu += time.process_time() - started
+            calls += sum(stub_tk.CALLS.values())
+        result["cpu_pct"] = cpu / (int(seconds) * REFRESH_MS / 1000.0) * 100.0
+        result["widget_calls"] = calls / int(seconds)
+        result["rss_mb"] = resident_mb()
+        close()
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the desktop widget with the full window at equal sensor counts.")
+    parser.add_argument("--tk", choices=("auto", "real", "stub"), default="auto", help="real Tk needs a display (xvfb-run works); auto picks stub without one")
+    parser.add_argument("--sensors", default=",".join(str(count) for count in SENSOR_COUNTS), help="comma separated dashboard sensor counts")
+    parser.add_argument("--seconds", type=float, default=30.0, help="measured seconds per mode (simulated with stub Tk)")
+    parser.add_argument("--child", choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+    mode = args.tk
+    if mode == "auto": mode = "real" if os.name == "nt" or os.environ.get("DISPLAY") else "stub"
+    if args.child:
+        run_child(args.child, mode, int(args.sensors), args.seconds); return
+
+    for sensors in (int(count) for count in args.sensors.split(",")):
+        print(f"{sensors} sensors ({mode} Tk, {REFRESH_MS} ms refresh, {args.seconds:.0f} s)")
+        for ui_mode in MODES:
+            output = subprocess.run([sys.executable, os.path.abspath(__file__), "--child", ui_mode, "--tk", mode, "--sensors", str(sensors),
+                                     "--seconds", str(args.seconds)], capture_output=True, text=True, cwd=ROOT).stdout
+            result = json.loads(output.strip().splitlines()[-1])
+            rss = f"{result['rss_mb']:7.1f} MB" if result["rss_mb"] is not None else "    n/a"
+            calls = f"  {result['widget_calls']:6.1f} widget calls/frame" if "widget_calls" in result else ""
+            print(f"  {ui_mode:<8} CPU {result['cpu_pct']:6.2f} %  RSS {rss}{calls}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+# --- Fake LibreHardwareMonitor object model ---
+# Mimics the parts of LibreHardwareMonitor.Hardware that Glanced touches
+# (Identifier.ToString(), Sensors, SubHardware, Update(), Value, ...) so the
+# refresh paths can be benchmarked without Windows or pythonnet.
+import random
+
+
+class FakeEnumValue:
+    def __init__(self, name): self.name = name
+    def ToString(self): return self.name
+    def __repr__(self): return self.name
+
+
+class FakeEnum:
+    def __init__(self, *names):
+        for name in names: setattr(self, name, FakeEnumValue(name))
+        self.names = names
+
+
+SensorType = FakeEnum("Voltage", "Current", "Power", "Clock", "Temperature", "Load", "Frequency", "Fan",
+                      "Flow", "Control", "Level", "Factor", "Data", "SmallData", "Throughput", "TimeSpan", "Energy", "Noise")
+HardwareType = FakeEnum("Motherboard", "SuperIO", "Cpu", "Memory", "GpuNvidia", "GpuAmd", "GpuIntel",
+                        "Storage", "Network", "Cooler", "EmbeddedController", "Psu", "Battery")
+FAKE_ENUMS = {'HardwareType': HardwareType, 'SensorType': SensorType}
+
+
+class FakeIdentifier:
+    calls = 0  # ToString() calls, i.e. simulated .NET boundary crossings
+
+    def __init__(self, text): self.text = text
+    def ToString(self):
+        FakeIdentifier.calls += 1
+        return self.text
+
+
+class FakeSensor:
+    def __init__(self, identifier, name, sensor_type, value):
+        self.Identifier = FakeIdentifier(identifier)
+        self.Name = name
+        self.SensorType = sensor_type
+        self.Value = value
+        self.Min = value
+        self.Max = value
+
+
+class FakeHardware:
+    def __init__(self, identifier, name, hardware_type, rng=None):
+        self.Identifier = FakeIdentifier(identifier)
+        self.Name = name
+        self.HardwareType = hardware_type
+        self.Sensors = []
+        self.SubHardware = []
+        self.update_calls = 0
+        self._rng = rng or random.Random(0)
+
+    def Update(self):
+        self.update_calls += 1
+        for sensor in self.Sensors:
+            if sensor.Value is not None:
+                sensor.Value = sensor.Value + self._rng.uniform(-1.0, 1.0)
+
+
+class FakeComputer:
+    def __init__(self, hardware): self.Hardware = hardware
+    def Open(self): pass
+    def Close(self): pass
+
+
+SENSOR_TYPE_CYCLE = ["Temperature", "Load", "Clock", "Power", "Voltage", "Fan", "Control", "Data", "SmallData", "Throughput", "Level", "Factor"]
+HARDWARE_TYPE_CYCLE = ["Cpu", "GpuNvidia", "Memory", "Motherboard", "Storage", "Network"]
+
+
+def build_fake_tree(total_sensors, hardware_count=8, sub_hardware_per_item=2, seed=0):
+    # Spreads total_sensors evenly over hardware_count items, half of each
+    # item's sensors living on SubHardware nodes like SuperIO chips do.
+    rng = random.Random(seed)
+    per_hw = max(1, total_sensors // hardware_count)
+    hardware, made = [], 0
+    for hw_idx in range(hardware_count):
+        hw_type_name = HARDWARE_TYPE_CYCLE[hw_idx % len(HARDWARE_TYPE_CYCLE)]
+        hw = FakeHardware(f"/{hw_type_name.lower()}/{hw_idx}", f"Fake {hw_type_name} {hw_idx}", getattr(HardwareType, hw_type_name), rng)
+        nodes = [hw]
+        for sub_idx in range(sub_hardware_per_item):
+            sub = FakeHardware(f"/{hw_type_name.lower()}/{hw_idx}/sub/{sub_idx}", f"Fake SuperIO {hw_idx}.{sub_idx}", HardwareType.SuperIO, rng)
+            hw.SubHardware.append(sub); nodes.append(sub)
+        count = per_hw if hw_idx < hardware_count - 1 else total_sensors - made
+        for s_idx in range(count):
+            owner = nodes[0] if s_idx % 2 == 0 or len(nodes) == 1 else nodes[1 + (s_idx // 2) % (len(nodes) - 1)]
+            type_name = SENSOR_TYPE_CYCLE[s_idx % len(SENSOR_TYPE_CYCLE)]
+            owner.Sensors.append(FakeSensor(f"{owner.Identifier.text}/{type_name.lower()}/{s_idx}",
+                                            f"{type_name} #{s_idx}", getattr(SensorType, type_name), rng.uniform(10.0, 90.0)))
+        made += count
+        hardware.append(hw)
+    return hardware
+
+
+def iter_sensors(item):
+    for sensor in item.Sensors: yield item, sensor
+    for sub_item in item.SubHardware: yield from iter_sensors(sub_item)
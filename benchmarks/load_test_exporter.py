@@ -0,0 +1,81 @@
+# Load test for the Prometheus exporter: concurrent keep-alive scrapers hammer
+# /metrics while the sampler ticks a synthetic backend. Reports scrape throughput
+# and latency, and checks that scrapes never add backend Update() calls.
+# Usage: python benchmarks/load_test_exporter.py [seconds] [clients] [sensors] [interval_ms]
+import http.client
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from metrics_exporter import MetricsExporter
+from poll_scheduler import PollScheduler
+from sampler import RollingStats, Sampler
+from sensor_backends import SyntheticBackend
+from sensor_index import SensorIndex
+
+
+def collect_nodes(hardware):
+    nodes = []
+    def collect(hw):
+        nodes.append(hw)
+        for sub in hw.sub_hardware: collect(sub)
+    for hw in hardware: collect(hw)
+    return nodes
+
+
+def scraper(port, deadline, latency, counts, errors):
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+    while time.perf_counter() < deadline:
+        started = time.perf_counter()
+        try:
+            conn.request("GET", "/metrics")
+            response = conn.getresponse()
+            body = response.read()
+        except (OSError, http.client.HTTPException):
+            errors.append(1)
+            conn.close(); conn = http.client.HTTPConnection("127.0.0.1", port, timeout=5)
+            continue
+        latency.add((time.perf_counter() - started) * 1000.0)
+        counts.append(len(body))
+    conn.close()
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5.0
+    clients = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+    total_sensors = int(sys.argv[3]) if len(sys.argv) > 3 else 500
+    interval_ms = float(sys.argv[4]) if len(sys.argv) > 4 else 1000
+
+    backend = SyntheticBackend(total_sensors=total_sensors)
+    backend.open()
+    index = SensorIndex(); index.ensure(backend.hardware)
+    sensors = [s for hw in backend.hardware for s in hw.iter_sensors()]
+    sampler = Sampler(backend, scheduler=PollScheduler(interval_ms, type_intervals_ms={}, adaptive=False))
+    sampler.set_targets(collect_nodes(backend.hardware), sensors, sample_now=False)
+    sampler.sample_once()
+    exporter = MetricsExporter(sampler, index.get, port=0)
+    port = exporter.start()
+    sampler.start()
+
+    updates_before, samples_before = backend.update_calls, sampler.stats()["samples"]
+    latency, counts, errors = RollingStats(size=1000000), [], []
+    deadline = time.perf_counter() + seconds
+    threads = [threading.Thread(target=scraper, args=(port, deadline, latency, counts, errors)) for _ in range(clients)]
+    for thread in threads: thread.start()
+    for thread in threads: thread.join()
+    updates, samples = backend.update_calls - updates_before, sampler.stats()["samples"] - samples_before
+
+    sampler.stop(); exporter.stop(); backend.close()
+    summary = latency.summary()
+    print(f"{len(sensors)} sensors, {clients} clients, {seconds:.1f} s, sampling every {interval_ms:.0f} ms")
+    print(f"  scrapes: {len(counts)} ({len(counts) / seconds:.0f}/s), errors: {len(errors)}, body ~{(counts[-1] if counts else 0) / 1024:.0f} KiB")
+    print(f"  scrape latency ms: p50 {summary['p50']:.2f}  p99 {summary['p99']:.2f}  max {summary['max']:.2f}")
+    print(f"  exposition renders: {exporter.renders} for {samples} snapshots")
+    print(f"  backend node updates during test: {updates} ({updates / max(samples, 1):.0f} per snapshot, none per scrape)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+# --- Stub tkinter ---
+# Just enough of tkinter/ttk for SystemStatsApp and DesktopWidget to be created
+# and for their dashboard, list view and canvas paths to run without a display.
+# Widget calls do no Tcl work; they are only counted in CALLS, so a benchmark run
+# with this module measures the Python side of a refresh plus how many widget
+# calls it would have made. install() must run before appinterface is imported.
+import sys
+import types
+from collections import Counter
+
+CALLS = Counter()  # widget method name -> calls since the last reset()
+
+
+def reset():
+    CALLS.clear()
+
+
+def __getattr__(name):
+    # Constants (tk.END, tk.LEFT, tk.GROOVE, ...) are their own names, as in tkinter.
+    if name.isupper(): return name.lower()
+    raise AttributeError(name)
+
+
+class TclError(Exception):
+    pass
+
+
+class Variable:
+    def __init__(self, master=None, value=None): self._value = value
+    def get(self): return self._value
+    def set(self, value): self._value = value
+    def trace_add(self, mode, callback): pass
+
+
+class BooleanVar(Variable):
+    def __init__(self, master=None, value=False): super().__init__(master, value)
+
+
+class StringVar(Variable):
+    def __init__(self, master=None, value=""): super().__init__(master, value)
+
+
+class Widget:
+    def __init__(self, master=None, *args, **options):
+        CALLS["create"] += 1
+        self.master = master
+        self.options = options
+
+    def config(self, **options):
+        CALLS["config"] += 1
+        self.options.update(options)
+
+    configure = config
+
+    def grid(self, **options): CALLS["grid"] += 1
+    def pack(self, **options): CALLS["pack"] += 1
+    def pack_forget(self): CALLS["pack_forget"] += 1
+    def destroy(self): CALLS["destroy"] += 1
+    def columnconfigure(self, index, **options): CALLS["columnconfigure"] += 1
+    def rowconfigure(self, index, **options): CALLS["rowconfigure"] += 1
+    def grid_size(self): return (0, 0)
+    def winfo_width(self): return 1
+    def winfo_ismapped(self): return False
+    def winfo_children(self): return []
+    def bind(self, sequence=None, func=None, add=None): pass
+    def after(self, ms, func=None, *args): return None
+    def after_idle(self, func, *args): return None
+    def update_idletasks(self): pass
+    def withdraw(self): pass
+    def create_window(self, *args, **options): pass
+    def create_line(self, *coords, **options): CALLS["create_line"] += 1; return 1
+    def create_text(self, *coords, **options): CALLS["create_text"] += 1; return 1
+    def itemconfigure(self, item, **options): CALLS["itemconfigure"] += 1
+    def delete(self, *items): CALLS["delete"] += 1
+    def bbox(self, *items): return (0, 0, 200, 20)
+    def title(self, text=None): pass
+    def geometry(self, spec=None): pass
+    def protocol(self, name=None, func=None): pass
+    def overrideredirect(self, flag=None): pass
+    def attributes(self, *args): pass
+    def coords(self, item, *coords): CALLS["coords"] += 1
+    def yview(self, *args): return (0.0, 1.0)
+    def canvasy(self, y): return float(y)
+    def winfo_y(self): return 0
+    def winfo_height(self): return 1
+
+
+class Treeview(Widget):
+    def __init__(self, master=None, **options):
+        super().__init__(master, **options)
+        self._roots = []
+
+    def insert(self, parent, index, iid=None, **options):
+        CALLS["insert"] += 1
+        if parent == "": self._roots.append(iid)
+        return iid
+
+    def delete(self, *items):
+        CALLS["delete"] += 1
+        self._roots = [iid for iid in self._roots if iid not in items]
+
+    def get_children(self, item=""): return tuple(self._roots) if item == "" else ()
+    def item(self, iid, **options): CALLS["item"] += 1
+    def move(self, iid, parent, index): CALLS["move"] += 1
+    def detach(self, *items): CALLS["detach"] += 1
+    def heading(self, column, **options): pass
+    def column(self, column, **options): pass
+
+
+class Style(Widget):
+    def theme_use(self, name=None): pass
+    def configure(self, style=None, **options): pass
+    def map(self, style, **options): pass
+
+
+class Menu(Widget):
+    def add_command(self, **options): pass
+    def add_separator(self, **options): pass
+    def add_cascade(self, **options): pass
+    def add_radiobutton(self, **options): pass
+    def add_checkbutton(self, **options): pass
+    def entryconfigure(self, index, **options): pass
+
+
+class PanedWindow(Widget):
+    def add(self, child, **options): pass
+    def forget(self, child): pass
+
+
+class Scrollbar(Widget):
+    def set(self, first, last): pass
+
+
+class Tk(Widget):
+    # Remembers the size given to geometry(), so layout code sees the window it asked for.
+    def __init__(self, *args, **options):
+        super().__init__(None, **options)
+        self._size = (1, 1)
+
+    def geometry(self, spec=None):
+        size = (spec or "").partition("+")[0]
+        if "x" in size: self._size = tuple(int(part) for part in size.split("x"))
+
+    def winfo_width(self): return self._size[0]
+    def winfo_height(self): return self._size[1]
+
+
+Toplevel = Frame = LabelFrame = Label = Button = Checkbutton = Canvas = Entry = Widget
+ttk = types.SimpleNamespace(Treeview=Treeview, Scrollbar=Scrollbar, PanedWindow=PanedWindow, Style=Style)
+filedialog = types.SimpleNamespace(asksaveasfilename=lambda **options: "")
+
+
+def install():
+    module = sys.modules[__name__]
+    sys.modules["tkinter"] = module
+    sys.modules["tkinter.ttk"] = ttk
+    sys.modules["tkinter.filedialog"] = filedialog
+    return module
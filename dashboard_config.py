@@ -0,0 +1,102 @@
+import json
+import os
+import time
+
+from remote_hosts import HOST_HARDWARE_TYPE
+from sensor_backends import DERIVED_HARDWARE_TYPE, GPU_HARDWARE_TYPES, Hardware
+
+# --- Dashboard Config & Hardware Cache ---
+# One versioned JSON file holds the user's dashboard selection (hardware and
+# sensor ids) and the last fully enumerated hardware tree. On a warm start the
+# backend only enables the hardware classes the saved dashboard needs and the
+# dashboard is restored from the file instead of being guessed from the tree.
+
+CONFIG_VERSION = 1
+CONFIG_FILE_NAME = "dashboard.json"
+KEY_SENSOR_KEYWORDS = {
+    # hardware class -> sensor type -> name keywords of the sensors shown by default
+    "Cpu": {"Temperature": ("package", "core", "tctl", "tdie"), "Fan": ("cpu fan", "cpu_fan1", "system fan", "sys_fan"), "Load": ("cpu total",)},
+    "Gpu": {"Temperature": ("core", "edge", "hot spot", "hotspot", "junction"), "Fan": ("gpu fan", "fan"), "Load": ("gpu core", "core")},
+}
+
+
+def default_config_path():
+    if os.environ.get("GLANCED_CONFIG"): return os.environ["GLANCED_CONFIG"]
+    if os.name == "nt": base = os.environ.get("APPDATA") or os.path.expanduser("~")
+    else: base = os.environ.get("XDG_CONFIG_HOME") or os.path.join(os.path.expanduser("~"), ".config")
+    return os.path.join(base, "Glanced", CONFIG_FILE_NAME)
+
+
+def serialize_hardware(hardware_items):
+    def node(hw):
+        return {"id": hw.id, "name": hw.name, "type": hw.hw_type,
+                "sensors": [[sensor.id, sensor.name, sensor.sensor_type] for sensor in hw.sensors],
+                "sub_hardware": [node(sub) for sub in hw.sub_hardware]}
+    return [node(hw) for hw in hardware_items]
+
+
+def restore_hardware(data):
+    # Handle-less Hardware/Sensor nodes: enough to lay out the UI, not to read values.
+    def node(entry, parent=None):
+        hw = Hardware(entry["id"], entry["name"], entry["type"], parent=parent)
+        for sensor_id, name, sensor_type in entry.get("sensors", ()): hw.add_sensor(sensor_id, name, sensor_type)
+        hw.sub_hardware = [node(sub, hw) for sub in entry.get("sub_hardware", ())]
+        return hw
+    return [node(entry) for entry in data]
+
+
+def load_config(path=None):
+    path = path or default_config_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f: config = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Info: Ignoring unreadable dashboard config {path}: {e}")
+        return None
+    if not isinstance(config, dict) or config.get("version") != CONFIG_VERSION:
+        print(f"Info: Ignoring dashboard config {path} (version {config.get('version') if isinstance(config, dict) else '?'}, expected {CONFIG_VERSION}).")
+        return None
+    return config
+
+
+def save_config(backend_name, dashboard, hardware, path=None):
+    # dashboard: hw_id -> {"show": bool, "sensors": [selected sensor ids]}; hardware: serialize_hardware() output
+    path = path or default_config_path()
+    config = {"version": CONFIG_VERSION, "backend": backend_name, "saved_at": time.time(),
+              "dashboard": dashboard, "hardware": hardware}
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f: json.dump(config, f, separators=(",", ":"))
+        os.replace(temp_path, path)  # never leaves a half-written config behind
+    except OSError as e:
+        print(f"Error saving dashboard config to {path}: {e}")
+        return None
+    return config
+
+
+def dashboard_hardware_types(config):
+    # Hardware types of the sections the saved dashboard shows, e.g. {"Cpu", "GpuNvidia"}.
+    types = {entry["id"]: entry["type"] for entry in config.get("hardware", ())}
+    return {types[hw_id] for hw_id, selection in config.get("dashboard", {}).items() if selection.get("show") and hw_id in types}
+
+
+def is_key_sensor(hw_item, sensor):
+    # Whether a default dashboard shows sensor in hw_item's section. A remote host's
+    # section picks the key sensors of each CPU and GPU it has; derived sensors are all shown.
+    if hw_item.hw_type == DERIVED_HARDWARE_TYPE: return True
+    hw_type = sensor.hardware.hw_type if hw_item.hw_type == HOST_HARDWARE_TYPE else hw_item.hw_type
+    keywords = KEY_SENSOR_KEYWORDS.get("Cpu" if hw_type == "Cpu" else "Gpu" if hw_type in GPU_HARDWARE_TYPES else None, {}).get(sensor.sensor_type, ())
+    name = sensor.name.lower()
+    return any(keyword in name for keyword in keywords)
+
+
+def default_dashboard(hardware_items):
+    # Dashboard selection without a saved config: CPU, host and derived sections and the first GPU, key sensors only.
+    dashboard, gpu_shown = {}, False
+    for hw in hardware_items:
+        show = hw.hw_type in ("Cpu", HOST_HARDWARE_TYPE, DERIVED_HARDWARE_TYPE) or (hw.hw_type in GPU_HARDWARE_TYPES and not gpu_shown)
+        gpu_shown |= show and hw.hw_type in GPU_HARDWARE_TYPES
+        dashboard[hw.id] = {"show": show, "sensors": [sensor.id for sensor in hw.iter_sensors() if show and is_key_sensor(hw, sensor)]}
+    return dashboard
@@ -0,0 +1,360 @@
+import ast
+import bisect
+import fnmatch
+import json
+import os
+import re
+import time
+from collections import namedtuple
+
+try:
+    import numpy as np
+    DERIVED_AVAILABLE = True
+except ImportError:
+    np = None
+    DERIVED_AVAILABLE = False
+
+from dashboard_config import default_config_path
+from sensor_backends import DERIVED_HARDWARE_TYPE, Hardware
+from sensor_format import FORMATTED_SENSOR_TYPES
+
+Binding = namedtuple("Binding", "index plan")  # what DerivedSensors is compiled against; replaced whole, never mutated
+
+# --- Derived Sensors ---
+# User-defined sensors computed from other sensors, read from derived.json next
+# to the dashboard config (GLANCED_DERIVED overrides the path). They live on one
+# "Derived Sensors" hardware node, so the dashboard, the list view, the config
+# dialogs, alerts and history treat them like any other sensor.
+#
+#   {"sensors": [
+#     {"name": "System power", "type": "Power", "expr": "[/amdcpu/0/power/0] + [/gpu-nvidia/0/power/0]"},
+#     {"name": "Hottest core", "type": "Temperature", "expr": "max([/amdcpu/0/temperature/*])"},
+#     {"name": "CPU load 30 s", "type": "Load", "expr": "ewma([/amdcpu/0/load/0], 30)"},
+#     {"id": "fan_per_degree", "name": "Fan RPM per °C", "expr": "[/lpc/nct6798d/fan/1] / [/derived/hottest_core]"}
+#   ]}
+#
+# [sensor id] reads a sensor (another derived sensor too: /derived/<id>, where
+# <id> defaults to the name in snake case). Inside sum/min/max/avg a reference
+# may be a pattern such as [/amdcpu/0/temperature/*] that expands to every
+# matching sensor. Aggregates skip missing readings; + - * / do not, so a
+# missing input makes the result N/A. ewma(x, seconds) is an exponential moving
+# average with that time constant and rate(x) the change per second. "type"
+# picks the display format (Factor, a plain number, by default).
+#
+# Every expression is compiled once per hardware tree into a graph shared by
+# all derived sensors (identical subexpressions are computed once) and ordered
+# by dependency depth. Each tick the sampler gathers the inputs into one vector
+# and runs one NumPy operation per (depth, operation) pair, however many derived
+# sensors there are, before the snapshot is published.
+
+DERIVED_FILE_NAME = "derived.json"
+DERIVED_HARDWARE_ID = "/derived"
+AGGREGATES = ("sum", "min", "max", "avg")
+FUNCTIONS = AGGREGATES + ("abs", "ewma", "rate")
+BINARY_OPERATORS = {ast.Add: "add", ast.Sub: "sub", ast.Mult: "mul", ast.Div: "div"}
+REFERENCE = re.compile(r"\[([^\[\]]+)\]")
+
+
+def default_derived_path():
+    if os.environ.get("GLANCED_DERIVED"): return os.environ["GLANCED_DERIVED"]
+    return os.path.join(os.path.dirname(default_config_path()), DERIVED_FILE_NAME)
+
+
+def load_definitions(path=None):
+    path = path or default_derived_path()
+    try:
+        with open(path, "r", encoding="utf-8") as f: data = json.load(f)
+    except FileNotFoundError:
+        return []
+    except (OSError, ValueError) as e:
+        print(f"Info: Ignoring unreadable derived sensors {path}: {e}")
+        return []
+    definitions = data.get("sensors") if isinstance(data, dict) else None
+    if not isinstance(definitions, list):
+        print(f"Info: Ignoring derived sensors {path}: expected an object with a \"sensors\" list.")
+        return []
+    return definitions
+
+
+def derived_sensor_id(definition):
+    slug = re.sub(r"[^a-z0-9]+", "_", str(definition.get("id") or definition["name"]).lower()).strip("_")
+    if not slug: raise ValueError("needs an \"id\" or \"name\" with letters or digits")
+    return f"{DERIVED_HARDWARE_ID}/{slug}"
+
+
+def parse_expression(text):
+    # -> nested tuples: ("ref", id or pattern), ("const", value), (operator, operand, ...); raises ValueError/SyntaxError.
+    references = []
+    def placeholder(match):
+        references.append(match.group(1).strip())
+        return f"_ref{len(references) - 1}"
+    tree = ast.parse(REFERENCE.sub(placeholder, text), mode="eval").body
+
+    def convert(node, in_aggregate=False):
+        if isinstance(node, ast.Name) and node.id.startswith("_ref"):
+            reference = references[int(node.id[4:])]
+            if not in_aggregate and any(char in reference for char in "*?"):
+                raise ValueError(f"pattern [{reference}] only works inside {'/'.join(AGGREGATES)}")
+            return ("ref", reference)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            return ("const", float(node.value))
+        if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.USub, ast.UAdd)):
+            operand = convert(node.operand)
+            return ("neg", operand) if isinstance(node.op, ast.USub) else operand
+        if isinstance(node, ast.BinOp) and type(node.op) in BINARY_OPERATORS:
+            return (BINARY_OPERATORS[type(node.op)], convert(node.left), convert(node.right))
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in FUNCTIONS and not node.keywords:
+            name, args = node.func.id, node.args
+            if name in AGGREGATES:
+                if not args: raise ValueError(f"{name}() needs at least one argument")
+                return (name,) + tuple(convert(arg, in_aggregate=True) for arg in args)
+            if name == "ewma":
+                if len(args) != 2 or not isinstance(args[1], ast.Constant) or not isinstance(args[1].value, (int, float)) or args[1].value <= 0:
+                    raise ValueError("ewma() takes a value and a time constant in seconds > 0")
+                return ("ewma", convert(args[0]), float(args[1].value))
+            if len(args) != 1: raise ValueError(f"{name}() takes one argument")
+            return (name, convert(args[0]))
+        raise ValueError(f"unsupported syntax: {ast.unparse(node)}")
+    return convert(tree)
+
+
+class _Step:
+    # All the nodes of one operation at one dependency depth, computed with a single NumPy call.
+    __slots__ = ("op", "out", "args", "starts", "params", "keys", "state")
+
+    def __init__(self, op, out, args, starts=None, params=None, keys=None):
+        self.op, self.out, self.args, self.starts, self.params, self.keys = op, out, args, starts, params, keys
+        self.state = None
+
+
+class DerivedPlan:
+    # The compiled graph for one set of raw sensor ids: registers hold every input, constant and
+    # intermediate value; outputs are the registers of the derived sensors.
+    def __init__(self, definitions, raw_ids, previous=None):
+        # previous: the plan this one replaces; its ewma/rate state is taken over on the first evaluate().
+        self.keys, self.children, self.memo = [], [], {}  # node index -> structural key / child indexes
+        self.outputs_by_id, self.failed = {}, {}
+        pattern_matches = {}
+        self._raw_ids, self._pattern_matches, self._definitions = sorted(raw_ids), pattern_matches, definitions
+        for sensor_id in definitions:
+            try: self._lower_output(sensor_id, ())
+            except ValueError as e: self.failed[sensor_id] = str(e)
+        self._schedule()
+        self._previous = previous
+        del self._raw_ids, self._pattern_matches, self._definitions, self.memo
+
+    # --- Lowering: expression trees -> deduplicated node graph ---
+    def _node(self, key, children=()):
+        index = self.memo.get(key)
+        if index is None:
+            index = self.memo[key] = len(self.keys)
+            self.keys.append(key); self.children.append(children)
+        return index
+
+    def _lower_output(self, sensor_id, stack):
+        if sensor_id in self.outputs_by_id: return self.outputs_by_id[sensor_id]
+        if sensor_id in self.failed: raise ValueError(f"depends on {sensor_id}, which {self.failed[sensor_id]}")
+        if sensor_id in stack: raise ValueError("refers to itself through " + " -> ".join(stack + (sensor_id,)))
+        index = self._lower(self._definitions[sensor_id], stack + (sensor_id,))
+        self.outputs_by_id[sensor_id] = index
+        return index
+
+    def _matches(self, pattern):
+        # Only the ids sharing the pattern's literal prefix are matched against it (ids are sorted once per plan).
+        matches = self._pattern_matches.get(pattern)
+        if matches is None:
+            prefix, match, ids = re.split(r"[*?]", pattern, maxsplit=1)[0], re.compile(fnmatch.translate(pattern)).match, self._raw_ids
+            matches = []
+            for position in range(bisect.bisect_left(ids, prefix), len(ids)):
+                if not ids[position].startswith(prefix): break
+                if match(ids[position]): matches.append(ids[position])
+            self._pattern_matches[pattern] = matches
+        return matches
+
+    def _lower(self, expr, stack):
+        op = expr[0]
+        if op == "ref":
+            if expr[1] in self._definitions: return self._lower_output(expr[1], stack)
+            return self._node(("input", expr[1]))
+        if op == "const": return self._node(("const", expr[1]))
+        if op in AGGREGATES:
+            children = []
+            for arg in expr[1:]:
+                if arg[0] == "ref" and any(char in arg[1] for char in "*?"):
+                    children.extend(self._node(("input", sensor_id)) for sensor_id in self._matches(arg[1]))
+                else: children.append(self._lower(arg, stack))
+            if not children: return self._node(("const", float("nan")))  # pattern matched nothing (yet)
+            if len(children) == 1: return children[0]
+            return self._node((op,) + tuple(self.keys[child] for child in children), tuple(children))
+        if op == "ewma":
+            child = self._lower(expr[1], stack)
+            return self._node(("ewma", self.keys[child], expr[2]), (child,))
+        children = tuple(self._lower(arg, stack) for arg in expr[1:])
+        return self._node((op,) + tuple(self.keys[child] for child in children), children)
+
+    # --- Scheduling: node graph -> registers and per-depth steps ---
+    def _schedule(self):
+        depth = [0] * len(self.keys)
+        for index, children in enumerate(self.children):  # children always come before their parents
+            if children: depth[index] = 1 + max(depth[child] for child in children)
+        inputs = [index for index, key in enumerate(self.keys) if key[0] == "input"]
+        constants = [index for index, key in enumerate(self.keys) if key[0] == "const"]
+        computed = sorted((index for index, key in enumerate(self.keys) if key[0] not in ("input", "const")), key=lambda index: depth[index])
+        register = {index: position for position, index in enumerate(inputs + constants + computed)}
+        self.input_ids = [self.keys[index][1] for index in inputs]
+        self.registers = np.full(len(register), np.nan)
+        self.registers[len(inputs):len(inputs) + len(constants)] = [self.keys[index][1] for index in constants]
+        self.output_ids = list(self.outputs_by_id)
+        self.output_registers = np.array([register[self.outputs_by_id[sensor_id]] for sensor_id in self.output_ids], dtype=np.int64)
+
+        groups = {}  # (depth, op) -> node indexes
+        for index in computed: groups.setdefault((depth[index], self.keys[index][0]), []).append(index)
+        self.steps = []
+        for (_, op), indexes in sorted(groups.items(), key=lambda item: item[0][0]):
+            out = np.array([register[index] for index in indexes], dtype=np.int64)
+            if op in AGGREGATES:
+                sizes = [len(self.children[index]) for index in indexes]
+                args = np.array([register[child] for index in indexes for child in self.children[index]], dtype=np.int64)
+                step = _Step(op, out, args, starts=np.concatenate(([0], np.cumsum(sizes)[:-1])).astype(np.int64))
+            else:
+                args = [np.array([register[self.children[index][position]] for index in indexes], dtype=np.int64)
+                        for position in range(len(self.children[indexes[0]]))]
+                step = _Step(op, out, args)
+            if op == "ewma": step.params = np.array([self.keys[index][2] for index in indexes])
+            if op in ("ewma", "rate"):
+                step.keys = [self.keys[index] for index in indexes]
+                rows = 1 if op == "ewma" else 4  # rate: last changed value, when it changed, interval between changes, rate shown
+                step.state = np.full((rows, len(indexes)), np.nan)
+            self.steps.append(step)
+
+        # Raw sensors each output reads, directly or through other derived sensors (for sampling targets).
+        reads = [None] * len(self.keys)
+        for index, key in enumerate(self.keys):
+            reads[index] = frozenset((key[1],)) if key[0] == "input" else frozenset().union(*(reads[child] for child in self.children[index]))
+        self.inputs_by_output = {sensor_id: reads[index] for sensor_id, index in self.outputs_by_id.items()}
+        self.last_now = None
+
+    def state_by_key(self):
+        return {key: step.state[:, column] for step in self.steps if step.keys for column, key in enumerate(step.keys)}
+
+    def _take_over_state(self):
+        # Runs on the sampler thread, which is the only one that evaluates (and so changes) the old
+        # plan's state. Plans replaced before they were ever evaluated are skipped.
+        source, self._previous = self._previous, None
+        while source is not None and source.last_now is None: source = source._previous
+        if source is None: return
+        old_state = source.state_by_key()
+        for step in self.steps:
+            for column, key in enumerate(step.keys or ()):
+                if key in old_state: step.state[:, column] = old_state[key]
+        self.last_now = source.last_now
+
+    def evaluate(self, values, now):
+        # values: sensor_id -> float | None, updated in place with every derived sensor (None when not finite).
+        if self._previous is not None: self._take_over_state()
+        reg = self.registers
+        count = len(self.input_ids)
+        if count: reg[:count] = np.array(list(map(values.get, self.input_ids)), dtype=np.float64)
+        elapsed = np.nan if self.last_now is None else now - self.last_now
+        self.last_now = now
+        with np.errstate(all="ignore"):
+            for step in self.steps:
+                op, out, args = step.op, step.out, step.args
+                if op == "add": reg[out] = reg[args[0]] + reg[args[1]]
+                elif op == "sub": reg[out] = reg[args[0]] - reg[args[1]]
+                elif op == "mul": reg[out] = reg[args[0]] * reg[args[1]]
+                elif op == "div": reg[out] = reg[args[0]] / reg[args[1]]
+                elif op == "neg": reg[out] = -reg[args[0]]
+                elif op == "abs": reg[out] = np.abs(reg[args[0]])
+                elif op == "max": reg[out] = np.fmax.reduceat(reg[args], step.starts)  # fmax/fmin skip NaN
+                elif op == "min": reg[out] = np.fmin.reduceat(reg[args], step.starts)
+                elif op in ("sum", "avg"):
+                    gathered = reg[args]
+                    present = ~np.isnan(gathered)
+                    total = np.add.reduceat(np.where(present, gathered, 0.0), step.starts)
+                    counts = np.add.reduceat(present.astype(np.float64), step.starts)
+                    reg[out] = np.where(counts > 0, total if op == "sum" else total / counts, np.nan)
+                elif op == "ewma":
+                    x, state = reg[args[0]], step.state[0]
+                    alpha = 1.0 - np.exp(-max(elapsed, 0.0) / step.params) if elapsed == elapsed else 0.0
+                    state[:] = np.where(np.isnan(state), x, np.where(np.isnan(x), state, state + alpha * (x - state)))
+                    reg[out] = state
+                else:  # rate
+                    # Readings carried over between polls of a slower node keep the last rate instead of reading as 0.
+                    x, (last, changed_at, interval, shown) = reg[args[0]], step.state
+                    since = now - changed_at
+                    changed = ~np.isnan(x) & (x != last)
+                    shown[:] = np.where(changed, (x - last) / since, np.where(since > 2.0 * interval, 0.0, shown))
+                    interval[:] = np.where(changed, since, interval)
+                    changed_at[:] = np.where(changed, now, changed_at); last[:] = np.where(changed, x, last)
+                    reg[out] = np.where(np.isnan(x), np.nan, shown)
+        results = reg[self.output_registers]
+        results[~np.isfinite(results)] = np.nan
+        values.update(zip(self.output_ids, [None if value != value else value for value in results.tolist()]))
+
+
+class DerivedSensors:
+    def __init__(self, definitions=()):
+        if not DERIVED_AVAILABLE:
+            raise RuntimeError("Derived sensors need NumPy (pip install numpy).")
+        self.node = Hardware(DERIVED_HARDWARE_ID, "Derived Sensors", DERIVED_HARDWARE_TYPE)
+        self.definitions = {}  # sensor_id -> parsed expression
+        for definition in definitions:
+            label = definition.get("name", "?") if isinstance(definition, dict) else repr(definition)
+            try:
+                sensor_id = derived_sensor_id(definition)
+                sensor_type = definition.get("type", "Factor")
+                if sensor_type not in FORMATTED_SENSOR_TYPES: raise ValueError(f"unknown type {sensor_type!r}")
+                if sensor_id in self.definitions: raise ValueError(f"{sensor_id} is defined twice")
+                self.definitions[sensor_id] = parse_expression(str(definition["expr"]))
+            except (AttributeError, KeyError, TypeError, ValueError, SyntaxError) as e:
+                print(f"Info: Skipping derived sensor {label}: {e}")
+                continue
+            self.node.add_sensor(sensor_id, str(definition.get("name", sensor_id)), sensor_type)
+        # Reference cycles and references to skipped sensors do not depend on the hardware; drop them up front.
+        failed = DerivedPlan(self.definitions, ()).failed
+        for sensor_id, reason in failed.items():
+            print(f"Info: Skipping derived sensor {sensor_id}: {reason}")
+            del self.definitions[sensor_id]
+        self.node.sensors = [sensor for sensor in self.node.sensors if sensor.id in self.definitions]
+        self.binding = Binding(None, DerivedPlan(self.definitions, ()))
+        self.last_evaluation_ms = 0.0
+
+    def __len__(self):
+        return len(self.node.sensors)
+
+    @property
+    def plan(self):
+        return self.binding.plan
+
+    def bind(self, sensor_index):
+        # Recompiles against the sensors in sensor_index (patterns expand to what is there now); ewma and
+        # rate state carries over. Tk thread: the new plan is built in full and published as one Binding
+        # (a single reference assignment, as Sampler publishes snapshots), so the sampler thread evaluates
+        # either the old plan or the new one, never a mix, and picks the new one up on its next tick.
+        node = self.node
+        raw_ids = [sensor_id for sensor_id, owner in sensor_index.owners.items() if owner is not node]
+        self.binding = Binding(sensor_index, DerivedPlan(self.definitions, raw_ids, previous=self.binding.plan))
+
+    def targets(self, hardware_items, sensors):
+        # Sampler targets with the derived node and sensors replaced by the raw sensors they read.
+        node = self.node
+        wanted = [sensor.id for sensor in sensors if sensor.hardware is node]
+        hardware_items = [hw for hw in hardware_items if hw is not node]
+        if not wanted: return hardware_items, sensors
+        sensors = [sensor for sensor in sensors if sensor.hardware is not node]
+        targeted, owners = {sensor.id for sensor in sensors}, {id(hw) for hw in hardware_items}
+        index, plan = self.binding
+        inputs_by_output, get = plan.inputs_by_output, index.get if index is not None else (lambda sensor_id: None)
+        for sensor_id in frozenset().union(*(inputs_by_output.get(derived_id, ()) for derived_id in wanted)):
+            sensor = None if sensor_id in targeted else get(sensor_id)
+            if sensor is None: continue
+            targeted.add(sensor_id); sensors.append(sensor)
+            if id(sensor.hardware) not in owners: owners.add(id(sensor.hardware)); hardware_items.append(sensor.hardware)
+        return hardware_items, sensors
+
+    def evaluate(self, values, now):
+        # Sampler thread, once per sample, before the snapshot is published.
+        started = time.perf_counter()
+        self.binding.plan.evaluate(values, now)
+        self.last_evaluation_ms = (time.perf_counter() - started) * 1000.0
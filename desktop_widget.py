@@ -0,0 +1,218 @@
+import threading
+import time
+import tkinter as tk
+
+from dashboard_config import dashboard_hardware_types, default_dashboard, load_config, restore_hardware
+from derived_sensors import DERIVED_AVAILABLE, DerivedSensors, load_definitions
+from poll_scheduler import PollScheduler
+from sampler import Sampler
+from sensor_backends import create_backend
+from sensor_format import RenderedReadings, SensorFormatter
+from sensor_index import SensorIndex
+
+# --- Desktop Widget ---
+# python desktop_widget.py: a compact, borderless, always-on-top window with the
+# sensors of the saved dashboard (picked in the full window, appinterface.py). The
+# whole widget is one Canvas: its text items are created when the dashboard is laid
+# out, and a frame only itemconfigures the values whose text changed, so a frame
+# with steady readings makes no Tk calls. None of the full window's extras are
+# loaded (menus, list view, sparklines, history, alerts, recording), and only the
+# shown hardware is sampled. Drag to move, right click or Escape to close.
+
+WIDGET_UPDATE_INTERVAL_MS = 1000 # Sampler thread cadence
+WIDGET_FRAME_INTERVAL_MS = 500 # How often the Tk side checks for a new snapshot
+WIDGET_STARTUP_POLL_MS = 50 # How often the Tk side checks whether the backend finished opening
+WIDGET_HOTPLUG_SCAN_INTERVAL_MS = 5000 # How often the sampler thread diffs the top level hardware for hot-plugged devices; 0 only follows backend notifications
+WIDGET_POSITION = (40, 40) # Top left corner on screen
+WIDGET_ALPHA = 0.9 # Window opacity, where the window manager supports it
+WIDGET_BG_COLOR = "#1E1E1E"
+WIDGET_HEADER_COLOR = "#4FC1FF"
+WIDGET_NAME_COLOR = "#A0A0A0"
+WIDGET_VALUE_COLOR = "#FFFFFF"
+WIDGET_FONT_FAMILY = "Segoe UI"
+WIDGET_FONT_SIZE = 9
+WIDGET_PADDING_PX = 8
+WIDGET_ROW_PX = 17
+WIDGET_SECTION_GAP_PX = 6
+WIDGET_VALUE_WIDTH_PX = 70 # Values are right aligned in a column this wide
+
+
+def sensor_path(hw_item, sensor):
+    # "Sub hardware / Sensor" name as listed in the dashboard config dialog.
+    names, node = [sensor.name], sensor.hardware
+    while node is not None and node is not hw_item: names.append(node.name); node = node.parent
+    return " / ".join(reversed(names))
+
+
+class DesktopWidget(tk.Tk):
+    def __init__(self, backend=None):
+        super().__init__()
+        self.backend = backend or create_backend()
+        config = load_config()
+        if config and config.get("backend") != self.backend.name: config = None
+        self.dashboard = config["dashboard"] if config else None # hw_id -> {"show": bool, "sensors": [ids]}; None shows the defaults
+        if backend is None and config: self.backend.hardware_types = dashboard_hardware_types(config)
+        self.backend_state = "loading" # loading -> ready | failed
+        self.backend_opened = False # set on the init thread once open() returned
+        self.hardware_changed = False # set by the backend's hardware_changed (e.g. a remote host connected) or a rescan
+        self.next_hotplug_scan = 0.0 # time.monotonic() of the next periodic rescan
+        self.backend.hardware_changed = self.on_backend_hardware_changed
+
+        self.sensor_index = SensorIndex()
+        self.rendered_readings = RenderedReadings(SensorFormatter())
+        backend_interval_ms = getattr(self.backend, "poll_interval_ms", None) # Replay and remote backends set their own cadence
+        if backend_interval_ms is not None: scheduler = PollScheduler(backend_interval_ms, type_intervals_ms={}, adaptive=False)
+        else: scheduler = PollScheduler(WIDGET_UPDATE_INTERVAL_MS)
+        self.sampler = Sampler(self.backend, scheduler=scheduler)
+        derived_definitions = load_definitions() # derived.json, as in the full window
+        self.derived = DerivedSensors(derived_definitions) if derived_definitions and DERIVED_AVAILABLE else None
+        if self.derived is not None and not len(self.derived): self.derived = None
+        self.sampler.derived = self.derived
+        self.layout = [] # [(hw_id, [sensor_id, ...])] as drawn
+        self.value_items = {} # sensor_id -> canvas text item of its value
+        self.shown_text = {} # sensor_id -> text currently shown by its value item
+        self.rendered_snapshot_seq = None
+        self.drag_offset = None
+
+        self.overrideredirect(True)
+        self.attributes("-topmost", True)
+        try: self.attributes("-alpha", WIDGET_ALPHA)
+        except tk.TclError: pass # not supported by this window manager
+        self.geometry(f"+{WIDGET_POSITION[0]}+{WIDGET_POSITION[1]}")
+        self.canvas = tk.Canvas(self, bg=WIDGET_BG_COLOR, highlightthickness=0, bd=0)
+        self.canvas.pack()
+        self.canvas.bind("<ButtonPress-1>", self.on_drag_start)
+        self.canvas.bind("<B1-Motion>", self.on_drag)
+        self.canvas.bind("<Button-3>", lambda event: self.exit_widget())
+        self.bind("<Escape>", lambda event: self.exit_widget())
+        self.protocol("WM_DELETE_WINDOW", self.exit_widget)
+
+        # The first frame is laid out from the cached tree (values show as pending) while the backend opens.
+        if config and config.get("hardware"): self.lay_out(restore_hardware(config["hardware"]))
+        else: self.lay_out([])
+        self.update_loop()
+        threading.Thread(target=self._open_backend, name="glanced-init", daemon=True).start()
+
+    def _open_backend(self):
+        if not self.backend.available: self.backend.open()
+        self.backend_opened = True
+
+    def on_backend_ready(self):
+        self.backend_state = "ready" if self.backend.available else "failed"
+        if self.backend.available:
+            self.lay_out(self.backend.hardware)
+            self.sampler.start()
+        else:
+            self.lay_out([])
+
+    def on_backend_hardware_changed(self):
+        # Runs on the backend's or the sampler thread; update_loop lays the widget out again on its next frame.
+        self.hardware_changed = True
+
+    def schedule_hotplug_scan(self):
+        # The widget only has a handful of items, so a hot-plug change simply lays it out again.
+        now = time.monotonic()
+        if not self.backend.hardware_dirty and (not WIDGET_HOTPLUG_SCAN_INTERVAL_MS or now < self.next_hotplug_scan): return
+        self.next_hotplug_scan = now + WIDGET_HOTPLUG_SCAN_INTERVAL_MS / 1000.0
+        self.backend.hardware_dirty = False
+        self.sampler.request_rescan(self.on_backend_hardware_changed)
+
+    def sections(self, hardware_items):
+        # [(hw_item, [Sensor, ...])] of the dashboard sections with at least one shown sensor, in tree order.
+        dashboard = self.dashboard if self.dashboard is not None else default_dashboard(hardware_items)
+        sections = []
+        for hw_item in hardware_items:
+            selection = dashboard.get(hw_item.id)
+            if not selection or not selection.get("show"): continue
+            wanted = set(selection.get("sensors", ()))
+            sensors = [sensor for sensor in hw_item.iter_sensors() if sensor.id in wanted]
+            if sensors: sections.append((hw_item, sensors))
+        return sections
+
+    def lay_out(self, hardware_items):
+        # Recreates every canvas item; only called when the hardware tree changes, never per frame.
+        if hardware_items and self.derived is not None: hardware_items = hardware_items + [self.derived.node]
+        if self.sensor_index.ensure(hardware_items) and self.derived is not None: self.derived.bind(self.sensor_index)
+        sections = self.sections(hardware_items)
+        canvas, font = self.canvas, (WIDGET_FONT_FAMILY, WIDGET_FONT_SIZE)
+        canvas.delete("all")
+        self.value_items.clear(); self.shown_text.clear()
+        self.layout = [(hw_item.id, [sensor.id for sensor in sensors]) for hw_item, sensors in sections]
+        self.rendered_snapshot_seq = None
+        y = WIDGET_PADDING_PX
+        if not sections:
+            message = {"loading": "Loading sensors...", "failed": f"{self.backend.name} N/A"}.get(self.backend_state, "No sensors on the dashboard")
+            canvas.create_text(WIDGET_PADDING_PX, y, text=message, anchor="nw", fill=WIDGET_NAME_COLOR, font=font)
+            y += WIDGET_ROW_PX
+        rows = [] # (y, sensor_id) of each value, placed once the name column width is known
+        for index, (hw_item, sensors) in enumerate(sections):
+            if index: y += WIDGET_SECTION_GAP_PX
+            canvas.create_text(WIDGET_PADDING_PX, y, text=hw_item.name, anchor="nw", fill=WIDGET_HEADER_COLOR, font=font + ("bold",))
+            y += WIDGET_ROW_PX
+            for sensor in sensors:
+                canvas.create_text(WIDGET_PADDING_PX, y, text=sensor_path(hw_item, sensor), anchor="nw", fill=WIDGET_NAME_COLOR, font=font)
+                rows.append((y, sensor.id))
+                y += WIDGET_ROW_PX
+        names = canvas.bbox("all")
+        right = (names[2] if names else WIDGET_PADDING_PX) + WIDGET_VALUE_WIDTH_PX
+        pending = "..." if self.backend_state == "loading" else "N/A"
+        for row_y, sensor_id in rows:
+            self.value_items[sensor_id] = canvas.create_text(right, row_y, text=pending, anchor="ne", fill=WIDGET_VALUE_COLOR, font=font + ("bold",))
+            self.shown_text[sensor_id] = pending
+        canvas.configure(width=right + WIDGET_PADDING_PX, height=y + WIDGET_PADDING_PX // 2)
+        if self.backend_state == "ready": self.update_sampling_targets()
+
+    def update_sampling_targets(self):
+        hardware_items, sensors = {}, []
+        for hw_id, sensor_ids in self.layout:
+            for sensor_id in sensor_ids:
+                sensor = self.sensor_index.get(sensor_id)
+                if sensor is None: continue
+                owner = self.sensor_index.owners[sensor_id]
+                sensors.append(sensor); hardware_items.setdefault(owner.id, owner)
+        self.sampler.set_targets(list(hardware_items.values()), sensors)
+
+    def refresh(self):
+        # Returns (values shown, items reconfigured) for the latest snapshot, or (0, 0) if it was already drawn.
+        snapshot = self.sampler.latest
+        if snapshot is None or snapshot.seq == self.rendered_snapshot_seq: return 0, 0
+        self.rendered_snapshot_seq = snapshot.seq
+        values, reading, get_sensor, shown = snapshot.values, self.rendered_readings.reading, self.sensor_index.get, self.shown_text
+        itemconfigure, configured = self.canvas.itemconfigure, 0
+        for sensor_id, item in self.value_items.items():
+            text = reading(get_sensor(sensor_id), values.get(sensor_id))
+            if shown[sensor_id] == text: continue # usually the very same string object from rendered_readings
+            shown[sensor_id] = text
+            itemconfigure(item, text=text)
+            configured += 1
+        return len(self.value_items), configured
+
+    def update_loop(self):
+        try:
+            if self.backend_state == "loading":
+                if not self.backend_opened: self.after(WIDGET_STARTUP_POLL_MS, self.update_loop); return
+                self.on_backend_ready()
+            if self.hardware_changed:
+                self.hardware_changed = False; self.lay_out(self.backend.hardware)
+            if self.backend_state == "ready": self.schedule_hotplug_scan()
+            self.refresh()
+        except Exception as e:
+            print(f"Error during widget update: {e}")
+        self.after(WIDGET_FRAME_INTERVAL_MS, self.update_loop)
+
+    def on_drag_start(self, event):
+        self.drag_offset = (event.x_root - self.winfo_x(), event.y_root - self.winfo_y())
+
+    def on_drag(self, event):
+        if self.drag_offset is None: return
+        self.geometry(f"+{event.x_root - self.drag_offset[0]}+{event.y_root - self.drag_offset[1]}")
+
+    def exit_widget(self):
+        self.sampler.stop()
+        if self.backend_state != "loading": self.backend.close()
+        self.destroy()
+
+
+if __name__ == "__main__":
+    widget = DesktopWidget()
+    widget.mainloop()
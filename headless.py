@@ -0,0 +1,342 @@
+import argparse
+import contextlib
+import csv
+import json
+import os
+import select
+import socket
+import sys
+import time
+
+from sensor_backends import BACKENDS, LAZY_BACKENDS, create_backend
+from sensor_index import SensorIndex
+from sampler import Sampler
+from poll_scheduler import PollScheduler
+from sensor_format import DATA_UNITS, DEFAULT_FORMATTER, TEMPERATURE_UNITS, THROUGHPUT_UNITS, SensorFormatter
+from metrics_exporter import DEFAULT_METRICS_HOST, MetricsExporter
+from alerts import ALERTS_AVAILABLE, AlertEngine, default_alerts_path, load_rules
+from recording import RECORDING_AVAILABLE, REPLAY_SPEEDS, RecordingWriter
+from dashboard_config import serialize_hardware
+from remote_hosts import agent_hello, agent_sample, parse_address
+
+# --- Headless Collector ---
+# Polls a sensor backend without any GUI (tkinter is never imported) and streams
+# samples to stdout, a JSONL/CSV file, a local socket or remote aggregators (--agent). Memory stays bounded:
+# only the latest snapshot is kept and slow socket clients are dropped.
+
+SOCKET_CLIENT_BUFFER_LIMIT = 1 << 20  # bytes queued per client before it is dropped
+
+
+def select_sensors(backend, hardware_types=None, sensor_types=None, match=None):
+    selected = []
+    for hw_item in backend.hardware:
+        if hardware_types and hw_item.hw_type not in hardware_types: continue
+        for sensor in hw_item.iter_sensors():
+            if sensor_types and sensor.sensor_type not in sensor_types: continue
+            if match and match.lower() not in f"{sensor.id} {sensor.name}".lower(): continue
+            selected.append(sensor)
+    return selected
+
+
+def sensor_metadata(sensors):
+    return {sensor.id: {"name": sensor.name, "type": sensor.sensor_type,
+                        "hardware": sensor.hardware.name if sensor.hardware else "",
+                        "hardware_type": sensor.hardware.hw_type if sensor.hardware else ""} for sensor in sensors}
+
+
+class TextWriter:
+    def __init__(self, stream, sensors, formatter=DEFAULT_FORMATTER):
+        self.stream = stream
+        self.sensors = sensors
+        self.formatter = formatter
+
+    def write(self, snapshot):
+        stamp = time.strftime('%H:%M:%S', time.localtime(snapshot.timestamp))
+        values, reading = snapshot.values, self.formatter.reading
+        lines = [f"{stamp}  {sensor.hardware.name} / {sensor.name}: {reading(sensor, values.get(sensor.id))}" for sensor in self.sensors]
+        self.stream.write("\n".join(lines) + "\n")
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+class JsonlWriter:
+    def __init__(self, stream, sensors):
+        self.stream = stream
+        self.sensor_ids = [sensor.id for sensor in sensors]
+        self.stream.write(json.dumps({"type": "meta", "sensors": sensor_metadata(sensors)}) + "\n")
+
+    def encode(self, snapshot):
+        values = snapshot.values
+        return json.dumps({"type": "sample", "seq": snapshot.seq, "ts": snapshot.timestamp,
+                           "values": {sensor_id: values.get(sensor_id) for sensor_id in self.sensor_ids}}) + "\n"
+
+    def write(self, snapshot):
+        self.stream.write(self.encode(snapshot))
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+class CsvWriter:
+    def __init__(self, stream, sensors):
+        self.stream = stream
+        self.sensor_ids = [sensor.id for sensor in sensors]
+        self.writer = csv.writer(stream)
+        self.writer.writerow(["timestamp", "seq"] + self.sensor_ids)
+
+    def write(self, snapshot):
+        values = snapshot.values
+        self.writer.writerow([f"{snapshot.timestamp:.3f}", snapshot.seq] +
+                             ["" if values.get(sensor_id) is None else f"{values.get(sensor_id):.6g}" for sensor_id in self.sensor_ids])
+        self.stream.flush()
+
+    def close(self):
+        pass
+
+
+class SocketWriter:
+    # Serves JSONL to any number of local clients ("unix:/path" or "host:port").
+    # Writes never block the sampling loop; a client that falls more than
+    # SOCKET_CLIENT_BUFFER_LIMIT bytes behind is disconnected.
+    def __init__(self, address, sensors):
+        self.jsonl = JsonlWriter(_NullStream(), sensors)
+        self.meta_line = (json.dumps({"type": "meta", "sensors": sensor_metadata(sensors)}) + "\n").encode()
+        self.unix_path = None
+        if address.startswith("unix:"):
+            self.unix_path = address[5:]
+            if os.path.exists(self.unix_path): os.unlink(self.unix_path)
+            self.server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            self.server.bind(self.unix_path)
+        else:
+            host, _, port = address.rpartition(":")
+            self.server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+            self.server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+            self.server.bind((host or "127.0.0.1", int(port)))
+        self.server.listen(16)
+        self.server.setblocking(False)
+        self.clients = {}  # socket -> pending bytes
+
+    def _accept(self):
+        while True:
+            try: client, _ = self.server.accept()
+            except (BlockingIOError, InterruptedError): return
+            client.setblocking(False)
+            self.clients[client] = bytearray(self.meta_line)
+
+    def _drop(self, client):
+        self.clients.pop(client, None)
+        try: client.close()
+        except OSError: pass
+
+    def flush(self):
+        writable = [client for client, pending in self.clients.items() if pending]
+        if not writable: return
+        _, ready, _ = select.select([], writable, [], 0)
+        for client in ready:
+            pending = self.clients[client]
+            try:
+                sent = client.send(pending)
+                del pending[:sent]
+            except (BlockingIOError, InterruptedError):
+                pass
+            except OSError:
+                self._drop(client)
+
+    def write(self, snapshot):
+        self._accept()
+        line = self.jsonl.encode(snapshot).encode()
+        for client, pending in list(self.clients.items()):
+            if len(pending) + len(line) > SOCKET_CLIENT_BUFFER_LIMIT: self._drop(client); continue
+            pending += line
+        self.flush()
+
+    def close(self):
+        for client in list(self.clients): self._drop(client)
+        self.server.close()
+        if self.unix_path and os.path.exists(self.unix_path): os.unlink(self.unix_path)
+
+
+class AgentWriter(SocketWriter):
+    # Serves this machine to RemoteBackend aggregators (see remote_hosts.py): a hello with the
+    # hardware tree and one full sample per connection, then only the readings that changed.
+    def __init__(self, address, sensors, hardware, backend_name):
+        host, port = parse_address(address)
+        super().__init__(f"{host}:{port}", sensors)
+        self.sensor_ids = [sensor.id for sensor in sensors]
+        self.meta_line = agent_hello(socket.gethostname(), backend_name, hardware).encode()
+        self.last_values = {}
+
+    def write(self, snapshot):
+        values = snapshot.values
+        changed = {sensor_id: values.get(sensor_id) for sensor_id in self.sensor_ids if values.get(sensor_id) != self.last_values.get(sensor_id)}
+        self.last_values = {sensor_id: values.get(sensor_id) for sensor_id in self.sensor_ids}
+        delta = agent_sample("delta", snapshot.seq, snapshot.timestamp, changed).encode()
+        for client, pending in list(self.clients.items()):
+            if len(pending) + len(delta) > SOCKET_CLIENT_BUFFER_LIMIT: self._drop(client); continue
+            pending += delta
+        # Clients accepted now start from this sample in full.
+        known = set(self.clients)
+        self._accept()
+        full = agent_sample("sample", snapshot.seq, snapshot.timestamp, self.last_values).encode()
+        for client in set(self.clients) - known: self.clients[client] += full
+        self.flush()
+
+
+class AlertWriter:
+    # Evaluates alert rules on every sample; alert log lines go to stderr, away from the sample stream.
+    def __init__(self, engine):
+        self.engine = engine
+
+    def write(self, snapshot):
+        with contextlib.redirect_stdout(sys.stderr): self.engine.evaluate(snapshot.values, snapshot.timestamp)
+
+    def close(self):
+        pass
+
+
+class _NullStream:
+    def write(self, data): pass
+    def flush(self): pass
+
+
+WRITERS = {"text": TextWriter, "jsonl": JsonlWriter, "csv": CsvWriter}
+
+
+def run_collector(sampler, writers, samples=None, duration=None):
+    # Drives the sampler on the calling thread; returns (samples written, elapsed seconds).
+    written, last_seq = 0, None
+    started = time.perf_counter()
+    deadline = started + duration if duration else None
+    while (samples is None or written < samples) and (deadline is None or time.perf_counter() < deadline):
+        delay = sampler.scheduler.next_due() - time.monotonic()
+        if delay > 0: time.sleep(delay if deadline is None else min(delay, max(0.0, deadline - time.perf_counter())))
+        snapshot = sampler.sample_once()
+        if snapshot is None or snapshot.seq == last_seq: continue
+        last_seq = snapshot.seq
+        for writer in writers: writer.write(snapshot)
+        written += 1
+    return written, time.perf_counter() - started
+
+
+def build_arg_parser():
+    parser = argparse.ArgumentParser(description="Glanced headless collector: poll sensors without a GUI.")
+    parser.add_argument("--backend", choices=sorted(BACKENDS) + sorted(LAZY_BACKENDS), help="sensor backend (default: platform / GLANCED_BACKEND)")
+    parser.add_argument("--replay", metavar="FILE", help="play a recording back instead of reading hardware (implies --backend replay)")
+    parser.add_argument("--replay-speed", default="1x", help=f"replay speed: {', '.join(REPLAY_SPEEDS)} or a factor")
+    parser.add_argument("--synthetic-sensors", type=int, default=512, help="sensor count for the synthetic backend")
+    parser.add_argument("--hosts", help="comma-separated agent addresses to aggregate (implies --backend remote; default GLANCED_HOSTS)")
+    parser.add_argument("--interval-ms", type=float, help="sampling interval; 0 samples as fast as possible (default 2000, or the recording's cadence when replaying)")
+    parser.add_argument("--fixed", action="store_true", help="update every node every interval (no per-type rates or back-off)")
+    parser.add_argument("--samples", type=int, help="stop after N samples")
+    parser.add_argument("--duration", type=float, help="stop after this many seconds")
+    parser.add_argument("--format", choices=sorted(WRITERS), default="text", help="output format for --output")
+    parser.add_argument("--output", default="-", help="output file, '-' for stdout, 'none' to disable")
+    parser.add_argument("--temperature-unit", choices=TEMPERATURE_UNITS, default="C", help="temperature unit for text output")
+    parser.add_argument("--data-units", choices=DATA_UNITS, default="decimal", help="GB/MB/KB (decimal) or GiB/MiB/KiB (binary) for text output")
+    parser.add_argument("--throughput-units", choices=THROUGHPUT_UNITS, default="auto", help="auto-scale throughput or show raw B/s in text output")
+    parser.add_argument("--listen", help="also serve JSONL on a local socket: unix:/path or host:port")
+    parser.add_argument("--agent", metavar="[HOST:]PORT", help="serve the selected sensors to remote Glanced windows (default host 127.0.0.1; 0.0.0.0 for all interfaces)")
+    parser.add_argument("--prometheus", metavar="[HOST:]PORT", help="serve Prometheus metrics at http://HOST:PORT/metrics (default host 127.0.0.1)")
+    parser.add_argument("--record", metavar="FILE", help="also record the selected sensors to a .glrec file (see recording.py)")
+    parser.add_argument("--alerts", nargs="?", const="", metavar="FILE", help="evaluate alert rules (default file: GLANCED_ALERTS or alerts.json next to the dashboard config)")
+    parser.add_argument("--hardware-type", action="append", help="only these hardware types (repeatable)")
+    parser.add_argument("--sensor-type", action="append", help="only these sensor types (repeatable)")
+    parser.add_argument("--match", help="only sensors whose id or name contains this text")
+    parser.add_argument("--list", action="store_true", help="list the selected sensors and exit")
+    return parser
+
+
+def create_collector_backend(args):
+    if args.replay: return create_backend("replay", path=args.replay, speed=args.replay_speed)
+    if args.backend == "replay": return create_backend("replay", speed=args.replay_speed)
+    if args.hosts or args.backend == "remote": return create_backend("remote", hosts=args.hosts)
+    options = {"total_sensors": args.synthetic_sensors} if (args.backend or os.environ.get("GLANCED_BACKEND")) == "synthetic" else {}
+    return create_backend(args.backend, **options)
+
+
+def main(argv=None):
+    args = build_arg_parser().parse_args(argv)
+    backend = create_collector_backend(args)
+    # Backends report progress with print(); keep stdout clean for the sample stream.
+    with contextlib.redirect_stdout(sys.stderr): opened = backend.open()
+    if not opened:
+        print(f"Error: {backend.name} backend is not available.", file=sys.stderr)
+        return 1
+    sensors = select_sensors(backend, args.hardware_type, args.sensor_type, args.match)
+    if args.list:
+        for sensor in sensors: print(f"{sensor.id}\t{sensor.hardware.name}\t{sensor.name}\t{sensor.sensor_type}")
+        with contextlib.redirect_stdout(sys.stderr): backend.close()
+        return 0
+
+    if args.record and not RECORDING_AVAILABLE:
+        print("Error: --record needs NumPy (pip install numpy).", file=sys.stderr)
+        return 1
+    index = SensorIndex(); index.ensure(backend.hardware)
+    engine = None
+    if args.alerts is not None:
+        if not ALERTS_AVAILABLE:
+            print("Error: --alerts needs NumPy (pip install numpy).", file=sys.stderr)
+            return 1
+        with contextlib.redirect_stdout(sys.stderr): engine = AlertEngine(load_rules(args.alerts or default_alerts_path()))
+        # Rule sensors are sampled even when the filters leave them out of the output.
+        selected = {sensor.id for sensor in sensors}
+        targets = sensors + [index.get(sensor_id) for sensor_id in engine.sensor_ids if sensor_id in index and sensor_id not in selected]
+    else:
+        targets = sensors
+    samples, duration = args.samples, args.duration
+    backend_interval_ms = getattr(backend, "poll_interval_ms", None)
+    if backend_interval_ms is not None:
+        # Replayed and remote readings come at the backend's own cadence, which every node follows.
+        interval_ms = backend_interval_ms if args.interval_ms is None else args.interval_ms
+        scheduler = PollScheduler(interval_ms, type_intervals_ms={}, adaptive=False)
+        if getattr(backend, "recording", None) is not None and samples is None and duration is None:
+            # Without a limit a replay stops at the end of the recording.
+            if backend.speed is None: samples = backend.recording.rows
+            else: duration = (backend.recording.end - backend.recording.start) / backend.speed + interval_ms / 1000.0
+    else:
+        interval_ms = 2000 if args.interval_ms is None else args.interval_ms
+        scheduler = PollScheduler(interval_ms, type_intervals_ms={} if args.fixed else None, adaptive=not args.fixed)
+    sampler = Sampler(backend, scheduler=scheduler)
+    sampler.set_targets(index.select(sensor.id for sensor in targets), targets, sample_now=False)
+
+    writers, stream = [], None
+    if args.output != "none":
+        stream = sys.stdout if args.output == "-" else open(args.output, "w", newline="" if args.format == "csv" else None, encoding="utf-8")
+        if args.format == "text":
+            writers.append(TextWriter(stream, sensors, SensorFormatter(args.temperature_unit, args.data_units, args.throughput_units)))
+        else:
+            writers.append(WRITERS[args.format](stream, sensors))
+    if args.listen: writers.append(SocketWriter(args.listen, sensors))
+    if args.agent: writers.append(AgentWriter(args.agent, sensors, serialize_hardware(backend.hardware), backend.name))
+    if engine is not None: writers.append(AlertWriter(engine))
+    if args.record: writers.append(RecordingWriter(args.record, sensors, serialize_hardware(backend.hardware), backend.name))
+    exporter = None
+    if args.prometheus:
+        host, _, port = args.prometheus.rpartition(":")
+        exporter = MetricsExporter(sampler, index.get, host=host or DEFAULT_METRICS_HOST, port=int(port))
+        with contextlib.redirect_stdout(sys.stderr): exporter.start()
+
+    written, started = 0, time.perf_counter()
+    try:
+        written, _ = run_collector(sampler, writers, samples, duration)
+    except KeyboardInterrupt:
+        pass
+    except BrokenPipeError:
+        # Reader went away (e.g. piped into head); silence the final stdout flush.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+    finally:
+        if exporter is not None: exporter.stop()
+        for writer in writers: writer.close()
+        if stream is not None and stream is not sys.stdout: stream.close()
+        with contextlib.redirect_stdout(sys.stderr): backend.close()
+    elapsed = time.perf_counter() - started
+    if elapsed > 0:
+        print(f"Info: {written} samples of {len(sensors)} sensors in {elapsed:.2f} s ({written / elapsed:.1f} samples/s).", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
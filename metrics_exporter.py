@@ -0,0 +1,138 @@
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from sensor_format import REPORTED_DATA_BYTES
+
+# --- Prometheus Metrics Exporter ---
+# Serves the sampler's latest snapshot in the Prometheus text format. A scrape
+# never touches the backend: the exposition body is rendered at most once per
+# snapshot (on the first scrape after a tick) and the same bytes are returned
+# to every later scrape until the sampler publishes again.
+
+DEFAULT_METRICS_HOST = "127.0.0.1"
+DEFAULT_METRICS_PORT = 9183
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+METRIC_NAMES = {
+    # sensor type -> (metric name, help text)
+    "Temperature": ("glanced_temperature_celsius", "Temperature in degrees Celsius."),
+    "Fan": ("glanced_fan_rpm", "Fan speed in revolutions per minute."),
+    "Load": ("glanced_load_percent", "Load in percent."),
+    "Power": ("glanced_power_watts", "Power draw in watts."),
+    "Voltage": ("glanced_voltage_volts", "Voltage in volts."),
+    "Current": ("glanced_current_amperes", "Current in amperes."),
+    "Clock": ("glanced_clock_megahertz", "Clock speed in megahertz."),
+    "Control": ("glanced_control_percent", "Fan/pump control duty in percent."),
+    "Level": ("glanced_level_percent", "Level in percent."),
+    "Factor": ("glanced_factor_ratio", "Dimensionless factor."),
+    "Data": ("glanced_data_bytes", "Data amount in bytes."),
+    "SmallData": ("glanced_small_data_bytes", "Data amount in bytes."),
+    "Throughput": ("glanced_throughput_bytes_per_second", "Throughput in bytes per second."),
+}
+GENERIC_METRIC = ("glanced_sensor_value", "Sensor reading in the sensor's native unit.")
+METRIC_SCALES = REPORTED_DATA_BYTES  # sensor type -> factor from the backend's unit to the metric's (data comes in GiB/MiB)
+
+
+def _escape_label(value):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+class MetricsExporter:
+    def __init__(self, sampler, sensor_lookup, host=DEFAULT_METRICS_HOST, port=DEFAULT_METRICS_PORT):
+        # sensor_lookup: sensor_id -> Sensor (e.g. SensorIndex.get); unknown ids are skipped.
+        self.sampler = sampler
+        self.sensor_lookup = sensor_lookup
+        self.host = host
+        self.port = port
+        self.scrapes = 0
+        self.renders = 0
+        self._series_prefix = {}          # sensor_id -> (metric name, 'name{labels} ', scale)
+        self._cache = (None, b"")         # (snapshot seq, exposition bytes), swapped as one tuple
+        self._render_lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def _prefix(self, sensor_id):
+        prefix = self._series_prefix.get(sensor_id)
+        if prefix is None:
+            sensor = self.sensor_lookup(sensor_id)
+            if sensor is None: return None
+            metric, _ = METRIC_NAMES.get(sensor.sensor_type, GENERIC_METRIC)
+            hw = sensor.hardware
+            labels = (f'hardware="{_escape_label(hw.name if hw else "")}",hardware_type="{_escape_label(hw.hw_type if hw else "")}",'
+                      f'sensor_type="{_escape_label(sensor.sensor_type)}",sensor="{_escape_label(sensor.name)}",sensor_id="{_escape_label(sensor_id)}"')
+            prefix = self._series_prefix[sensor_id] = (metric, f"{metric}{{{labels}}} ", METRIC_SCALES.get(sensor.sensor_type, 1))
+        return prefix
+
+    def render(self, snapshot):
+        by_metric = {}
+        for sensor_id, value in snapshot.values.items():
+            if value is None: continue
+            prefix = self._prefix(sensor_id)
+            if prefix is None: continue
+            by_metric.setdefault(prefix[0], []).append(f"{prefix[1]}{value * prefix[2]!r}")
+        lines = []
+        for metric, help_text in list(METRIC_NAMES.values()) + [GENERIC_METRIC]:
+            series = by_metric.get(metric)
+            if not series: continue
+            lines.append(f"# HELP {metric} {help_text}")
+            lines.append(f"# TYPE {metric} gauge")
+            lines.extend(series)
+        lines.append("# HELP glanced_sample_timestamp_seconds Unix time of the exported snapshot.")
+        lines.append("# TYPE glanced_sample_timestamp_seconds gauge")
+        lines.append(f"glanced_sample_timestamp_seconds {snapshot.timestamp!r}")
+        lines.append("# HELP glanced_sample_duration_seconds Time spent updating hardware for the exported snapshot.")
+        lines.append("# TYPE glanced_sample_duration_seconds gauge")
+        lines.append(f"glanced_sample_duration_seconds {snapshot.duration!r}")
+        self.renders += 1
+        return ("\n".join(lines) + "\n").encode("utf-8")
+
+    def exposition(self):
+        self.scrapes += 1
+        snapshot = self.sampler.latest
+        if snapshot is None: return b""
+        cached = self._cache
+        if cached[0] == snapshot.seq: return cached[1]
+        with self._render_lock:
+            cached = self._cache
+            if cached[0] != snapshot.seq:
+                cached = self._cache = (snapshot.seq, self.render(snapshot))
+        return cached[1]
+
+    def start(self):
+        exporter = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"   # keep-alive for high scrape rates
+
+            def do_GET(self):
+                if self.path.split("?", 1)[0] == "/metrics":
+                    self._reply(200, CONTENT_TYPE, exporter.exposition())
+                elif self.path == "/":
+                    self._reply(200, "text/html; charset=utf-8", b'<html><body><a href="/metrics">Glanced metrics</a></body></html>')
+                else:
+                    self._reply(404, "text/plain; charset=utf-8", b"Not found\n")
+
+            def _reply(self, status, content_type, body):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer((self.host, self.port), Handler)
+        self._server.daemon_threads = True
+        self.port = self._server.server_address[1]
+        self._thread = threading.Thread(target=self._server.serve_forever, name="glanced-metrics", daemon=True)
+        self._thread.start()
+        print(f"Info: Prometheus metrics at http://{self.host}:{self.port}/metrics")
+        return self.port
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
@@ -0,0 +1,133 @@
+import time
+
+# --- Adaptive Poll Scheduler ---
+# Decides which hardware nodes the sampler updates on each wake-up. Every node
+# starts at the interval configured for its hardware type (or the fastest
+# per-sensor override among its sensors), backs off while its readings stay
+# within tolerance and snaps back to the base interval as soon as one moves.
+
+# Hardware types not listed here use the scheduler's default interval.
+POLL_INTERVALS_MS = {
+    "Motherboard": 3000, "SuperIO": 3000, "Cooler": 3000, "Psu": 3000,
+    "Battery": 5000, "EmbeddedController": 5000, "Storage": 10000,
+}
+SENSOR_TOLERANCES = {
+    "Temperature": 0.5, "Fan": 20.0, "Load": 1.0, "Clock": 25.0, "Power": 0.5, "Voltage": 0.005,
+    "Current": 0.05, "Control": 1.0, "Level": 0.5, "Factor": 0.01, "Data": 0.01, "SmallData": 1.0,
+    "Throughput": 1024.0,
+}
+BACKGROUND_INTERVAL_MS = 10000  # floor for nodes whose readings nobody is looking at (e.g. dashboard sections scrolled away)
+STABLE_SAMPLES_BEFORE_BACKOFF = 5
+BACKOFF_FACTOR = 2.0
+MAX_BACKOFF_MULTIPLIER = 8.0
+
+
+class NodeSchedule:
+    __slots__ = ("hw", "sensors", "base", "interval", "next_due", "reference", "stable_count", "calls", "since")
+
+    def __init__(self, hw, sensors, base, now):
+        self.hw = hw
+        self.sensors = sensors
+        self.base = base
+        self.interval = base
+        self.next_due = 0.0   # due immediately
+        self.reference = {}
+        self.stable_count = 0
+        self.calls = 0
+        self.since = now
+
+
+class PollScheduler:
+    def __init__(self, default_interval_ms=2000, type_intervals_ms=None, sensor_intervals_ms=None, adaptive=True,
+                 stable_samples=STABLE_SAMPLES_BEFORE_BACKOFF, tolerances=None, background_interval_ms=BACKGROUND_INTERVAL_MS):
+        self.default_interval = default_interval_ms / 1000.0
+        self.type_intervals_ms = dict(POLL_INTERVALS_MS if type_intervals_ms is None else type_intervals_ms)
+        self.sensor_intervals_ms = dict(sensor_intervals_ms or {})
+        self.adaptive = adaptive
+        self.stable_samples = stable_samples
+        self.tolerances = dict(SENSOR_TOLERANCES if tolerances is None else tolerances)
+        self.background_interval = background_interval_ms / 1000.0
+        self.schedules = {}   # hw_id -> NodeSchedule; replaced wholesale, never mutated in place
+        self.sensors = ()
+        self.background = frozenset()
+        self.version = 0
+
+    def base_interval(self, hw, sensors):
+        interval_ms = self.type_intervals_ms.get(hw.hw_type, self.default_interval * 1000.0)
+        overrides = [self.sensor_intervals_ms[s.id] for s in sensors if s.id in self.sensor_intervals_ms]
+        if overrides: interval_ms = min(overrides)
+        return interval_ms / 1000.0
+
+    def set_targets(self, hardware_items, sensors, background=()):
+        # background: ids of nodes polled no faster than background_interval. A node moved to the
+        # foreground is due at once; one moved to the background keeps its next due time.
+        hardware_items, sensors, background = tuple(hardware_items), tuple(sensors), frozenset(background)
+        if (tuple(s.hw for s in self.schedules.values()) == hardware_items and self.sensors == sensors
+                and self.background == background):
+            return False
+        owned = {hw.id: [] for hw in hardware_items}
+        for sensor in sensors:
+            if sensor.hardware is not None and sensor.hardware.id in owned: owned[sensor.hardware.id].append(sensor)
+        now, schedules = time.monotonic(), {}
+        for hw in hardware_items:
+            previous = self.schedules.get(hw.id)
+            node_sensors = tuple(owned[hw.id])
+            base = self.base_interval(hw, node_sensors)
+            if hw.id in background: base = max(base, self.background_interval)
+            if previous is not None and previous.hw is hw and previous.sensors == node_sensors:
+                if previous.base == base:
+                    schedules[hw.id] = previous
+                    continue
+                schedule = schedules[hw.id] = NodeSchedule(hw, node_sensors, base, previous.since)
+                schedule.calls, schedule.reference = previous.calls, previous.reference
+                if base > previous.base: schedule.next_due = previous.next_due
+            else:
+                schedules[hw.id] = NodeSchedule(hw, node_sensors, base, now)
+        self.schedules, self.sensors, self.background = schedules, sensors, background
+        self.version += 1
+        return True
+
+    def next_due(self):
+        schedules = self.schedules
+        if not schedules: return time.monotonic() + self.default_interval
+        return min(schedule.next_due for schedule in schedules.values())
+
+    def due(self, now):
+        return [schedule for schedule in self.schedules.values() if schedule.next_due <= now]
+
+    def observe(self, schedule, values, now):
+        # Called after the node was updated; values holds the fresh readings.
+        schedule.calls += 1
+        if self.adaptive:
+            changed = not schedule.reference
+            for sensor in schedule.sensors:
+                value, reference = values.get(sensor.id), schedule.reference.get(sensor.id)
+                if value is None or reference is None:
+                    if value is not reference: changed = True
+                elif abs(value - reference) > self.tolerances.get(sensor.sensor_type, 0.0):
+                    changed = True
+            if changed:
+                schedule.reference = {sensor.id: values.get(sensor.id) for sensor in schedule.sensors}
+                schedule.stable_count = 0
+                schedule.interval = schedule.base
+            else:
+                schedule.stable_count += 1
+                if schedule.stable_count >= self.stable_samples:
+                    schedule.stable_count = 0
+                    schedule.interval = min(schedule.interval * BACKOFF_FACTOR, schedule.base * MAX_BACKOFF_MULTIPLIER)
+        schedule.next_due = now + schedule.interval
+
+    def stats(self, now=None):
+        # "Saved" is measured against updating every node every default interval,
+        # which is what the single global UPDATE_INTERVAL_MS used to do. A zero default
+        # interval (replay at max speed) has no such baseline, so nothing counts as saved.
+        now = time.monotonic() if now is None else now
+        calls = baseline = elapsed = 0.0
+        for schedule in self.schedules.values():
+            node_elapsed = max(0.0, now - schedule.since)
+            calls += schedule.calls
+            baseline += node_elapsed / self.default_interval + 1 if self.default_interval else schedule.calls
+            elapsed = max(elapsed, node_elapsed)
+        saved_per_minute = (baseline - calls) * 60.0 / elapsed if self.default_interval and elapsed >= self.default_interval else 0.0
+        return {"update_calls": int(calls), "baseline_calls": int(baseline), "saved_per_minute": saved_per_minute,
+                "intervals_ms": {hw_id: schedule.interval * 1000.0 for hw_id, schedule in self.schedules.items()}}
@@ -0,0 +1,105 @@
+import json
+import threading
+import time
+from collections import deque
+
+# --- Tick Profiler ---
+# Optional per-tick instrumentation. The sampler records how long each phase of
+# a sample took (hardware updates, reads, listeners) with Update() time per
+# hardware node; the UI records how long it spent formatting and configuring
+# widgets for the snapshot it rendered. Both halves are joined on the snapshot
+# seq. Instrumented code only checks `profiler is None`, so turning profiling
+# off costs one attribute test per tick.
+
+PROFILE_TICKS = 300  # ticks kept for the overlay and JSON export
+PROFILE_FORMAT_VERSION = 1
+
+
+def _percentiles(values):
+    if not values: return {"count": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+    ordered = sorted(values)
+    pick = lambda pct: ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+    return {"count": len(ordered), "mean": sum(ordered) / len(ordered), "p50": pick(50), "p99": pick(99), "max": ordered[-1]}
+
+
+class TickProfiler:
+    def __init__(self, size=PROFILE_TICKS):
+        self.size = size
+        self.ticks = deque(maxlen=size)   # oldest first; {"seq", "timestamp", "sample", "frame"}
+        self._pending = {}                # seq -> tick still waiting for its frame
+        self.errors = deque(maxlen=50)    # (timestamp, where, message) of exceptions swallowed by the loops
+        self._lock = threading.Lock()
+        self.started = time.time()
+
+    def record_sample(self, seq, timestamp, phases_ms, update_ms, sensors_read):
+        # Sampler thread. update_ms: hw_id -> Update() milliseconds for the nodes updated this tick.
+        tick = {"seq": seq, "timestamp": timestamp, "frame": None,
+                "sample": {"phases_ms": phases_ms, "update_ms": update_ms, "hardware_updated": len(update_ms), "sensors_read": sensors_read}}
+        with self._lock:
+            self.ticks.append(tick)
+            self._pending[seq] = tick
+            while len(self._pending) > self.size: self._pending.pop(next(iter(self._pending)))
+
+    def record_frame(self, seq, phases_ms, **counts):
+        # Tk thread. Snapshots the UI never rendered (it only shows the newest) keep frame None.
+        frame = dict(counts, phases_ms=phases_ms)
+        with self._lock:
+            while self._pending and next(iter(self._pending)) < seq: self._pending.pop(next(iter(self._pending)))
+            tick = self._pending.pop(seq, None)
+            if tick is None:
+                tick = {"seq": seq, "timestamp": time.time(), "sample": None, "frame": None}
+                self.ticks.append(tick)
+            tick["frame"] = frame
+
+    def record_error(self, where, error):
+        self.errors.append((time.time(), where, f"{type(error).__name__}: {error}"))
+
+    def latest(self):
+        with self._lock:
+            for tick in reversed(self.ticks):
+                if tick["frame"] is not None: return tick
+            return self.ticks[-1] if self.ticks else None
+
+    def summary(self):
+        with self._lock: ticks = list(self.ticks)
+        sample_phases, frame_phases, hardware, counts = {}, {}, {}, {}
+        for tick in ticks:
+            sample, frame = tick["sample"], tick["frame"]
+            if sample:
+                for phase, ms in sample["phases_ms"].items(): sample_phases.setdefault(phase, []).append(ms)
+                for hw_id, ms in sample["update_ms"].items(): hardware.setdefault(hw_id, []).append(ms)
+                counts.setdefault("sensors_read", []).append(sample["sensors_read"])
+            if frame:
+                for phase, ms in frame["phases_ms"].items(): frame_phases.setdefault(phase, []).append(ms)
+                for name, value in frame.items():
+                    if name != "phases_ms": counts.setdefault(name, []).append(value)
+        return {"ticks": len(ticks),
+                "sample_phases_ms": {phase: _percentiles(values) for phase, values in sample_phases.items()},
+                "frame_phases_ms": {phase: _percentiles(values) for phase, values in frame_phases.items()},
+                "update_ms_by_hardware": {hw_id: _percentiles(values) for hw_id, values in hardware.items()},
+                "counts": {name: _percentiles(values) for name, values in counts.items()}}
+
+    def status_text(self):
+        # One-line breakdown of the latest rendered tick for the status bar.
+        tick = self.latest()
+        if tick is None: return "Profile: waiting for data"
+        parts = []
+        if tick["sample"]:
+            sample = tick["sample"]
+            parts.append(f"update {sample['phases_ms'].get('update', 0.0):.1f} ms over {sample['hardware_updated']} hw")
+            if sample["update_ms"]:
+                slowest = max(sample["update_ms"].items(), key=lambda item: item[1])
+                parts.append(f"slowest {slowest[0]} {slowest[1]:.1f} ms")
+            parts.append(f"read {sample['phases_ms'].get('read', 0.0):.1f} ms/{sample['sensors_read']} sensors")
+        if tick["frame"]:
+            frame = tick["frame"]
+            parts.append(" ".join(f"{phase} {ms:.1f} ms" for phase, ms in frame["phases_ms"].items()))
+            parts.append(f"{frame.get('widget_configs', 0)}/{frame.get('labels', 0)} labels configured")
+        return "Profile: " + ", ".join(parts)
+
+    def export_json(self, path):
+        with self._lock: ticks = list(self.ticks)
+        data = {"version": PROFILE_FORMAT_VERSION, "started": self.started, "exported_at": time.time(),
+                "summary": self.summary(), "errors": list(self.errors), "ticks": ticks}
+        with open(path, "w", encoding="utf-8") as f: json.dump(data, f, indent=1)
+        return path
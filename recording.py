@@ -0,0 +1,263 @@
+import json
+import os
+import threading
+import time
+
+try:
+    import numpy as np
+    RECORDING_AVAILABLE = True
+except ImportError:
+    np = None
+    RECORDING_AVAILABLE = False
+
+from dashboard_config import restore_hardware
+from sensor_backends import SensorBackend
+
+# --- Session Recording & Replay ---
+# A recording (.glrec) is a JSON header followed by fixed-size chunks:
+#
+#   magic "GLREC\0", uint16 format version, uint32 header length, header JSON
+#   (sensor id dictionary, hardware tree, chunk_rows), zero padding to 4 KiB
+#   chunk 0 .. n: uint32 rows, uint32 reserved, float64 first/last timestamp,
+#                 float64 timestamps[chunk_rows], float32 values[sensors][chunk_rows]
+#
+# Each chunk stores one column per sensor, so a sensor's readings inside a chunk
+# are contiguous. Chunks never move once written; the writer rewrites only the
+# chunk it is filling. Recording maps the whole file with np.memmap, finds chunks
+# by their first/last timestamps and hands out views without copying.
+
+RECORDING_MAGIC = b"GLREC\0"
+RECORDING_VERSION = 1
+RECORDING_EXTENSION = ".glrec"
+DEFAULT_CHUNK_ROWS = 1024     # samples per chunk (~34 minutes at the 2 s sampler cadence)
+HEADER_ALIGNMENT = 4096
+FLUSH_INTERVAL_S = 5.0        # the chunk being filled is rewritten at least this often
+REPLAY_SPEEDS = {"1x": 1.0, "10x": 10.0, "max": None}
+
+
+def _chunk_dtype(sensor_count, chunk_rows):
+    return np.dtype([("rows", "<u4"), ("reserved", "<u4"), ("first", "<f8"), ("last", "<f8"),
+                     ("times", "<f8", (chunk_rows,)), ("values", "<f4", (sensor_count, chunk_rows))])
+
+
+class RecordingWriter:
+    # Appends snapshots to a new recording. Also usable as a headless collector writer.
+    def __init__(self, path, sensors, hardware, backend_name, chunk_rows=DEFAULT_CHUNK_ROWS):
+        # sensors: Sensor objects whose readings are recorded; hardware: serialize_hardware() output
+        if not RECORDING_AVAILABLE:
+            raise RuntimeError("Recording needs NumPy (pip install numpy).")
+        self.path = path
+        self.sensor_ids = [sensor.id for sensor in sensors]
+        self.chunk_rows = chunk_rows
+        self.dtype = _chunk_dtype(len(self.sensor_ids), chunk_rows)
+        header = json.dumps({"version": RECORDING_VERSION, "backend": backend_name, "created": time.time(), "chunk_rows": chunk_rows,
+                             "sensors": [[sensor.id, sensor.name, sensor.sensor_type] for sensor in sensors],
+                             "hardware": hardware}, separators=(",", ":")).encode("utf-8")
+        prefix = RECORDING_MAGIC + RECORDING_VERSION.to_bytes(2, "little") + len(header).to_bytes(4, "little") + header
+        self.data_start = -(-len(prefix) // HEADER_ALIGNMENT) * HEADER_ALIGNMENT
+        self.file = open(path, "wb")
+        self.file.write(prefix + bytes(self.data_start - len(prefix)))
+        self.chunk = np.zeros(1, dtype=self.dtype)[0]
+        self.chunk["values"] = np.nan
+        self.chunk_index = 0
+        self.rows_written = 0
+        self.closed = False
+        self._dirty = False
+        self._last_flush = time.monotonic()
+        self._lock = threading.Lock()
+
+    def append(self, timestamp, values):
+        # values: sensor_id -> float | None; sensors not in the recording are ignored.
+        self.append_column(timestamp, np.array(list(map(values.get, self.sensor_ids)), dtype=np.float32))
+
+    def append_column(self, timestamp, column):
+        with self._lock:
+            if self.closed: return
+            chunk, row = self.chunk, int(self.chunk["rows"])
+            chunk["times"][row] = timestamp
+            chunk["values"][:, row] = column
+            if row == 0: chunk["first"] = timestamp
+            chunk["last"] = timestamp
+            chunk["rows"] = row + 1
+            self.rows_written += 1
+            self._dirty = True
+            if row + 1 == self.chunk_rows:
+                self._write_chunk()
+                self.chunk_index += 1
+                chunk["rows"] = 0; chunk["times"] = 0.0; chunk["values"] = np.nan
+                self._dirty = False
+            elif time.monotonic() - self._last_flush >= FLUSH_INTERVAL_S:
+                self._write_chunk()
+
+    def write(self, snapshot):
+        self.append(snapshot.timestamp, snapshot.values)
+
+    def _write_chunk(self):
+        self.file.seek(self.data_start + self.chunk_index * self.dtype.itemsize)
+        self.file.write(self.chunk.tobytes())
+        self.file.flush()
+        self._last_flush = time.monotonic()
+
+    def flush(self):
+        with self._lock:
+            if self._dirty and not self.closed: self._write_chunk()
+
+    def close(self):
+        with self._lock:
+            if self.closed: return
+            if self._dirty: self._write_chunk()
+            self.closed = True
+            self.file.close()
+
+    def nbytes(self):
+        return self.data_start + (self.chunk_index + (1 if self._dirty else 0)) * self.dtype.itemsize
+
+
+class Recording:
+    # Read-only, memory-mapped view of a recording file.
+    def __init__(self, path):
+        if not RECORDING_AVAILABLE:
+            raise RuntimeError("Replaying recordings needs NumPy (pip install numpy).")
+        self.path = path
+        with open(path, "rb") as f:
+            prefix = f.read(len(RECORDING_MAGIC) + 6)
+            if len(prefix) < len(RECORDING_MAGIC) + 6 or not prefix.startswith(RECORDING_MAGIC):
+                raise ValueError(f"{path} is not a Glanced recording")
+            version = int.from_bytes(prefix[len(RECORDING_MAGIC):len(RECORDING_MAGIC) + 2], "little")
+            if version != RECORDING_VERSION: raise ValueError(f"{path} has recording format {version}, expected {RECORDING_VERSION}")
+            header_length = int.from_bytes(prefix[len(RECORDING_MAGIC) + 2:], "little")
+            self.header = json.loads(f.read(header_length).decode("utf-8"))
+        self.sensor_ids = [entry[0] for entry in self.header["sensors"]]
+        self.columns = {sensor_id: column for column, sensor_id in enumerate(self.sensor_ids)}
+        self.chunk_rows = self.header["chunk_rows"]
+        dtype = _chunk_dtype(len(self.sensor_ids), self.chunk_rows)
+        data_start = -(-(len(RECORDING_MAGIC) + 6 + header_length) // HEADER_ALIGNMENT) * HEADER_ALIGNMENT
+        chunk_count = max(0, (os.path.getsize(path) - data_start) // dtype.itemsize)
+        self.chunks = np.memmap(path, dtype=dtype, mode="r", offset=data_start, shape=(chunk_count,)) if chunk_count else np.zeros(0, dtype=dtype)
+        # Small per-chunk index arrays; everything else stays in the page cache until touched.
+        self.chunk_rows_used = np.array(self.chunks["rows"], dtype=np.int64)
+        self.chunk_first = np.array(self.chunks["first"])
+        self.chunk_last = np.array(self.chunks["last"])
+        self.row_offsets = np.concatenate(([0], np.cumsum(self.chunk_rows_used)))
+        self.rows = int(self.row_offsets[-1])
+        self.start = float(self.chunk_first[0]) if self.rows else 0.0
+        self.end = float(self.chunk_last[self.chunk_rows_used > 0][-1]) if self.rows else 0.0
+
+    def locate(self, row):
+        # Global row -> (chunk, row inside the chunk).
+        chunk = int(np.searchsorted(self.row_offsets, row, side="right")) - 1
+        return chunk, row - int(self.row_offsets[chunk])
+
+    def row_at(self, timestamp):
+        # Last row recorded at or before timestamp (0 before the start).
+        chunk = max(0, int(np.searchsorted(self.chunk_first, timestamp, side="right")) - 1)
+        times = self.chunks["times"][chunk, :self.chunk_rows_used[chunk]]
+        return int(self.row_offsets[chunk]) + max(0, int(np.searchsorted(times, timestamp, side="right")) - 1)
+
+    def timestamp(self, row):
+        chunk, offset = self.locate(row)
+        return float(self.chunks["times"][chunk, offset])
+
+    def column(self, row):
+        # Readings of every sensor at `row` (a strided view into the mapping), NaN where missing.
+        chunk, offset = self.locate(row)
+        return self.chunks["values"][chunk, :, offset]
+
+    def window(self, start, end):
+        # Yields (timestamps, values[sensor, row]) views for each chunk overlapping [start, end].
+        first = max(0, int(np.searchsorted(self.chunk_last, start, side="left")))
+        last = int(np.searchsorted(self.chunk_first, end, side="right"))
+        for chunk in range(first, last):
+            times = self.chunks["times"][chunk, :self.chunk_rows_used[chunk]]
+            lo, hi = np.searchsorted(times, start, side="left"), np.searchsorted(times, end, side="right")
+            if hi > lo: yield times[lo:hi], self.chunks["values"][chunk, :, lo:hi]
+
+    def series(self, sensor_id, start=None, end=None):
+        # (timestamps, values) of one sensor; a view when the range lies in one chunk.
+        column = self.columns.get(sensor_id)
+        if column is None: return np.empty(0), np.empty(0, dtype=np.float32)
+        start = self.start if start is None else start
+        end = self.end if end is None else end
+        parts = [(times, values[column]) for times, values in self.window(start, end)]
+        if not parts: return np.empty(0), np.empty(0, dtype=np.float32)
+        if len(parts) == 1: return parts[0]
+        return np.concatenate([times for times, _ in parts]), np.concatenate([values for _, values in parts])
+
+    def close(self):
+        mapping = getattr(self.chunks, "_mmap", None)
+        self.chunks = None
+        if mapping is not None: mapping.close()
+
+
+class ReplayBackend(SensorBackend):
+    # Plays a recording back as if it were live hardware. Reports the recorded backend's name so
+    # the dashboard saved for those sensor ids applies. speed: 1.0, 10.0, ... or None for as fast
+    # as the sampler asks (one recorded sample per update).
+    name = "Replay"
+    saves_config = False  # the recorded backend's dashboard is shown, but a replay never writes over it
+
+    def __init__(self, path=None, speed=None):
+        super().__init__()
+        self.path = path or os.environ.get("GLANCED_REPLAY")
+        if speed is None: speed = os.environ.get("GLANCED_REPLAY_SPEED", "1x")
+        self.speed = REPLAY_SPEEDS[speed] if speed in REPLAY_SPEEDS else float(speed) if speed is not None else None
+        self.row = 0
+        self.poll_interval_ms = None  # sampler cadence matching the recording at this speed; 0 = as fast as possible
+        self._current = None
+        self._clock = None  # (monotonic at replay start, recording time at replay start)
+        # The header is read up front so the name (and with it the saved dashboard) is known before open().
+        self.recording, self.error = None, None
+        try:
+            if not self.path: raise ValueError("no recording given (set GLANCED_REPLAY)")
+            self.recording = Recording(self.path)
+            if not self.recording.rows: raise ValueError(f"{self.path} holds no samples")
+            self.name = self.recording.header.get("backend", self.name)
+            intervals = np.diff(self.recording.chunks["times"][0, :self.recording.chunk_rows_used[0]])
+            interval_ms = float(np.median(intervals)) * 1000.0 if len(intervals) else 1000.0
+            self.poll_interval_ms = 0 if self.speed is None else interval_ms / self.speed
+        except (OSError, ValueError, RuntimeError) as e:
+            self.error = e
+
+    def open(self):
+        if self.error is not None:
+            print(f"Error opening recording: {self.error}")
+            self.available = False
+            return False
+        self.hardware = restore_hardware(self.recording.header["hardware"])
+        self._current = self.recording.column(0)
+        self.available = True
+        print(f"Info: Replaying {self.path} ({self.recording.rows} samples, {self.recording.end - self.recording.start:.0f} s) "
+              f"at {'max' if self.speed is None else f'{self.speed:g}x'} speed.")
+        return True
+
+    def _advance(self):
+        # The first update shows the first recorded sample and starts the replay clock.
+        if self._clock is None: self._clock = (time.monotonic(), self.recording.start)
+        elif self.speed is None: self.row = min(self.row + 1, self.recording.rows - 1)
+        if self.speed is not None:
+            started, origin = self._clock
+            self.row = self.recording.row_at(origin + (time.monotonic() - started) * self.speed)
+        self._current = self.recording.column(self.row)
+        self.finished = self.row == self.recording.rows - 1
+
+    def update_many(self, hardware_items, timings=None):
+        # The whole recorded column is current after one advance, whatever the nodes asked for.
+        self._advance()
+        if timings is not None: timings.update((hw.id, 0.0) for hw in hardware_items)
+
+    def read(self, sensor):
+        column = self.recording.columns.get(sensor.id)
+        if column is None: return None
+        value = float(self._current[column])
+        return None if value != value else value
+
+    def close(self):
+        if self.recording is not None: self.recording.close()
+        self.recording = None
+        self.available = False
+
+    def status_text(self):
+        if not self.available: return "Replay N/A"
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(self.recording.timestamp(self.row)))
+        speed = "max" if self.speed is None else f"{self.speed:g}x"
+        return f"Replay {stamp} ({speed}, {100.0 * (self.row + 1) / self.recording.rows:.0f}%)"
@@ -0,0 +1,186 @@
+import asyncio
+import json
+import os
+import threading
+
+from sensor_backends import Hardware, SensorBackend
+
+# --- Remote Hosts ---
+# An agent (python headless.py --agent [HOST:]PORT) serves newline-delimited JSON to
+# any number of aggregators:
+#
+#   {"type": "hello", "host": "<hostname>", "backend": "<name>", "hardware": <serialize_hardware() tree>}
+#   {"type": "sample", "seq": n, "ts": t, "values": {sensor_id: value, ...}}   every sensor, once per connection
+#   {"type": "delta", "seq": n, "ts": t, "values": {sensor_id: value, ...}}    only readings changed since the last sample
+#
+# RemoteBackend is the aggregator: one asyncio loop on a background thread follows
+# every agent and reconnects to the ones that drop. Each agent becomes a top level
+# "Host" node holding its hardware tree, with ids prefixed by "/host/<address>" so
+# identical machines do not collide. Incoming readings are merged into one dict per
+# host and read() is a lookup into it, so the sampler and the UI only pay for the
+# sensors on screen, however many hosts are followed.
+
+HOST_HARDWARE_TYPE = "Host"
+DEFAULT_AGENT_PORT = 9184
+REMOTE_POLL_INTERVAL_MS = 1000  # how often the sampler picks up the readings pushed since the last sample
+CONNECT_WAIT_S = 3.0            # open() waits this long for the agents' first hello
+RECONNECT_DELAYS_S = (1, 2, 5, 10, 30)
+MAX_MESSAGE_BYTES = 64 << 20    # a hello carries the agent's whole hardware tree
+
+
+def parse_address(address, default_port=DEFAULT_AGENT_PORT):
+    # "host", "host:port" or ":port" -> (host, port)
+    host, separator, port = address.rpartition(":")
+    if not separator: return address, default_port
+    return host or "127.0.0.1", int(port)
+
+
+def agent_hello(hostname, backend_name, hardware):
+    # hardware: serialize_hardware() output
+    return json.dumps({"type": "hello", "host": hostname, "backend": backend_name, "hardware": hardware}, separators=(",", ":")) + "\n"
+
+
+def agent_sample(kind, seq, timestamp, values):
+    return json.dumps({"type": kind, "seq": seq, "ts": timestamp, "values": values}, separators=(",", ":")) + "\n"
+
+
+class RemoteHost:
+    def __init__(self, address):
+        self.address = address
+        self.host, self.port = parse_address(address)
+        self.hostname = self.host
+        self.node = None         # top level Host node, replaced whenever the agent sends a different tree
+        self.tree = None         # hardware tree of the last hello
+        self.values = {}         # agent sensor id -> latest reading; shared with the sensors' handles
+        self.connected = False
+        self.settled = False     # first connection attempt finished (hello received or failed)
+        self.last_seen = None
+        self.messages = 0
+        self.bytes_received = 0
+
+
+class RemoteBackend(SensorBackend):
+    name = "Remote"
+
+    def __init__(self, hosts=None):
+        # hosts: ["host:port", ...] or a comma-separated string; GLANCED_HOSTS by default.
+        super().__init__()
+        hosts = os.environ.get("GLANCED_HOSTS", "") if hosts is None else hosts
+        if isinstance(hosts, str): hosts = [address.strip() for address in hosts.split(",") if address.strip()]
+        self.hosts = [RemoteHost(address) for address in dict.fromkeys(hosts)]
+        self.poll_interval_ms = REMOTE_POLL_INTERVAL_MS  # readings are pushed; there is nothing to poll faster
+        self._loop = None
+        self._thread = None
+        self._task = None
+        self._closing = False
+        self._settled = threading.Event()
+
+    def open(self):
+        if not self.hosts:
+            print("Error: No remote hosts given (set GLANCED_HOSTS=host:port,...).")
+            return False
+        try:
+            for host in self.hosts: parse_address(host.address)
+        except ValueError as e:
+            print(f"Error: Bad remote host address: {e}")
+            return False
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._run, name="glanced-remote", daemon=True)
+        self._thread.start()
+        self._settled.wait(CONNECT_WAIT_S)
+        self.available = True
+        connected = sum(host.connected for host in self.hosts)
+        print(f"Info: Following {len(self.hosts)} remote hosts ({connected} connected).")
+        return True
+
+    def _run(self):
+        asyncio.set_event_loop(self._loop)
+        self._task = self._loop.create_task(self._follow_all())
+        try: self._loop.run_until_complete(self._task)
+        except asyncio.CancelledError: pass
+        finally: self._loop.close()
+
+    async def _follow_all(self):
+        await asyncio.gather(*(self._follow(host) for host in self.hosts))
+
+    async def _follow(self, host):
+        failures = 0
+        while True:
+            try:
+                reader, writer = await asyncio.open_connection(host.host, host.port, limit=MAX_MESSAGE_BYTES)
+            except OSError as e:
+                if not failures: print(f"Info: Remote host {host.address} unreachable: {e}")
+                self._settle(host)
+                await asyncio.sleep(RECONNECT_DELAYS_S[min(failures, len(RECONNECT_DELAYS_S) - 1)])
+                failures += 1
+                continue
+            failures = 0
+            try:
+                while True:
+                    line = await reader.readline()
+                    if not line: break
+                    host.messages += 1; host.bytes_received += len(line)
+                    self._handle(host, json.loads(line))
+            except (OSError, ValueError) as e:
+                print(f"Info: Dropping remote host {host.address}: {e}")
+            finally:
+                writer.close()
+                if host.connected and not self._closing: print(f"Info: Remote host {host.address} disconnected.")
+                host.connected = False
+                host.values.clear()  # readings show as unavailable until the agent is back
+                self._settle(host)
+            await asyncio.sleep(RECONNECT_DELAYS_S[0])
+
+    def _handle(self, host, message):
+        kind = message.get("type")
+        if kind in ("delta", "sample"):
+            host.values.update(message["values"])
+            host.last_seen = message.get("ts")
+        elif kind == "hello":
+            host.hostname = message.get("host") or host.host
+            host.connected = True
+            tree = message.get("hardware") or []
+            if tree != host.tree or host.node is None:
+                host.tree = tree
+                host.node = self._host_node(host)
+                self.hardware = [other.node for other in self.hosts if other.node is not None]
+                if self.available and self.hardware_changed: self.hardware_changed()
+            self._settle(host)
+
+    def _host_node(self, host):
+        # A new node (never a mutated one) so SensorIndex and the scheduler see the change by identity.
+        prefix = f"/host/{host.address}"
+        name = host.hostname if host.hostname == host.host else f"{host.hostname} ({host.address})"
+        node = Hardware(prefix, name, HOST_HARDWARE_TYPE)
+        def restore(entry, parent):
+            hw = Hardware(prefix + entry["id"], entry["name"], entry["type"], parent=parent)
+            for sensor_id, sensor_name, sensor_type in entry.get("sensors", ()):
+                hw.add_sensor(prefix + sensor_id, sensor_name, sensor_type, handle=(host.values, sensor_id))
+            hw.sub_hardware = [restore(sub, hw) for sub in entry.get("sub_hardware", ())]
+            return hw
+        node.sub_hardware = [restore(entry, node) for entry in host.tree]
+        return node
+
+    def _settle(self, host):
+        host.settled = True
+        if all(other.settled for other in self.hosts): self._settled.set()
+
+    def update_many(self, hardware_items, timings=None):
+        # Nothing to update: agents push their readings as they sample.
+        if timings is not None: timings.update((hw.id, 0.0) for hw in hardware_items)
+
+    def read(self, sensor):
+        values, sensor_id = sensor.handle
+        return values.get(sensor_id)
+
+    def close(self):
+        self._closing = True
+        if self._loop is not None and self._task is not None and not self._loop.is_closed():
+            try: self._loop.call_soon_threadsafe(self._task.cancel)
+            except RuntimeError: pass  # loop already finished
+        if self._thread is not None: self._thread.join(timeout=2.0)
+        self.available = False
+
+    def status_text(self):
+        if not self.available: return "Remote N/A"
+        return f"Remote {sum(host.connected for host in self.hosts)}/{len(self.hosts)} hosts"
@@ -0,0 +1,178 @@
+import threading
+import time
+from collections import deque, namedtuple
+
+from poll_scheduler import PollScheduler
+
+# --- Background Sampler ---
+# Runs backend updates on a dedicated thread and publishes immutable Snapshot
+# objects. Publishing is a single reference assignment (atomic under the GIL),
+# so the Tk thread reads `sampler.latest` without taking any lock and never
+# waits on a slow Update(). Which nodes get updated on each wake-up is decided
+# by the PollScheduler; readings of nodes that were not due carry over.
+
+MIN_SAMPLE_WAIT_S = 0.005  # shortest sleep between samples on the sampler thread
+
+Snapshot = namedtuple("Snapshot", "seq timestamp values duration")  # values: sensor_id -> float | None, never mutated
+
+
+class RollingStats:
+    def __init__(self, size=120):
+        self.samples = deque(maxlen=size)
+
+    def add(self, value):
+        self.samples.append(value)
+
+    def mean(self):
+        return sum(self.samples) / len(self.samples) if self.samples else 0.0
+
+    def percentile(self, pct):
+        if not self.samples: return 0.0
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+    def summary(self):
+        if not self.samples: return {"count": 0, "mean": 0.0, "p50": 0.0, "p99": 0.0, "max": 0.0}
+        return {"count": len(self.samples), "mean": sum(self.samples) / len(self.samples),
+                "p50": self.percentile(50), "p99": self.percentile(99), "max": max(self.samples)}
+
+
+class Sampler:
+    def __init__(self, backend, interval_ms=2000, scheduler=None):
+        self.backend = backend
+        self.scheduler = scheduler or PollScheduler(interval_ms)
+        self.latest = None
+        self.jitter_ms = RollingStats()     # |actual sample start - scheduled start|
+        self.duration_ms = RollingStats()   # update + read time per sample
+        self.listeners = []                 # called on the sampler thread with every new snapshot
+        self.profiler = None                # profiler.TickProfiler while profiling is on
+        self.derived = None                 # derived_sensors.DerivedSensors, evaluated into every snapshot before it is published
+        self._seq = 0
+        self._values_version = None
+        self._tasks = deque()               # callables run on the sampler thread between samples
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread = None
+
+    def set_targets(self, hardware_items, sensors, sample_now=True, background=()):
+        # New nodes are due immediately; waking the thread gets them sampled now.
+        # background: node ids to poll at the scheduler's slower background rate.
+        # Derived sensors are swapped for the sensors they read.
+        if self.derived is not None: hardware_items, sensors = self.derived.targets(hardware_items, sensors)
+        if not self.scheduler.set_targets(hardware_items, sensors, background): return False
+        if sample_now: self.request_sample()
+        return True
+
+    def add_listener(self, callback):
+        self.listeners.append(callback)
+
+    def call_soon(self, task):
+        # Runs task() on the sampler thread, serialized with backend updates (e.g. deferred enumeration).
+        self._tasks.append(task)
+        self._wake.set()
+
+    def request_sample(self):
+        self._wake.set()
+
+    def request_rescan(self, changed):
+        # Runs backend.rescan() on the sampler thread, between samples. Nodes that disappeared are dropped
+        # from the targets right away, so their native handles are never used again; changed() is then
+        # called on the sampler thread for the UI to catch up.
+        def rescan():
+            previous = self.backend.hardware
+            if not self.backend.rescan(): return
+            current = {id(hw) for hw in self.backend.hardware}
+            self.drop_hardware([hw for hw in previous if id(hw) not in current])
+            changed()
+        self.call_soon(rescan)
+
+    def drop_hardware(self, hardware_items):
+        # Stops updating these top level nodes and reading their sensors (sub hardware included).
+        if not hardware_items: return False
+        gone = {id(hw) for hw in hardware_items}
+        def top(hw):
+            while hw.parent is not None: hw = hw.parent
+            return hw
+        scheduler = self.scheduler
+        kept = [schedule.hw for schedule in scheduler.schedules.values() if id(top(schedule.hw)) not in gone]
+        sensors = [sensor for sensor in scheduler.sensors if sensor.hardware is None or id(top(sensor.hardware)) not in gone]
+        return scheduler.set_targets(kept, sensors, scheduler.background)
+
+    def start(self):
+        if self._thread is not None: return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="glanced-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout=2.0):
+        self._stop.set(); self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def sample_once(self, now=None):
+        scheduler = self.scheduler
+        now = time.monotonic() if now is None else now
+        due = scheduler.due(now)
+        previous = self.latest
+        if not due and previous is not None and self._values_version == scheduler.version: return previous
+        profiler = self.profiler
+        started = time.perf_counter()
+        try:
+            update_ms = None if profiler is None else {}
+            self.backend.update_many([schedule.hw for schedule in due], update_ms)
+            if profiler is not None: updated = time.perf_counter()
+            if previous is not None and self._values_version == scheduler.version:
+                values = dict(previous.values)
+            else:
+                old_values = previous.values if previous is not None else {}
+                values = {sensor.id: old_values.get(sensor.id) for sensor in scheduler.sensors}
+            read = self.backend.read
+            for schedule in due:
+                for sensor in schedule.sensors: values[sensor.id] = read(sensor)
+                scheduler.observe(schedule, values, now)
+            if profiler is not None: read_done = time.perf_counter()
+            if self.derived is not None: self.derived.evaluate(values, now)
+        except Exception as e:
+            print(f"Error during sensor sampling: {e}")
+            if profiler is not None: profiler.record_error("sample", e)
+            return previous
+        finished = time.perf_counter()
+        duration = finished - started
+        self._seq += 1
+        self._values_version = scheduler.version
+        snapshot = Snapshot(self._seq, time.time(), values, duration)
+        self.duration_ms.add(duration * 1000.0)
+        self.latest = snapshot
+        for callback in self.listeners:
+            try: callback(snapshot)
+            except Exception as e: print(f"Error in snapshot listener {getattr(callback, '__name__', callback)}: {e}")
+        if profiler is not None:
+            phases_ms = {"update": (updated - started) * 1000.0, "read": (read_done - updated) * 1000.0,
+                         "listeners": (time.perf_counter() - finished) * 1000.0}
+            if self.derived is not None: phases_ms["derived"] = (finished - read_done) * 1000.0
+            profiler.record_sample(snapshot.seq, snapshot.timestamp, phases_ms, update_ms, sum(len(schedule.sensors) for schedule in due))
+        return snapshot
+
+    def _run(self):
+        while not self._stop.is_set():
+            next_due = self.scheduler.next_due()
+            # Even when a sample is overdue (a max-speed replay always is) the thread sleeps briefly, so
+            # the Tk thread and the listeners get the GIL. A finished source has nothing new to sample:
+            # only a task or stop() wakes the thread then.
+            timeout = None if self.backend.finished else max(MIN_SAMPLE_WAIT_S, next_due - time.monotonic())
+            woken = self._wake.wait(timeout)
+            if self._stop.is_set(): break
+            self._wake.clear()
+            while self._tasks:
+                task = self._tasks.popleft()
+                try: task()
+                except Exception as e: print(f"Error in sampler task {getattr(task, '__name__', task)}: {e}")
+            if self.backend.finished: continue
+            now = time.monotonic()
+            if not woken: self.jitter_ms.add(abs(now - next_due) * 1000.0)
+            self.sample_once(now)
+
+    def stats(self):
+        return {"sample_jitter_ms": self.jitter_ms.summary(), "sample_duration_ms": self.duration_ms.summary(),
+                "samples": self._seq, "polling": self.scheduler.stats()}
@@ -0,0 +1,651 @@
+import importlib
+import os
+import sys
+import math
+import random
+import time
+
+# --- Sensor Backends ---
+# Every backend exposes the same small hardware tree (Hardware/Sensor nodes with
+# plain string ids and type names) so SystemStatsApp never talks to a specific
+# monitoring library directly. Native handles live in the nodes' `handle` slot.
+
+GPU_HARDWARE_TYPES = ("GpuNvidia", "GpuAmd", "GpuIntel")
+DERIVED_HARDWARE_TYPE = "Derived"  # the node holding derived_sensors' user-defined sensors, never a backend's
+# Computer flag that makes LibreHardwareMonitor probe each hardware type.
+LHM_HARDWARE_CLASSES = {
+    "Cpu": "IsCpuEnabled", "GpuNvidia": "IsGpuEnabled", "GpuAmd": "IsGpuEnabled", "GpuIntel": "IsGpuEnabled",
+    "Memory": "IsMemoryEnabled", "Motherboard": "IsMotherboardEnabled", "SuperIO": "IsMotherboardEnabled",
+    "EmbeddedController": "IsMotherboardEnabled", "Cooler": "IsControllerEnabled", "Storage": "IsStorageEnabled",
+    "Network": "IsNetworkEnabled", "Psu": "IsPsuEnabled", "Battery": "IsBatteryEnabled",
+}
+LHM_DEFAULT_CLASSES = ("IsCpuEnabled", "IsGpuEnabled", "IsMemoryEnabled", "IsMotherboardEnabled",
+                       "IsControllerEnabled", "IsStorageEnabled", "IsNetworkEnabled")
+
+
+class Hardware:
+    __slots__ = ("id", "name", "hw_type", "sensors", "sub_hardware", "parent", "handle")
+
+    def __init__(self, hw_id, name, hw_type, parent=None, handle=None):
+        self.id = hw_id
+        self.name = name
+        self.hw_type = hw_type
+        self.sensors = []
+        self.sub_hardware = []
+        self.parent = parent
+        self.handle = handle
+
+    def add_sub_hardware(self, hw_id, name, hw_type, handle=None):
+        sub = Hardware(hw_id, name, hw_type, parent=self, handle=handle)
+        self.sub_hardware.append(sub)
+        return sub
+
+    def add_sensor(self, sensor_id, name, sensor_type, handle=None):
+        sensor = Sensor(sensor_id, name, sensor_type, self, handle)
+        self.sensors.append(sensor)
+        return sensor
+
+    def iter_sensors(self):
+        yield from self.sensors
+        for sub in self.sub_hardware: yield from sub.iter_sensors()
+
+    def __repr__(self):
+        return f"Hardware({self.id!r}, {self.name!r}, {self.hw_type!r})"
+
+
+class Sensor:
+    __slots__ = ("id", "name", "sensor_type", "hardware", "handle", "value")
+
+    def __init__(self, sensor_id, name, sensor_type, hardware, handle=None):
+        self.id = sensor_id
+        self.name = name
+        self.sensor_type = sensor_type
+        self.hardware = hardware
+        self.handle = handle
+        self.value = None
+
+    def __repr__(self):
+        return f"Sensor({self.id!r}, {self.name!r}, {self.sensor_type!r})"
+
+
+class SensorBackend:
+    name = "none"
+    saves_config = True  # False when the hardware is not this machine's live hardware; its saved dashboard is then only read
+
+    def __init__(self):
+        self.available = False
+        self.hardware = []
+        self.hardware_types = None  # set before open() to enumerate only these hardware types; None = all
+        self.hardware_changed = None  # optional callback, from any thread, when `hardware` is replaced after open()
+        self.hardware_dirty = False  # set from any thread when the backend learns its hardware changed; rescan() clears it
+        self.finished = False  # set once a finite source (a replay) has shown its last reading; the sampler then stops sampling
+
+    def open(self):
+        return self.available
+
+    def enumerate_all(self, progress=None):
+        # Brings in the hardware types skipped by a restricted open(), calling progress() each time
+        # `hardware` grows; True if it changed. Backends without per-type probing enumerate everything in open().
+        self.hardware_types = None
+        return False
+
+    def rescan(self):
+        # Diffs the top level hardware against what the system has now and replaces `hardware` if it
+        # differs, keeping the nodes that are still there; True if it changed. Runs on the sampler thread.
+        # Backends without hot-plug never change after open().
+        self.hardware_dirty = False
+        return False
+
+    def close(self):
+        pass
+
+    def update(self, hw):
+        pass
+
+    def update_many(self, hardware_items, timings=None):
+        # timings: optional dict filled with hw_id -> Update() milliseconds (profiling only).
+        if timings is None:
+            for hw in hardware_items: self.update(hw)
+            return
+        for hw in hardware_items:
+            started = time.perf_counter()
+            self.update(hw)
+            timings[hw.id] = (time.perf_counter() - started) * 1000.0
+
+    def read(self, sensor):
+        return sensor.value
+
+    def status_text(self):
+        return f"{self.name} Active" if self.available else f"{self.name} N/A"
+
+
+# --- LibreHardwareMonitor (Windows) ---
+class LhmBackend(SensorBackend):
+    name = "LHM"
+
+    def __init__(self, dll_dir=None, computer=None):
+        super().__init__()
+        self.dll_dir = dll_dir or os.path.dirname(os.path.abspath(__file__))
+        self.computer = computer
+
+    def open(self):
+        try:
+            if self.computer is None:
+                self.computer = self._open_computer()
+                if self.computer is None:
+                    self.available = False
+                    return False
+            self.hardware = [self._wrap(hw_item) for hw_item in self.computer.Hardware]
+            if hasattr(self.computer, "HardwareAdded"):
+                # LHM reports some hot-plug itself (e.g. network adapters); rescan() picks the change up early.
+                self.computer.HardwareAdded += self._on_hardware_event
+                self.computer.HardwareRemoved += self._on_hardware_event
+            self.available = True
+            print("Info: LibreHardwareMonitor initialized successfully.")
+        except Exception as e:
+            print(f"Error initializing LibreHardwareMonitor: {e}. LHM support disabled.")
+            self.available = False
+        return self.available
+
+    def _open_computer(self):
+        dll_path = os.path.join(self.dll_dir, "LibreHardwareMonitorLib.dll")
+        hidsharp_dll_path = os.path.join(self.dll_dir, "HidSharp.dll")
+
+        if not os.path.exists(dll_path):
+            print(f"Info: LibreHardwareMonitorLib.dll not found at {dll_path}.")
+            if not os.path.exists(hidsharp_dll_path):
+                 print(f"Info: HidSharp.dll also not found at {hidsharp_dll_path} (LHM dependency).")
+            print("LHM support disabled.")
+            return None
+
+        if not os.path.exists(hidsharp_dll_path):
+            print(f"Info: HidSharp.dll not found at {hidsharp_dll_path} (LHM dependency). LHM might fail or be unstable.")
+
+        import clr
+        clr.AddReference(dll_path)
+
+        from LibreHardwareMonitor.Hardware import Computer
+
+        computer = Computer()
+        for flag in self._enabled_classes(): setattr(computer, flag, True)
+        computer.Open()
+        return computer
+
+    def _enabled_classes(self):
+        if self.hardware_types is None: return LHM_DEFAULT_CLASSES
+        return tuple(sorted({LHM_HARDWARE_CLASSES[hw_type] for hw_type in self.hardware_types if hw_type in LHM_HARDWARE_CLASSES}))
+
+    def enumerate_all(self, progress=None):
+        # Enabling a class on an open Computer makes LHM probe and add that hardware; one class at a time
+        # so the UI can fill in as each category comes online.
+        if self.hardware_types is None or not self.available: return False
+        try:
+            enabled = set(self._enabled_classes())
+            for flag in LHM_DEFAULT_CLASSES:
+                if flag in enabled: continue
+                setattr(self.computer, flag, True); enabled.add(flag)
+                known = {hw.id: hw for hw in self.hardware}  # keep already wrapped nodes (and their sensors) as they are
+                self.hardware = [known.get(hw_item.Identifier.ToString()) or self._wrap(hw_item) for hw_item in self.computer.Hardware]
+                if progress: progress()
+            self.hardware_types = None
+            print("Info: LibreHardwareMonitor enumerated all hardware classes.")
+        except Exception as e:
+            print(f"Error enumerating LibreHardwareMonitor hardware: {e}")
+            return False
+        return True
+
+    def _on_hardware_event(self, lhm_item):
+        # Raised on an LHM thread; the nodes are only swapped by rescan() on the sampler thread.
+        self.hardware_dirty = True
+
+    def rescan(self):
+        # A top level Identifier diff is a handful of .NET calls; only new hardware gets wrapped. A node is
+        # kept only while it wraps the same LHM object, so replugged hardware never keeps a stale handle.
+        self.hardware_dirty = False
+        if not self.available: return False
+        try:
+            lhm_items = list(self.computer.Hardware)
+            if len(lhm_items) == len(self.hardware) and all(hw.handle == lhm_item for hw, lhm_item in zip(self.hardware, lhm_items)): return False
+            known = {hw.id: hw for hw in self.hardware}
+            hardware = []
+            for lhm_item in lhm_items:
+                node = known.get(lhm_item.Identifier.ToString())
+                hardware.append(node if node is not None and node.handle == lhm_item else self._wrap(lhm_item))
+        except Exception as e:
+            print(f"Error rescanning LibreHardwareMonitor hardware: {e}")
+            return False
+        self.hardware = hardware
+        return True
+
+    def _wrap(self, lhm_item, parent=None):
+        # Identifier/Name/type strings cross the .NET boundary once, here.
+        lhm_item.Update()
+        node = Hardware(lhm_item.Identifier.ToString(), lhm_item.Name, lhm_item.HardwareType.ToString(), parent=parent, handle=lhm_item)
+        for lhm_sensor in lhm_item.Sensors:
+            node.add_sensor(lhm_sensor.Identifier.ToString(), lhm_sensor.Name, lhm_sensor.SensorType.ToString(), handle=lhm_sensor)
+        for lhm_sub_item in lhm_item.SubHardware:
+            node.sub_hardware.append(self._wrap(lhm_sub_item, parent=node))
+        return node
+
+    def update(self, hw):
+        hw.handle.Update()
+
+    def read(self, sensor):
+        return sensor.handle.Value
+
+    def close(self):
+        if self.computer is not None and self.available:
+            try:
+                if hasattr(self.computer, "HardwareAdded"):
+                    self.computer.HardwareAdded -= self._on_hardware_event
+                    self.computer.HardwareRemoved -= self._on_hardware_event
+                self.computer.Close()
+                print("Info: LibreHardwareMonitor closed.")
+            except Exception as e:
+                print(f"Error closing LibreHardwareMonitor: {e}")
+        self.available = False
+
+    def status_text(self):
+        return "LHM Active" if self.available else "LHM N/A - Run as Admin?"
+
+
+# --- Linux (hwmon / procfs) ---
+class _CachedFile:
+    # Keeps the descriptor open and re-reads from offset 0; sysfs and procfs
+    # regenerate their contents on every read at offset 0. sysfs attributes are
+    # at most one page, so a single pread is enough for them.
+    __slots__ = ("path", "fd", "single_read", "generation", "data")
+
+    def __init__(self, path, single_read=False):
+        self.path = path
+        self.fd = os.open(path, os.O_RDONLY)
+        self.single_read = single_read
+        self.generation = -1
+        self.data = None
+
+    def read(self, generation=None):
+        if generation is not None and generation == self.generation:
+            return self.data
+        if self.single_read:
+            self.data = os.pread(self.fd, 4096, 0)
+        else:
+            chunks, offset = [], 0
+            while True:
+                chunk = os.pread(self.fd, 65536, offset)
+                if not chunk: break
+                chunks.append(chunk); offset += len(chunk)
+            self.data = b"".join(chunks)
+        self.generation = generation if generation is not None else -1
+        return self.data
+
+    def close(self):
+        try: os.close(self.fd)
+        except OSError: pass
+
+
+HWMON_INPUTS = (
+    # prefix, file suffix, sensor type, scale
+    ("temp", "_input", "Temperature", 0.001),
+    ("fan", "_input", "Fan", 1.0),
+    ("in", "_input", "Voltage", 0.001),
+    ("curr", "_input", "Current", 0.001),
+    ("power", "_average", "Power", 0.000001),
+    ("power", "_input", "Power", 0.000001),
+    ("pwm", "", "Control", 100.0 / 255.0),
+)
+HWMON_CHIP_TYPES = {
+    "coretemp": "Cpu", "k10temp": "Cpu", "zenpower": "Cpu", "cpu_thermal": "Cpu",
+    "amdgpu": "GpuAmd", "nouveau": "GpuNvidia", "i915": "GpuIntel",
+    "nvme": "Storage", "drivetemp": "Storage",
+}
+
+
+class LinuxBackend(SensorBackend):
+    name = "Linux"
+
+    def __init__(self, sys_root="/sys/class/hwmon", proc_root="/proc"):
+        super().__init__()
+        self.sys_root = sys_root
+        self.proc_root = proc_root
+        self._files = []
+        self._generation = 0
+        self._stat = None
+        self._meminfo = None
+        self._netdev = None
+        self._cpu_prev = {}
+        self._net_prev = {}
+        self._hwmon_entries = None  # hwmon directory listing and network interfaces as of the last (re)scan
+        self._interfaces = None
+        self._chip_dirs = {}  # hw_id -> hwmon directory the node's files were opened from
+
+    def open(self):
+        try:
+            self.hardware = []
+            self._open_procfs()
+            self._open_hwmon()
+            self.available = bool(self.hardware)
+            self.update_many(self.hardware)
+            print(f"Info: Linux sensor backend initialized with {len(self.hardware)} hardware items.")
+        except Exception as e:
+            print(f"Error initializing Linux sensor backend: {e}")
+            self.available = False
+        return self.available
+
+    def _open_file(self, path, single_read=False):
+        cached = _CachedFile(path, single_read)
+        self._files.append(cached)
+        return cached
+
+    def _open_procfs(self):
+        stat_path = os.path.join(self.proc_root, "stat")
+        if os.path.exists(stat_path):
+            self._stat = self._open_file(stat_path)
+            cpu = Hardware("/linux/cpu", "CPU", "Cpu", handle="stat")
+            for line in self._stat.read().decode().splitlines():
+                if not line.startswith("cpu"): break
+                label = line.split()[0]
+                if label == "cpu": cpu.add_sensor("/linux/cpu/load/total", "CPU Total", "Load", handle="cpu")
+                else: cpu.add_sensor(f"/linux/cpu/load/{label[3:]}", f"CPU Core #{int(label[3:]) + 1}", "Load", handle=label)
+            self.hardware.append(cpu)
+
+        meminfo_path = os.path.join(self.proc_root, "meminfo")
+        if os.path.exists(meminfo_path):
+            self._meminfo = self._open_file(meminfo_path)
+            memory = Hardware("/linux/memory", "Generic Memory", "Memory", handle="meminfo")
+            memory.add_sensor("/linux/memory/load/0", "Memory", "Load", handle="load")
+            memory.add_sensor("/linux/memory/data/0", "Memory Used", "Data", handle="used")
+            memory.add_sensor("/linux/memory/data/1", "Memory Available", "Data", handle="available")
+            self.hardware.append(memory)
+
+        netdev_path = os.path.join(self.proc_root, "net", "dev")
+        if os.path.exists(netdev_path):
+            self._netdev = self._open_file(netdev_path)
+            self._interfaces = self._network_interfaces()
+            self.hardware.extend(self._open_nic(iface) for iface in self._interfaces)
+
+    def _network_interfaces(self):
+        if self._netdev is None: return []
+        return [iface for iface in self._parse_netdev(self._netdev.read()) if iface != "lo"]
+
+    def _open_nic(self, iface):
+        nic = Hardware(f"/linux/nic/{iface}", iface, "Network", handle="netdev")
+        nic.add_sensor(f"/linux/nic/{iface}/throughput/0", "Upload Speed", "Throughput", handle=(iface, "tx_rate"))
+        nic.add_sensor(f"/linux/nic/{iface}/throughput/1", "Download Speed", "Throughput", handle=(iface, "rx_rate"))
+        nic.add_sensor(f"/linux/nic/{iface}/data/0", "Data Uploaded", "Data", handle=(iface, "tx_total"))
+        nic.add_sensor(f"/linux/nic/{iface}/data/1", "Data Downloaded", "Data", handle=(iface, "rx_total"))
+        return nic
+
+    def _open_hwmon(self):
+        self._hwmon_entries = self._hwmon_listing()
+        for chip in self._hwmon_chips(self._hwmon_entries):
+            hw = self._open_chip(*chip)
+            if hw is not None: self.hardware.append(hw)
+
+    def _hwmon_listing(self):
+        return sorted(os.listdir(self.sys_root), key=lambda e: (len(e), e)) if os.path.isdir(self.sys_root) else []
+
+    def _hwmon_chips(self, entries):
+        # [(hw_id, chip name, occurrence, chip directory, file names)]; reads only each chip's name and listing.
+        chips, seen_names = [], {}
+        for entry in entries:
+            chip_dir = os.path.join(self.sys_root, entry)
+            try:
+                with open(os.path.join(chip_dir, "name")) as f: chip_name = f.read().strip()
+                files = set(os.listdir(chip_dir))
+            except OSError:
+                continue
+            occurrence = seen_names.get(chip_name, 0); seen_names[chip_name] = occurrence + 1
+            chips.append((f"/hwmon/{chip_name}/{occurrence}", chip_name, occurrence, chip_dir, files))
+        return chips
+
+    def _open_chip(self, hw_id, chip_name, occurrence, chip_dir, files):
+        hw = Hardware(hw_id, chip_name if occurrence == 0 else f"{chip_name} #{occurrence + 1}",
+                      HWMON_CHIP_TYPES.get(chip_name, "SuperIO"), handle="hwmon")
+        for prefix, suffix, sensor_type, scale in HWMON_INPUTS:
+            channels = sorted((int(name[len(prefix):len(name) - len(suffix)]), name) for name in files
+                              if name.startswith(prefix) and name.endswith(suffix)
+                              and name[len(prefix):len(name) - len(suffix)].isdigit())
+            for channel, file_name in channels:
+                stem = f"{prefix}{channel}"
+                if any(s.id == f"{hw_id}/{stem}" for s in hw.sensors): continue
+                label = f"{sensor_type} #{channel}"
+                if f"{stem}_label" in files:
+                    try:
+                        with open(os.path.join(chip_dir, f"{stem}_label")) as f: label = f.read().strip() or label
+                    except OSError: pass
+                try: cached = self._open_file(os.path.join(chip_dir, file_name), single_read=True)
+                except OSError: continue
+                hw.add_sensor(f"{hw_id}/{stem}", label, sensor_type, handle=(cached, scale))
+        if not hw.sensors: return None
+        self._chip_dirs[hw_id] = chip_dir
+        return hw
+
+    def rescan(self):
+        # Cheap check first: the hwmon directory listing and the interfaces in /proc/net/dev. When either
+        # changed, only chips and interfaces that are new get opened, and the files of the ones gone are closed.
+        self.hardware_dirty = False
+        if not self.available: return False
+        try:
+            entries, interfaces = self._hwmon_listing(), self._network_interfaces()
+            if entries == self._hwmon_entries and interfaces == self._interfaces: return False
+            known = {hw.id: hw for hw in self.hardware}
+            hardware = [hw for hw in self.hardware if hw.handle in ("stat", "meminfo")]
+            hardware.extend(known.get(f"/linux/nic/{iface}") or self._open_nic(iface) for iface in interfaces)
+            for chip in self._hwmon_chips(entries):
+                hw_id, chip_dir = chip[0], chip[3]
+                hw = known.get(hw_id) if self._chip_dirs.get(hw_id) == chip_dir else None
+                if hw is None: hw = self._open_chip(*chip)
+                if hw is not None: hardware.append(hw)
+        except OSError as e:
+            print(f"Error rescanning Linux sensors: {e}")
+            return False
+        kept, present, closed = {id(hw) for hw in hardware}, {hw.id for hw in hardware}, set()
+        for hw in self.hardware:
+            if id(hw) in kept: continue
+            if hw.handle == "netdev": self._net_prev.pop(hw.name, None)
+            elif hw.handle == "hwmon":
+                if hw.id not in present: self._chip_dirs.pop(hw.id, None)
+                for sensor in hw.sensors: sensor.handle[0].close(); closed.add(id(sensor.handle[0]))
+        if closed: self._files = [cached for cached in self._files if id(cached) not in closed]
+        self._hwmon_entries, self._interfaces = entries, interfaces
+        changed = len(hardware) != len(self.hardware) or any(new is not old for new, old in zip(hardware, self.hardware))
+        self.hardware = hardware
+        return changed
+
+    @staticmethod
+    def _parse_netdev(data):
+        counters = {}
+        for line in data.decode().splitlines()[2:]:
+            iface, _, fields = line.partition(":")
+            fields = fields.split()
+            if len(fields) >= 9: counters[iface.strip()] = (int(fields[0]), int(fields[8]))
+        return counters
+
+    def update_many(self, hardware_items, timings=None):
+        # Each procfs file is read at most once per batch, whatever the number of nodes
+        # (so the first node using a shared file is charged for reading it).
+        self._generation += 1
+        for hw in hardware_items:
+            if timings is None: self._update(hw, self._generation); continue
+            started = time.perf_counter()
+            self._update(hw, self._generation)
+            timings[hw.id] = (time.perf_counter() - started) * 1000.0
+
+    def update(self, hw):
+        self._generation += 1
+        self._update(hw, self._generation)
+
+    def _update(self, hw, generation):
+        kind = hw.handle
+        if kind == "hwmon":
+            for sensor in hw.sensors:
+                cached, scale = sensor.handle
+                try: sensor.value = int(cached.read()) * scale
+                except (OSError, ValueError): sensor.value = None
+        elif kind == "stat":
+            now = {}
+            for line in self._stat.read(generation).decode().splitlines():
+                if not line.startswith("cpu"): break
+                fields = line.split()
+                ticks = [int(v) for v in fields[1:]]
+                idle = ticks[3] + (ticks[4] if len(ticks) > 4 else 0)
+                now[fields[0]] = (sum(ticks[:8]), idle)
+            for sensor in hw.sensors:
+                total, idle = now.get(sensor.handle, (0, 0))
+                prev_total, prev_idle = self._cpu_prev.get(sensor.handle, (0, 0))
+                d_total = total - prev_total
+                sensor.value = 100.0 * (1.0 - (idle - prev_idle) / d_total) if d_total > 0 else sensor.value
+            self._cpu_prev.update(now)
+        elif kind == "meminfo":
+            fields = {}
+            for line in self._meminfo.read(generation).decode().splitlines():
+                key, _, rest = line.partition(":")
+                fields[key] = rest.split()[0] if rest.split() else "0"
+            total_kb = int(fields.get("MemTotal", 0))
+            available_kb = int(fields.get("MemAvailable", fields.get("MemFree", 0)))
+            # "Data" readings are GiB (see sensor_format.REPORTED_DATA_BYTES).
+            values = {"used": (total_kb - available_kb) / 1048576.0, "available": available_kb / 1048576.0,
+                      "load": 100.0 * (total_kb - available_kb) / total_kb if total_kb else None}
+            for sensor in hw.sensors: sensor.value = values[sensor.handle]
+        elif kind == "netdev":
+            counters = self._parse_netdev(self._netdev.read(generation))
+            now = time.monotonic()
+            iface = hw.name
+            rx, tx = counters.get(iface, (None, None))
+            if rx is None:
+                for sensor in hw.sensors: sensor.value = None
+                return
+            prev = self._net_prev.get(iface)
+            self._net_prev[iface] = (now, rx, tx)
+            values = {"rx_total": rx / 1073741824.0, "tx_total": tx / 1073741824.0, "rx_rate": None, "tx_rate": None}
+            if prev and now > prev[0]:
+                values["rx_rate"] = (rx - prev[1]) / (now - prev[0])
+                values["tx_rate"] = (tx - prev[2]) / (now - prev[0])
+            for sensor in hw.sensors: sensor.value = values[sensor.handle[1]]
+
+    def close(self):
+        for cached in self._files: cached.close()
+        self._files = []
+        self.available = False
+
+
+# --- Synthetic (deterministic load-test data) ---
+SYNTHETIC_SENSOR_TYPES = (
+    # sensor type, base, amplitude
+    ("Temperature", 55.0, 20.0), ("Load", 40.0, 40.0), ("Clock", 3500.0, 1200.0), ("Power", 60.0, 50.0),
+    ("Voltage", 1.2, 0.1), ("Fan", 1200.0, 600.0), ("Control", 50.0, 30.0), ("Data", 16.0, 4.0),
+    ("SmallData", 2048.0, 512.0), ("Throughput", 1.0e6, 9.0e5), ("Level", 80.0, 10.0), ("Factor", 1.0, 0.5),
+)
+SYNTHETIC_HARDWARE_TYPES = ("Cpu", "GpuNvidia", "Memory", "Motherboard", "Storage", "Network")
+
+
+class SyntheticBackend(SensorBackend):
+    # Values are a pure function of (seed, sensor, update count), so two runs
+    # with the same parameters produce identical readings. Storage sensors and
+    # every fifth other sensor are constant, mimicking slow movers such as
+    # SMART temperatures.
+    name = "Synthetic"
+
+    def __init__(self, total_sensors=512, hardware_count=8, sub_hardware_per_item=1, seed=0, update_delay=0.0, probe_delay=0.0):
+        super().__init__()
+        self.total_sensors = total_sensors
+        self.hardware_count = max(1, hardware_count)
+        self.sub_hardware_per_item = sub_hardware_per_item
+        self.seed = seed
+        self.update_delay = update_delay   # seconds, or {hw_type: seconds}
+        self.probe_delay = probe_delay     # seconds per hardware type enumerated, like LHM's driver probing
+        self.update_calls = 0
+        self.unplugged = set()  # ids of top level nodes hidden from the next rescan(), to simulate hot-plug
+        self._enumerated = []
+
+    def open(self):
+        self._enumerated = self._enumerate(self.hardware_types, ())
+        self.hardware = self._plugged()
+        self.available = True
+        return True
+
+    def enumerate_all(self, progress=None):
+        if self.hardware_types is None or not self.available: return False
+        for hw_type in SYNTHETIC_HARDWARE_TYPES:
+            if hw_type in self.hardware_types: continue
+            probed, self.hardware_types = self.hardware_types, set(self.hardware_types) | {hw_type}
+            known = {hw.id: hw for hw in self._enumerated}
+            self._enumerated = [known.get(hw.id, hw) for hw in self._enumerate(self.hardware_types, probed)]
+            self.hardware = self._plugged()
+            if progress: progress()
+        self.hardware_types = None
+        return True
+
+    def _plugged(self):
+        return [hw for hw in self._enumerated if hw.id not in self.unplugged]
+
+    def rescan(self):
+        self.hardware_dirty = False
+        hardware = self._plugged()
+        if len(hardware) == len(self.hardware) and all(new is old for new, old in zip(hardware, self.hardware)): return False
+        self.hardware = hardware
+        return True
+
+    def _enumerate(self, hardware_types, already_probed):
+        rng = random.Random(self.seed)
+        hardware = []
+        probed = set(already_probed)
+        per_hw = max(1, self.total_sensors // self.hardware_count)
+        made = 0
+        for hw_idx in range(self.hardware_count):
+            hw_type = SYNTHETIC_HARDWARE_TYPES[hw_idx % len(SYNTHETIC_HARDWARE_TYPES)]
+            wanted = hardware_types is None or hw_type in hardware_types
+            if wanted and hw_type not in probed:
+                probed.add(hw_type)
+                delay = self.probe_delay.get(hw_type, 0.0) if isinstance(self.probe_delay, dict) else self.probe_delay
+                if delay: time.sleep(delay)
+            hw = Hardware(f"/synthetic/{hw_type.lower()}/{hw_idx}", f"Synthetic {hw_type} {hw_idx}", hw_type, handle=[0])
+            nodes = [hw] + [hw.add_sub_hardware(f"{hw.id}/sub/{sub_idx}", f"Synthetic SuperIO {hw_idx}.{sub_idx}", "SuperIO", handle=[0])
+                            for sub_idx in range(self.sub_hardware_per_item)]
+            count = per_hw if hw_idx < self.hardware_count - 1 else max(0, self.total_sensors - made)
+            for s_idx in range(count):
+                owner = nodes[s_idx % len(nodes)]
+                sensor_type, base, amplitude = SYNTHETIC_SENSOR_TYPES[s_idx % len(SYNTHETIC_SENSOR_TYPES)]
+                if s_idx % 5 == 4 or hw_type == "Storage": amplitude = 0.0
+                wave = (base, amplitude, rng.uniform(10.0, 120.0), rng.uniform(0.0, 2 * math.pi))
+                sensor = owner.add_sensor(f"{owner.id}/{sensor_type.lower()}/{s_idx}", f"Core #{s_idx} {sensor_type}", sensor_type, handle=wave)
+                sensor.value = base + amplitude * math.sin(wave[3])
+            made += count
+            if wanted: hardware.append(hw)
+        return hardware
+
+    def update(self, hw):
+        self.update_calls += 1
+        delay = self.update_delay.get(hw.hw_type, 0.0) if isinstance(self.update_delay, dict) else self.update_delay
+        if delay: time.sleep(delay)
+        hw.handle[0] += 1
+        tick = hw.handle[0]
+        for sensor in hw.sensors:
+            base, amplitude, period, phase = sensor.handle
+            sensor.value = base + amplitude * math.sin(2 * math.pi * tick / period + phase)
+
+
+BACKENDS = {"lhm": LhmBackend, "linux": LinuxBackend, "synthetic": SyntheticBackend}
+# Backends built on modules that import this one; loaded on first use.
+LAZY_BACKENDS = {"replay": ("recording", "ReplayBackend"), "remote": ("remote_hosts", "RemoteBackend")}
+
+
+def default_backend_name():
+    if os.name == "nt": return "lhm"
+    if sys.platform.startswith("linux"): return "linux"
+    return "synthetic"
+
+
+def create_backend(name=None, **options):
+    # Without a name or GLANCED_BACKEND, GLANCED_REPLAY=<file> replays a recording (recording.py)
+    # and GLANCED_HOSTS=<host:port,...> follows remote agents (remote_hosts.py).
+    if not name and not os.environ.get("GLANCED_BACKEND"):
+        if os.environ.get("GLANCED_REPLAY"): name = "replay"
+        elif os.environ.get("GLANCED_HOSTS"): name = "remote"
+    name = (name or os.environ.get("GLANCED_BACKEND") or default_backend_name()).lower()
+    if name in LAZY_BACKENDS:
+        module_name, class_name = LAZY_BACKENDS[name]
+        return getattr(importlib.import_module(module_name), class_name)(**options)
+    if name not in BACKENDS:
+        raise ValueError(f"Unknown sensor backend '{name}'. Choose from: {', '.join(list(BACKENDS) + list(LAZY_BACKENDS))}")
+    return BACKENDS[name](**options)
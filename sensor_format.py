@@ -0,0 +1,221 @@
+import math
+
+# --- Sensor Value Formatting ---
+# Shared by the GUI views and the headless collector; keep this module free of tkinter.
+# Formatting is table driven: each sensor type is compiled once into a small
+# function (unit conversion + format spec), and SensorFormatter caches that
+# function per sensor id so a tick costs one dict lookup and one str.format.
+# Each type also compiles a "band" function: the range of raw readings that
+# format to the same text, which lets RenderedReadings skip formatting (and the
+# widget update after it) while a reading only moves below display precision.
+
+FORMATTED_SENSOR_TYPES = ("Temperature", "Fan", "Load", "Power", "Voltage", "Clock", "Control", "Factor", "Data", "SmallData", "Throughput", "Level")
+
+SENSOR_FORMATS = {
+    # sensor type -> (format spec, unit) with the default (decimal) data units
+    "Temperature": (".1f", "°C"),
+    "Fan": (".0f", "RPM"),
+    "Load": (".1f", "%"),
+    "Power": (".1f", "W"),
+    "Voltage": (".3f", "V"),
+    "Clock": (".0f", "MHz"),
+    "Control": (".0f", "%"),
+    "Factor": (".2f", ""),
+    "Data": (".2f", "GB"),
+    "SmallData": (".0f", "MB"),
+    "Throughput": (".0f", "B/s"),
+    "Level": (".0f", "%"),
+}
+# Every backend reports "Data" in GiB (2**30 bytes) and "SmallData" in MiB (2**20 bytes), as LHM does;
+# LinuxBackend divides its byte counts accordingly. Decimal display converts to GB/MB.
+REPORTED_DATA_BYTES = {"Data": 2**30, "SmallData": 2**20}
+DECIMAL_DATA_BYTES = {"Data": 10**9, "SmallData": 10**6}
+TEMPERATURE_UNITS = ("C", "F")
+DATA_UNITS = ("decimal", "binary")         # GB/MB/KB vs GiB/MiB/KiB
+THROUGHPUT_UNITS = ("auto", "B/s")         # auto-scale B/s -> KB/s -> MB/s -> GB/s, or raw B/s
+THROUGHPUT_SCALE_FORMATS = ((".0f", ""), (".1f", "K"), (".1f", "M"), (".2f", "G"))
+
+
+def _compile(s_type, temperature_unit, data_units, throughput_units):
+    spec, unit = SENSOR_FORMATS.get(s_type, ("", ""))
+    fmt = ("{:" + spec + "}").format
+    if s_type == "Temperature" and temperature_unit == "F":
+        return lambda s_val: (fmt(s_val * 1.8 + 32.0), "°F")
+    if s_type in REPORTED_DATA_BYTES:
+        if data_units == "binary":
+            unit = unit[0] + "iB"
+            return lambda s_val: (fmt(s_val), unit)
+        factor = REPORTED_DATA_BYTES[s_type] / DECIMAL_DATA_BYTES[s_type]
+        return lambda s_val: (fmt(s_val * factor), unit)
+    if s_type == "Throughput" and throughput_units == "auto":
+        base = 1024.0 if data_units == "binary" else 1000.0
+        infix = "i" if data_units == "binary" else ""
+        scales = tuple((base ** i, ("{:" + scale_spec + "}").format, f"{prefix}{infix if prefix else ''}B/s")
+                       for i, (scale_spec, prefix) in enumerate(THROUGHPUT_SCALE_FORMATS))
+        def throughput(s_val):
+            magnitude = abs(s_val)
+            for divisor, scale_fmt, scale_unit in reversed(scales):
+                if magnitude >= divisor: return scale_fmt(s_val / divisor), scale_unit
+            return scales[0][1](s_val), scales[0][2]
+        return throughput
+    if not spec:
+        return lambda s_val: (f"{s_val}", unit)
+    return lambda s_val: (fmt(s_val), unit)
+
+
+def _decimals(spec):
+    return int(spec[1:-1]) if spec.startswith(".") and spec.endswith("f") else None
+
+
+BAND_INNER = 0.5 - 1e-6   # half a display step, minus room for float error in the conversion
+BAND_LIMIT = 1e9          # display steps; beyond this the float error could reach BAND_INNER's margin
+BAND_RETRY_MISSES = 8     # after this many changed readings in a row, a sensor's band is only looked for every this many
+
+
+def _compile_band(s_type, temperature_unit, data_units, throughput_units):
+    # -> function(raw reading) -> (low, high) or None. Raw readings strictly between low and high show
+    # the same text. floor() stands in for str.format's exact rounding, so a reading too close to a
+    # rounding boundary gets no band (and is simply formatted again next time).
+    spec, _ = SENSOR_FORMATS.get(s_type, ("", ""))
+    floor = math.floor
+    if s_type == "Throughput" and throughput_units == "auto":
+        base = 1024.0 if data_units == "binary" else 1000.0
+        scales = tuple((base ** i, 10.0 ** _decimals(scale_spec)) for i, (scale_spec, _) in enumerate(THROUGHPUT_SCALE_FORMATS))
+        # Raw magnitude range of each scale: the same scale has to be picked again for the same text.
+        ranges = tuple((divisor if i else 0.0, scales[i + 1][0] if i + 1 < len(scales) else float("inf")) for i, (divisor, _) in enumerate(scales))
+        def throughput_band(s_val):
+            magnitude = abs(s_val)
+            i = len(scales) - 1
+            while i and magnitude < scales[i][0]: i -= 1
+            divisor, steps = scales[i]
+            q = s_val / divisor * steps
+            if not -BAND_LIMIT < q < BAND_LIMIT: return None
+            n = floor(q + 0.5)
+            if not n - BAND_INNER < q < n + BAND_INNER or n == 0: return None
+            low, high = ranges[i]
+            if s_val < 0: low, high = -high, -low
+            return max((n - BAND_INNER) * divisor / steps, low), min((n + BAND_INNER) * divisor / steps, high)
+        return throughput_band
+    decimals = _decimals(spec)
+    if decimals is None: return lambda s_val: None
+    scale, offset = 1.0, 0.0
+    if s_type == "Temperature" and temperature_unit == "F": scale, offset = 1.8, 32.0
+    if s_type in REPORTED_DATA_BYTES and data_units == "decimal": scale = REPORTED_DATA_BYTES[s_type] / DECIMAL_DATA_BYTES[s_type]
+    steps = 10.0 ** decimals
+    back, shift = 1.0 / (steps * scale), offset / scale  # display steps -> raw reading
+    def linear_band(s_val):
+        q = (s_val * scale + offset) * steps
+        if not -BAND_LIMIT < q < BAND_LIMIT: return None  # also NaN and infinities
+        n = floor(q + 0.5)
+        if not n - BAND_INNER < q < n + BAND_INNER: return None
+        if n == 0:  # "-0.0" and "0.0" differ, so the zero step is split at zero
+            if q > 0: return -shift, BAND_INNER * back - shift
+            if q < 0: return -BAND_INNER * back - shift, -shift
+            return None
+        return (n - BAND_INNER) * back - shift, (n + BAND_INNER) * back - shift
+    return linear_band
+
+
+class SensorFormatter:
+    def __init__(self, temperature_unit="C", data_units="decimal", throughput_units="auto"):
+        for value, allowed, what in ((temperature_unit, TEMPERATURE_UNITS, "temperature unit"), (data_units, DATA_UNITS, "data units"),
+                                     (throughput_units, THROUGHPUT_UNITS, "throughput units")):
+            if value not in allowed: raise ValueError(f"Unknown {what} '{value}'. Choose from: {', '.join(allowed)}")
+        self.temperature_unit = temperature_unit
+        self.data_units = data_units
+        self.throughput_units = throughput_units
+        self.by_type = {s_type: _compile(s_type, temperature_unit, data_units, throughput_units) for s_type in FORMATTED_SENSOR_TYPES}
+        self.by_sensor = {}  # sensor_id -> compiled function; formatters are immutable, so this never goes stale
+        self.bands_by_type = {}
+        self.bands_by_sensor = {}
+
+    def for_type(self, s_type):
+        compiled = self.by_type.get(s_type)
+        if compiled is None: compiled = self.by_type[s_type] = _compile(s_type, self.temperature_unit, self.data_units, self.throughput_units)
+        return compiled
+
+    def band_function(self, sensor):
+        # Compiled function: raw reading -> (low, high) raw readings that show the same text, or None when that is not known.
+        compiled = self.bands_by_sensor.get(sensor.id)
+        if compiled is None:
+            compiled = self.bands_by_type.get(sensor.sensor_type)
+            if compiled is None:
+                compiled = self.bands_by_type[sensor.sensor_type] = _compile_band(sensor.sensor_type, self.temperature_unit, self.data_units, self.throughput_units)
+            self.bands_by_sensor[sensor.id] = compiled
+        return compiled
+
+    def _function_for(self, sensor):
+        # The compiled function for the sensor's type, looked up once per sensor id.
+        compiled = self.by_sensor.get(sensor.id)
+        if compiled is None: compiled = self.by_sensor[sensor.id] = self.for_type(sensor.sensor_type)
+        return compiled
+
+    def value_function(self, sensor):
+        # Compiled function: raw reading -> (formatted value, unit).
+        return self._function_for(sensor)
+
+    def value(self, sensor, s_val):
+        # (formatted value, unit) for a Sensor node's reading.
+        return self._function_for(sensor)(s_val)
+
+    def reading(self, sensor, s_val):
+        # Compact "value+unit" string as shown in the Selective Dashboard.
+        if s_val is None: return "N/A"
+        formatted_val, unit = self._function_for(sensor)(s_val)
+        return formatted_val + unit
+
+
+class RenderedReadings:
+    # Change detection in front of SensorFormatter.reading(): remembers the text last produced
+    # for each sensor and the band of raw readings that would produce it again, so a reading
+    # that moved less than the display precision costs two comparisons instead of a format,
+    # and hands back the very same string object for the widget-side comparison.
+    def __init__(self, formatter):
+        self.formatter = formatter
+        self.entries = {}  # sensor_id -> [raw reading, band low, band high, text, format function, band function, misses in a row]
+        self.checked = 0
+        self.reused = 0
+
+    def reading(self, sensor, s_val):
+        self.checked += 1
+        entry = self.entries.get(sensor.id)
+        if entry is None:
+            entry = self.entries[sensor.id] = [None, 0.0, 0.0, None, self.formatter.value_function(sensor), self.formatter.band_function(sensor), 0]
+        elif ((s_val == entry[0] and (s_val or str(s_val) == str(entry[0])))  # 0.0 and -0.0 show differently
+              or (s_val is not None and entry[1] < s_val < entry[2])):
+            self.reused += 1
+            entry[6] = 0
+            return entry[3]
+        entry[0] = s_val
+        if s_val is None:
+            entry[1] = entry[2] = 0.0
+            entry[3] = "N/A"
+            return "N/A"
+        formatted_val, unit = entry[4](s_val)
+        text = entry[3] = formatted_val + unit
+        # A reading that missed again and again is not settling; look for its band only now and then.
+        misses = entry[6] = entry[6] + 1
+        band = entry[5](s_val) if misses < BAND_RETRY_MISSES or not misses % BAND_RETRY_MISSES else None
+        if band: entry[1], entry[2] = band
+        else: entry[1] = entry[2] = 0.0
+        return text
+
+    def take_counts(self):
+        # (readings checked, readings served from the cache) since the last call.
+        counts = (self.checked, self.reused)
+        self.checked = self.reused = 0
+        return counts
+
+
+DEFAULT_FORMATTER = SensorFormatter()
+
+
+def format_value(s_val, s_type, formatter=DEFAULT_FORMATTER):
+    # Returns (formatted value, unit) for a raw reading.
+    return formatter.for_type(s_type)(s_val)
+
+
+def format_reading(s_val, s_type, formatter=DEFAULT_FORMATTER):
+    if s_val is None: return "N/A"
+    formatted_val, unit = formatter.for_type(s_type)(s_val)
+    return formatted_val + unit
@@ -0,0 +1,225 @@
+import math
+import threading
+import time
+
+try:
+    import numpy as np
+    HISTORY_AVAILABLE = True
+except ImportError:
+    np = None
+    HISTORY_AVAILABLE = False
+
+# --- Sensor History ---
+# Fixed-memory time series for every registered sensor. Each tier is a ring of
+# `capacity` columns; row r of a tier's float32 matrices is the contiguous
+# history of one sensor. Appending a snapshot writes one column (O(1) in the
+# history length) and feeds running per-bucket aggregates that are flushed into
+# the coarser tiers, so a week of history costs a fixed few MB per 100 sensors.
+
+HISTORY_TIERS = (
+    # name, bucket seconds (0 = every appended sample), capacity
+    ("raw", 0, 3600),      # latest 3600 samples (an hour at 1 s sampling)
+    ("1m", 60, 1440),      # a day of 1 minute buckets
+    ("1h", 3600, 168),     # a week of 1 hour buckets
+)
+STATS = ("min", "max", "avg", "percentile")
+
+
+class _Tier:
+    def __init__(self, name, bucket, capacity, rows):
+        self.name = name
+        self.bucket = bucket
+        self.capacity = capacity
+        self.head = 0     # next column to write
+        self.count = 0
+        self.times = np.full(capacity, np.nan, dtype=np.float64)
+        self.avg = np.full((rows, capacity), np.nan, dtype=np.float32)
+        # Bucketed tiers also keep the extremes seen inside each bucket.
+        self.min = np.full((rows, capacity), np.nan, dtype=np.float32) if bucket else None
+        self.max = np.full((rows, capacity), np.nan, dtype=np.float32) if bucket else None
+
+    def grow(self, rows):
+        extra = rows - self.avg.shape[0]
+        if extra <= 0: return
+        pad = np.full((extra, self.capacity), np.nan, dtype=np.float32)
+        self.avg = np.vstack((self.avg, pad))
+        if self.bucket:
+            self.min = np.vstack((self.min, pad)); self.max = np.vstack((self.max, pad))
+
+    def write(self, timestamp, avg, minimum=None, maximum=None):
+        col = self.head
+        self.times[col] = timestamp
+        self.avg[:, col] = avg
+        if self.bucket:
+            self.min[:, col] = minimum; self.max[:, col] = maximum
+        self.head = (col + 1) % self.capacity
+        self.count = min(self.count + 1, self.capacity)
+
+    def oldest(self):
+        if not self.count: return math.inf
+        return self.times[self.head if self.count == self.capacity else 0]
+
+    def columns(self, start, end):
+        # Chronological column indexes whose timestamp lies in [start, end].
+        order = np.arange(self.head - self.count, self.head) % self.capacity
+        times = self.times[order]
+        return order[(times >= start) & (times <= end)]
+
+    def nbytes(self):
+        total = self.times.nbytes + self.avg.nbytes
+        if self.bucket: total += self.min.nbytes + self.max.nbytes
+        return total
+
+
+class _Accumulator:
+    # Running sum/count/min/max for the bucket currently being filled.
+    def __init__(self, rows):
+        self.bucket_id = None
+        self.resize(rows)
+
+    def resize(self, rows):
+        self.sum = np.zeros(rows, dtype=np.float64)
+        self.n = np.zeros(rows, dtype=np.int64)
+        self.min = np.full(rows, np.inf, dtype=np.float32)
+        self.max = np.full(rows, -np.inf, dtype=np.float32)
+
+    def grow(self, rows):
+        extra = rows - self.sum.shape[0]
+        if extra <= 0: return
+        self.sum = np.concatenate((self.sum, np.zeros(extra)))
+        self.n = np.concatenate((self.n, np.zeros(extra, dtype=np.int64)))
+        self.min = np.concatenate((self.min, np.full(extra, np.inf, dtype=np.float32)))
+        self.max = np.concatenate((self.max, np.full(extra, -np.inf, dtype=np.float32)))
+
+    def add(self, avg, minimum, maximum, weight=1):
+        valid = ~np.isnan(avg)
+        if np.ndim(weight): weight = weight[valid]
+        self.sum[valid] += avg[valid] * weight
+        self.n[valid] += weight
+        np.fmin(self.min, minimum, out=self.min)
+        np.fmax(self.max, maximum, out=self.max)
+
+    def flush(self):
+        with np.errstate(invalid="ignore", divide="ignore"):
+            avg = (self.sum / self.n).astype(np.float32)
+        minimum = np.where(self.n > 0, self.min, np.nan).astype(np.float32)
+        maximum = np.where(self.n > 0, self.max, np.nan).astype(np.float32)
+        weights = self.n.copy()
+        self.resize(self.sum.shape[0])
+        return avg, minimum, maximum, weights
+
+
+class SensorHistory:
+    def __init__(self, sensor_ids=(), tiers=HISTORY_TIERS):
+        if not HISTORY_AVAILABLE:
+            raise RuntimeError("Sensor history needs NumPy (pip install numpy).")
+        self.rows = {}          # sensor_id -> row
+        self.sensor_ids = []    # row -> sensor_id
+        self._lock = threading.Lock()
+        self.tiers = [_Tier(name, bucket, capacity, 0) for name, bucket, capacity in tiers]
+        self._accumulators = [_Accumulator(0) for tier in self.tiers[1:]]
+        self.register(sensor_ids)
+
+    def register(self, sensor_ids):
+        with self._lock:
+            for sensor_id in sensor_ids:
+                if sensor_id not in self.rows:
+                    self.rows[sensor_id] = len(self.sensor_ids); self.sensor_ids.append(sensor_id)
+            rows = len(self.sensor_ids)
+            for tier in self.tiers: tier.grow(rows)
+            for acc in self._accumulators: acc.grow(rows)
+
+    def append(self, timestamp, values, register=True):
+        # values: sensor_id -> float | None. Unknown sensors are registered on the fly, or with
+        # register=False skipped, so only the registered sensors are kept.
+        rows = self.rows
+        if register:
+            if any(sensor_id not in rows for sensor_id in values): self.register(values)
+            column = np.full(len(self.sensor_ids), np.nan, dtype=np.float32)
+            for sensor_id, value in values.items():
+                if value is not None: column[rows[sensor_id]] = value
+        else:
+            known = list(rows.items())  # rows 0..n-1, even while another thread registers more
+            column = np.full(len(known), np.nan, dtype=np.float32)
+            for sensor_id, row in known:
+                value = values.get(sensor_id)
+                if value is not None: column[row] = value
+        self.append_column(timestamp, column)
+
+    def append_column(self, timestamp, column):
+        with self._lock:
+            rows = len(self.sensor_ids)
+            if column.shape[0] < rows:
+                # register() ran on another thread after the column was sized; the new rows have no reading yet.
+                column = np.concatenate((column, np.full(rows - column.shape[0], np.nan, dtype=np.float32)))
+            self.tiers[0].write(timestamp, column)
+            ts, avg, minimum, maximum, weight = timestamp, column, column, column, 1
+            for tier, acc in zip(self.tiers[1:], self._accumulators):
+                bucket_id = int(ts // tier.bucket)
+                if acc.bucket_id is None or bucket_id == acc.bucket_id:
+                    acc.bucket_id = bucket_id
+                    acc.add(avg, minimum, maximum, weight)
+                    break
+                # The finished bucket is written out and cascades into the next, coarser tier.
+                finished_ts = acc.bucket_id * tier.bucket
+                b_avg, b_min, b_max, b_n = acc.flush()
+                tier.write(finished_ts, b_avg, b_min, b_max)
+                acc.bucket_id = bucket_id
+                acc.add(avg, minimum, maximum, weight)
+                ts, avg, minimum, maximum, weight = finished_ts, b_avg, b_min, b_max, b_n
+
+    def _pick_tier(self, start):
+        # Finest tier that still reaches back to `start`.
+        for tier in self.tiers:
+            if tier.count and tier.oldest() <= start: return tier
+        populated = [tier for tier in self.tiers if tier.count]
+        return min(populated, key=lambda t: t.oldest()) if populated else self.tiers[0]
+
+    def _window(self, window_seconds, now, tier):
+        now = time.time() if now is None else now
+        start = now - window_seconds
+        tier = self._pick_tier(start) if tier is None else next(t for t in self.tiers if t.name == tier)
+        return tier, tier.columns(start, now)
+
+    def query(self, sensor_id, window_seconds, stat="avg", pct=95.0, now=None, tier=None):
+        row = self.rows.get(sensor_id)
+        if row is None: return None
+        result = self.query_all(window_seconds, stat, pct, now, tier, rows=[row])
+        return None if np.isnan(result[0]) else float(result[0])
+
+    def query_all(self, window_seconds, stat="avg", pct=95.0, now=None, tier=None, rows=None):
+        # One vectorized reduction over every (or the given) sensor rows; NaN where no data.
+        if stat not in STATS: raise ValueError(f"Unknown history stat '{stat}'. Choose from: {', '.join(STATS)}")
+        with self._lock:
+            tier, cols = self._window(window_seconds, now, tier)
+            source = tier.min if stat == "min" and tier.bucket else tier.max if stat == "max" and tier.bucket else tier.avg
+            data = source[:, cols] if rows is None else source[rows][:, cols]
+        if data.shape[1] == 0: return np.full(data.shape[0], np.nan, dtype=np.float32)
+        missing = np.isnan(data)
+        if not missing.any():
+            # Fast path: the nan* reductions are several times slower.
+            if stat == "min": return data.min(axis=1)
+            if stat == "max": return data.max(axis=1)
+            if stat == "avg": return data.mean(axis=1, dtype=np.float64).astype(np.float32)
+            return np.percentile(data, pct, axis=1).astype(np.float32)
+        all_nan = missing.all(axis=1)
+        if all_nan.any(): data = np.where(all_nan[:, None], 0.0, data)
+        with np.errstate(invalid="ignore"):
+            if stat == "min": result = np.nanmin(data, axis=1)
+            elif stat == "max": result = np.nanmax(data, axis=1)
+            elif stat == "avg": result = np.nanmean(data, axis=1)
+            else: result = np.nanpercentile(data, pct, axis=1)
+        result = result.astype(np.float32)
+        result[all_nan] = np.nan
+        return result
+
+    def series(self, sensor_id, window_seconds, now=None, tier=None):
+        # (timestamps, values) oldest first, e.g. for plotting.
+        row = self.rows.get(sensor_id)
+        if row is None: return np.empty(0), np.empty(0, dtype=np.float32)
+        with self._lock:
+            tier, cols = self._window(window_seconds, now, tier)
+            return tier.times[cols].copy(), tier.avg[row, cols].copy()
+
+    def nbytes(self):
+        return sum(tier.nbytes() for tier in self.tiers)
@@ -0,0 +1,75 @@
+# --- Sensor Index ---
+# Maps sensor IDs to direct sensor handles so the refresh loop never has to walk
+# the sensors/sub_hardware tree on every tick.
+
+
+class SensorIndex:
+    def __init__(self):
+        self.sensors = {}        # sensor_id -> Sensor
+        self.owners = {}         # sensor_id -> Hardware node that owns the sensor
+        self.hardware = {}       # hw_id -> top level Hardware node
+        self.update_list = []    # hardware nodes that own at least one selected sensor
+        self.tree_signature = None
+
+    @staticmethod
+    def signature_of(hardware_items):
+        # Node identity matters too: cached layout nodes are replaced by live ones with the same ids.
+        return tuple((hw_item.id, id(hw_item)) for hw_item in hardware_items)
+
+    def ensure(self, hardware_items):
+        # Rebuild only when the set of top level hardware items changed.
+        signature = self.signature_of(hardware_items)
+        if signature == self.tree_signature:
+            return False
+        self.build(hardware_items, signature)
+        return True
+
+    def build(self, hardware_items, signature=None):
+        self.sensors.clear(); self.owners.clear(); self.hardware.clear()
+        self.update_list = []
+        for hw_item in hardware_items:
+            self.hardware[hw_item.id] = hw_item
+            self._index_recursive(hw_item)
+        self.tree_signature = signature if signature is not None else self.signature_of(hardware_items)
+
+    def patch(self, hardware_items, added, removed):
+        # ensure() for hot-plug: only the sensors of the top level nodes that were removed or added
+        # (a replaced node is both) are touched. hardware_items is the new top level list.
+        for hw_item in removed: self._unindex_recursive(hw_item)
+        for hw_item in added: self._index_recursive(hw_item)
+        self.hardware.clear()
+        for hw_item in hardware_items: self.hardware[hw_item.id] = hw_item
+        self.tree_signature = self.signature_of(hardware_items)
+
+    def _index_recursive(self, item):
+        for sensor in item.sensors:
+            self.sensors[sensor.id] = sensor
+            self.owners[sensor.id] = item
+        for sub_item in item.sub_hardware:
+            self._index_recursive(sub_item)
+
+    def _unindex_recursive(self, item):
+        for sensor in item.sensors:
+            if self.sensors.get(sensor.id) is sensor:
+                del self.sensors[sensor.id]; del self.owners[sensor.id]
+        for sub_item in item.sub_hardware:
+            self._unindex_recursive(sub_item)
+
+    def select(self, sensor_ids):
+        # Only the nodes owning selected sensors need an update each tick.
+        seen, update_list = set(), []
+        for sensor_id in sensor_ids:
+            owner = self.owners.get(sensor_id)
+            if owner is not None and id(owner) not in seen:
+                seen.add(id(owner)); update_list.append(owner)
+        self.update_list = update_list
+        return update_list
+
+    def get(self, sensor_id):
+        return self.sensors.get(sensor_id)
+
+    def __contains__(self, sensor_id):
+        return sensor_id in self.sensors
+
+    def __len__(self):
+        return len(self.sensors)
@@ -0,0 +1,36 @@
+# --- Sparklines ---
+# Geometry for the dashboard's inline sparklines; kept free of tkinter so the
+# headless side and benchmarks can use it. A sparkline is a single canvas line
+# item whose coordinates are replaced in place on each redraw.
+
+SPARKLINE_SAMPLES = 60   # samples shown per sparkline (two minutes at the 2 s sampler cadence)
+
+_x_positions = {}        # (count, width, capacity, pad) -> x of each sample, newest on the right edge
+
+
+def _xs(count, width, capacity, pad):
+    key = (count, width, capacity, pad)
+    xs = _x_positions.get(key)
+    if xs is None:
+        step = (width - 2.0 * pad) / max(1, capacity - 1)
+        xs = _x_positions[key] = [width - pad - (count - 1 - i) * step for i in range(count)]
+    return xs
+
+
+def sparkline_coords(values, width, height, capacity=SPARKLINE_SAMPLES, pad=1.0):
+    # Flat [x0, y0, x1, y1, ...] for canvas.coords(), newest sample on the right edge and
+    # the visible window scaled to the full height. Missing readings (None, or NaN as the
+    # sensor history holds them) are bridged. Returns None when there is nothing to draw.
+    xs = _xs(len(values), width, capacity, pad)
+    points = [(x, value) for x, value in zip(xs, values) if value is not None and value == value]
+    if not points: return None
+    if len(points) < len(values): xs, values = zip(*points)
+    low, high = min(values), max(values)
+    if high > low:
+        bottom, scale = height - pad, (height - 2.0 * pad) / (high - low)
+        ys = [bottom - (value - low) * scale for value in values]
+    else:
+        ys = [height / 2.0] * len(values)
+    coords = [c for point in zip(xs, ys) for c in point]
+    if len(coords) == 2: coords += coords  # a line item needs two points
+    return coords
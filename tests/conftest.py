@@ -0,0 +1,26 @@
+import os
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks import stub_tk
+
+stub_tk.install()  # before anything imports appinterface, so the app runs without a display
+
+
+@pytest.fixture
+def open_app():
+    # Opens a SystemStatsApp on stub Tk, driven frame by frame until its first data is on screen.
+    import appinterface
+
+    def open_window(backend, timeout=10.0):
+        app = appinterface.SystemStatsApp(backend=backend)
+        deadline = time.monotonic() + timeout
+        while "first_data" not in app.startup_phases and time.monotonic() < deadline:
+            app.update_stats_loop(); time.sleep(0.01)
+        return app
+    return open_window
@@ -0,0 +1,42 @@
+import math
+import threading
+
+from derived_sensors import DerivedSensors
+from sensor_backends import SyntheticBackend
+from sensor_index import SensorIndex
+
+
+def bound_sensors(expr):
+    # expr: "{}" stands for the id of a raw sensor; returns (derived, index, that sensor id).
+    backend = SyntheticBackend(total_sensors=16); backend.open()
+    sensor_id = next(backend.hardware[0].iter_sensors()).id
+    derived = DerivedSensors([{"name": "Derived", "type": "Load", "expr": expr.format(sensor_id)}])
+    index = SensorIndex(); index.ensure(backend.hardware + [derived.node])
+    derived.bind(index)
+    return derived, index, sensor_id
+
+
+def test_rebinding_carries_ewma_state_over():
+    derived, index, sensor_id = bound_sensors("ewma([{}], 10)")
+    derived.evaluate({sensor_id: 50.0}, 1000.0)
+    derived.bind(index); derived.bind(index)  # two rebinds before the sampler's next tick
+    values = {sensor_id: 100.0}
+    derived.evaluate(values, 1010.0)
+    assert math.isclose(values["/derived/derived"], 50.0 + (1.0 - math.exp(-1.0)) * 50.0)
+
+
+def test_rebinding_while_the_sampler_evaluates():
+    derived, index, sensor_id = bound_sensors("[{}] * 2")
+    stop = threading.Event()
+    def rebind():
+        while not stop.is_set(): derived.bind(index)
+    thread = threading.Thread(target=rebind); thread.start()
+    try:
+        wrong = []
+        for tick in range(2000):
+            values = {sensor_id: float(tick)}
+            derived.evaluate(values, 1000.0 + tick)
+            if values["/derived/derived"] != 2.0 * tick: wrong.append(tick)
+    finally:
+        stop.set(); thread.join()
+    assert not wrong
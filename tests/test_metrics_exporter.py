@@ -0,0 +1,43 @@
+import socket
+import time
+from types import SimpleNamespace
+
+import appinterface
+from metrics_exporter import MetricsExporter
+from sampler import Snapshot
+from sensor_backends import SyntheticBackend
+
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+
+def test_gui_export_keeps_every_series_whatever_the_view(tmp_path, monkeypatch, open_app):
+    monkeypatch.setenv("GLANCED_CONFIG", str(tmp_path / "dashboard.json"))
+    monkeypatch.setattr(appinterface, "METRICS_EXPORTER_PORT", free_port())
+    backend = SyntheticBackend(total_sensors=64)
+    app = open_app(backend)
+    try:
+        sensor_ids = {sensor.id for hw in backend.hardware for sensor in hw.iter_sensors()}
+        app.current_view_mode.set("List View")
+        app.selected_hardware_id_list_view = backend.hardware[0].id
+        app.update_sampling_targets()
+        seq = app.sampler.latest.seq
+        deadline = time.monotonic() + 10.0
+        while app.sampler.latest.seq == seq and time.monotonic() < deadline: time.sleep(0.01)
+        body = app.metrics_exporter.exposition().decode()
+        assert all(f'sensor_id="{sensor_id}"' in body for sensor_id in sensor_ids)
+    finally:
+        app.exit_app()
+
+
+def test_data_amounts_are_exported_in_bytes():
+    hw = SimpleNamespace(name="Generic Memory", hw_type="Memory")
+    sensors = {"/ram/data/0": SimpleNamespace(name="Memory Used", sensor_type="Data", hardware=hw),
+               "/ram/smalldata/0": SimpleNamespace(name="Page File", sensor_type="SmallData", hardware=hw)}
+    exporter = MetricsExporter(None, sensors.get)
+    body = exporter.render(Snapshot(1, 1000.0, {"/ram/data/0": 1.5, "/ram/smalldata/0": 3.0}, 0.001)).decode()
+    assert 'glanced_data_bytes{hardware="Generic Memory"' in body and f" {1.5 * 2**30!r}\n" in body
+    assert 'glanced_small_data_bytes{hardware="Generic Memory"' in body and f" {3.0 * 2**20!r}\n" in body
@@ -0,0 +1,69 @@
+import threading
+import time
+
+from dashboard_config import save_config, serialize_hardware
+from poll_scheduler import PollScheduler
+from recording import RecordingWriter, ReplayBackend
+from sampler import Sampler
+from sensor_backends import SyntheticBackend
+
+
+def write_recording(path, samples=50):
+    backend = SyntheticBackend(total_sensors=64); backend.open()
+    sensors = [sensor for hw in backend.hardware for sensor in hw.iter_sensors()]
+    writer = RecordingWriter(path, sensors, serialize_hardware(backend.hardware), backend.name)
+    for i in range(samples):
+        backend.update_many(backend.hardware)
+        writer.append(i * 1.0, {sensor.id: backend.read(sensor) for sensor in sensors})
+    writer.close()
+    return backend
+
+
+def test_app_starts_on_a_max_speed_replay(tmp_path, monkeypatch, capsys, open_app):
+    monkeypatch.setenv("GLANCED_CONFIG", str(tmp_path / "dashboard.json"))
+    write_recording(str(tmp_path / "session.glrec"))
+    app = open_app(ReplayBackend(str(tmp_path / "session.glrec"), speed="max"))
+    try:
+        assert app.sampler.scheduler.default_interval == 0
+        assert "first_data" in app.startup_phases
+        assert app.sampler.scheduler.stats()["saved_per_minute"] == 0.0
+    finally:
+        app.exit_app()
+    assert "Error during main stats update loop" not in capsys.readouterr().out
+
+
+def test_replay_leaves_the_saved_dashboard_alone(tmp_path, monkeypatch, open_app):
+    config = tmp_path / "dashboard.json"
+    monkeypatch.setenv("GLANCED_CONFIG", str(config))
+    live = SyntheticBackend(total_sensors=8); live.open()
+    save_config(live.name, {hw.id: {"show": True, "sensors": [sensor.id for sensor in hw.iter_sensors()]} for hw in live.hardware},
+                serialize_hardware(live.hardware))
+    saved = config.read_bytes()
+    recorded = write_recording(str(tmp_path / "session.glrec"))
+    assert recorded.name == live.name
+    app = open_app(ReplayBackend(str(tmp_path / "session.glrec"), speed="max"))
+    app.exit_app()
+    assert config.read_bytes() == saved
+
+
+def test_sampler_goes_idle_after_the_last_replayed_row(tmp_path):
+    write_recording(str(tmp_path / "session.glrec"), samples=20)
+    backend = ReplayBackend(str(tmp_path / "session.glrec"), speed="max"); backend.open()
+    sampler = Sampler(backend, scheduler=PollScheduler(backend.poll_interval_ms, type_intervals_ms={}, adaptive=False))
+    sensors = [sensor for hw in backend.hardware for sensor in hw.iter_sensors()]
+    sampler.set_targets(backend.hardware, sensors, sample_now=False)
+    sampler.start()
+    try:
+        deadline = time.monotonic() + 10.0
+        while not backend.finished and time.monotonic() < deadline: time.sleep(0.01)
+        assert backend.finished
+        time.sleep(0.1)
+        assert sampler.latest.seq == 20
+        ran = threading.Event()
+        sampler.call_soon(ran.set)  # tasks still run while sampling is paused
+        assert ran.wait(2.0)
+        time.sleep(0.05)
+        assert sampler.latest.seq == 20
+    finally:
+        sampler.stop()
+        backend.close()
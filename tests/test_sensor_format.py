@@ -0,0 +1,30 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sensor_format import REPORTED_DATA_BYTES, RenderedReadings, SensorFormatter, format_reading
+
+
+class FakeSensor:
+    def __init__(self, sensor_id, sensor_type):
+        self.id, self.sensor_type = sensor_id, sensor_type
+
+
+def test_data_readings_in_both_unit_systems():
+    used_bytes = 499452 * 1024  # MemTotal - MemAvailable from /proc/meminfo, in kB
+    reported = used_bytes / REPORTED_DATA_BYTES["Data"]
+    assert format_reading(reported, "Data") == "0.51GB"
+    assert format_reading(reported, "Data", SensorFormatter(data_units="binary")) == "0.48GiB"
+    small = 3 * 2**20 / REPORTED_DATA_BYTES["SmallData"]  # 3 MiB
+    assert format_reading(small, "SmallData") == "3MB"
+    assert format_reading(small, "SmallData", SensorFormatter(data_units="binary")) == "3MiB"
+
+
+def test_data_bands_match_the_formatted_text():
+    for data_units in ("decimal", "binary"):
+        formatter = SensorFormatter(data_units=data_units)
+        readings, sensor = RenderedReadings(formatter), FakeSensor("/ram/data/0", "Data")
+        for step in range(2000):
+            value = 0.4 + step * 0.0001
+            assert readings.reading(sensor, value) == formatter.reading(sensor, value)
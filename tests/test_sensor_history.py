@@ -0,0 +1,25 @@
+import numpy as np
+
+from sensor_history import SensorHistory
+
+
+def test_column_sized_before_a_concurrent_register():
+    history = SensorHistory(["/cpu/0/temperature/0", "/cpu/0/load/0"])
+    column = np.array([50.0, 20.0], dtype=np.float32)  # built by append() on the sampler thread...
+    history.register(["/usb/0/temperature/0"])           # ...while the Tk thread registers a hot-plugged device
+    for second in range(120): history.append_column(1000.0 + second, column)
+    assert history.query("/cpu/0/temperature/0", 60, now=1119.0) == 50.0
+    assert history.query("/usb/0/temperature/0", 60, now=1119.0) is None
+    history.append(1120.0, {"/usb/0/temperature/0": 40.0})
+    assert history.query("/usb/0/temperature/0", 0.5, now=1120.0) == 40.0
+
+
+def test_append_without_registering_keeps_only_registered_sensors():
+    history = SensorHistory(["/cpu/0/temperature/0"], tiers=(("raw", 0, 60),))
+    history.append(1000.0, {"/cpu/0/temperature/0": 50.0, "/cpu/0/load/0": 20.0}, register=False)
+    assert history.sensor_ids == ["/cpu/0/temperature/0"]
+    history.register(["/cpu/0/load/0"])
+    history.append(1001.0, {"/cpu/0/temperature/0": 51.0, "/cpu/0/load/0": 21.0}, register=False)
+    times, values = history.series("/cpu/0/load/0", 10, now=1001.0)
+    assert times.tolist() == [1000.0, 1001.0]
+    assert np.isnan(values[0]) and values[1] == 21.0